@@ -14,7 +14,7 @@ router = APIRouter(prefix="/ocr")
 
 @router.post(
     "/uploads/{room_id}",
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     response_model=OcrUploadResponse,
 )
 async def upload_ocr_document(
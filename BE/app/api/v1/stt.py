@@ -8,9 +8,13 @@ from datetime import datetime
 from typing import Any, Dict
 from uuid import uuid4
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 
+from app.api.dependencies import AUTH_COOKIE_NAME
 from app.core.config import get_settings
+from app.core.security import decode_access_token
+from app.sessions import events
+from app.sessions.admission import SessionRejected
 from app.sessions.manager import SessionManager
 from app.sessions.stt_session import STTSession
 
@@ -38,6 +42,29 @@ async def _ensure_session(session: Optional[STTSession], websocket: WebSocket) -
     return session
 
 
+def _client_key(websocket: WebSocket) -> Optional[str]:
+    """Per-user admission key: the authenticated user id, ``None`` for anonymous clients.
+
+    The client address is not used, since many anonymous users can share one (NAT).
+    """
+    token = websocket.cookies.get(AUTH_COOKIE_NAME)
+    if token:
+        try:
+            return decode_access_token(token)
+        except HTTPException:
+            pass
+    return None
+
+
+async def _create_session(websocket: WebSocket) -> Optional[STTSession]:
+    try:
+        return await session_manager.create_session(websocket, user_key=_client_key(websocket))
+    except SessionRejected as exc:
+        logger.warning("Rejected STT session: %s", exc.code)
+        await events.emit_error(websocket, exc.code, exc.message)
+        return None
+
+
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     await websocket.accept()
@@ -66,9 +93,18 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
 
             logger.debug("Received event=%s data=%s", event, data)
 
+            if event in {"session.init", "session.resume", "rtc.offer"} and session is None:
+                redirect = await session_manager.route(data.get("session_id") or data.get("sessionId"))
+                if redirect:
+                    logger.info("Redirecting client to worker %s (%s)", redirect["worker_id"], redirect["reason"])
+                    await websocket.send_json({"event": "session.redirect", "data": redirect})
+                    continue
+
             if event == "session.init":
                 if session is None:
-                    session = await session_manager.create_session(websocket)
+                    session = await _create_session(websocket)
+                    if session is None:
+                        continue
                     session_id = session.session_id
                     logger.info("Created STT session %s", session_id)
                 session.configure(data)
@@ -78,9 +114,36 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                         "data": {"session_id": session.session_id},
                     },
                 )
+            elif event == "session.resume":
+                resumed = None
+                if session is None and data.get("session_id"):
+                    resumed = await session_manager.resume(
+                        str(data["session_id"]),
+                        websocket,
+                        int(data.get("last_seq") or 0),
+                    )
+                if resumed is None:
+                    await websocket.send_json(
+                        {
+                            "event": "error",
+                            "data": {
+                                "code": "SESSION_NOT_FOUND",
+                                "message": "재개할 세션이 없거나 이미 종료되었습니다.",
+                            },
+                        },
+                    )
+                    continue
+                session, complete = resumed
+                session_id = session.session_id
+                await session.event_channel.send(
+                    "session.resumed",
+                    {"session_id": session_id, "complete": complete},
+                )
             elif event == "rtc.offer":
                 if session is None:
-                    session = await session_manager.create_session(websocket)
+                    session = await _create_session(websocket)
+                    if session is None:
+                        continue
                     session_id = session.session_id
                 try:
                     answer = await session.handle_offer(data)
@@ -143,4 +206,4 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
         logger.info("WebSocket disconnected for session %s", session_id)
     finally:
         if session_id:
-            await session_manager.remove(session_id)
+            await session_manager.park(session_id, websocket)
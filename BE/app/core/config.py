@@ -28,6 +28,8 @@ class Settings(BaseSettings):
     aws_region: str = Field(default="ap-northeast-2", alias="AWS_REGION")
     aws_s3_bucket: str = Field(default="local-bucket", alias="AWS_S3_BUCKET")
     aws_presign_expires: int = Field(default=3600, alias="AWS_PRESIGN_EXPIRES")
+    # S3 호출 전용 스레드 수 (기본 executor 를 쓰는 장시간 작업과 분리)
+    storage_io_threads: int = Field(default=16, alias="STORAGE_IO_THREADS")
 
     # ----- STT / RTC -----
     google_application_credentials: Optional[Path] = Field(
@@ -41,6 +43,40 @@ class Settings(BaseSettings):
     rtc_language: str = Field(default="ko-KR", alias="RTC_LANGUAGE")
     stt_model: str = Field(default="default", alias="STT_MODEL")
     stt_use_enhanced: bool = Field(default=True, alias="STT_USE_ENHANCED")
+    # 노드당 동시 STT 세션 한도 (= 인식 전용 스레드 수) / 로그인 사용자당 한도 (0 이면 제한 없음, 익명은 노드 한도만)
+    stt_max_sessions: int = Field(default=100, alias="STT_MAX_SESSIONS")
+    stt_max_sessions_per_user: int = Field(default=2, alias="STT_MAX_SESSIONS_PER_USER")
+    # 이벤트 루프 → gRPC 요청 스레드 사이 오디오 링버퍼 크기
+    stt_audio_buffer_ms: int = Field(default=5000, alias="STT_AUDIO_BUFFER_MS")
+    # 버퍼가 가득 찼을 때: drop_newest | drop_oldest | spill (임시 파일로 넘겼다가 순서대로 재전송)
+    stt_audio_overflow: str = Field(default="drop_oldest", alias="STT_AUDIO_OVERFLOW")
+    stt_audio_spill_max_sec: int = Field(default=120, alias="STT_AUDIO_SPILL_MAX_SEC")
+    # 20ms 프레임을 모아 요청 하나당 target_ms 만큼 전송, 단 max_latency_ms 이상 붙잡지 않음
+    stt_request_target_ms: int = Field(default=100, alias="STT_REQUEST_TARGET_MS")
+    stt_request_max_latency_ms: int = Field(default=120, alias="STT_REQUEST_MAX_LATENCY_MS")
+    # 세션 간 공유하는 Google STT gRPC 채널 수 / 채널당 동시 스트림 수
+    stt_channel_pool_size: int = Field(default=4, alias="STT_CHANNEL_POOL_SIZE")
+    stt_streams_per_channel: int = Field(default=50, alias="STT_STREAMS_PER_CHANNEL")
+    # Google 스트리밍 한도(~5분) 전에 새 스트림으로 넘기고, 아직 확정되지 않은 오디오를 최대 replay_max_ms 만큼 재전송
+    stt_stream_rollover_sec: int = Field(default=280, alias="STT_STREAM_ROLLOVER_SEC")
+    stt_stream_replay_max_ms: int = Field(default=5000, alias="STT_STREAM_REPLAY_MAX_MS")
+    # stt.partial 는 세션당 interval_ms 에 한 번만 전송 (delta=true 면 바뀐 뒷부분만 전송)
+    stt_partial_interval_ms: int = Field(default=150, alias="STT_PARTIAL_INTERVAL_MS")
+    stt_partial_delta: bool = Field(default=False, alias="STT_PARTIAL_DELTA")
+    # 무음 구간은 STT 로 보내지 않음 (hangover 이후 차단, 발화 시작 시 preroll 만큼 함께 전송)
+    stt_vad_enabled: bool = Field(default=True, alias="STT_VAD_ENABLED")
+    stt_vad_margin_db: float = Field(default=9.0, alias="STT_VAD_MARGIN_DB")
+    stt_vad_min_db: float = Field(default=-50.0, alias="STT_VAD_MIN_DB")
+    stt_vad_hangover_ms: int = Field(default=800, alias="STT_VAD_HANGOVER_MS")
+    stt_vad_preroll_ms: int = Field(default=300, alias="STT_VAD_PREROLL_MS")
+    stt_vad_keepalive_ms: int = Field(default=5000, alias="STT_VAD_KEEPALIVE_MS")
+    # WebSocket 이 끊겨도 grace_sec 동안 세션을 유지하고 session.resume 으로 재연결 (0 이면 즉시 종료)
+    stt_resume_grace_sec: float = Field(default=30.0, alias="STT_RESUME_GRACE_SEC")
+    stt_resume_replay_events: int = Field(default=256, alias="STT_RESUME_REPLAY_EVENTS")
+    # none | spectral (in-process NumPy) | pooled (공유 worker 프로세스) | ffmpeg (세션당 ffmpeg 프로세스)
+    noise_reduction: str = Field(default="none", alias="NOISE_REDUCTION")
+    noise_reduction_workers: int = Field(default=2, alias="NOISE_REDUCTION_WORKERS")
+    noise_reduction_timeout_ms: int = Field(default=100, alias="NOISE_REDUCTION_TIMEOUT_MS")
 
     ice_servers_json: Optional[str] = Field(default=None, alias="ICE_SERVERS_JSON")
     ice_servers: list[dict[str, Any]] = Field(
@@ -51,6 +87,24 @@ class Settings(BaseSettings):
     storage_dir: Path = Field(default=Path("./data/recordings"), alias="STORAGE_DIR")
     analysis_dir: Path = Field(default=Path("./data/analysis"), alias="ANALYSIS_DIR")
     logs_dir: Path = Field(default=Path("./data/logs"), alias="LOGS_DIR")
+    # 워커 간 세션 소유권 레지스트리 (같은 노드의 uvicorn 워커/프로세스가 파일 락으로 공유)
+    session_registry_dir: Path = Field(default=Path("./data/registry"), alias="SESSION_REGISTRY_DIR")
+    worker_public_url: Optional[str] = Field(default=None, alias="WORKER_PUBLIC_URL")
+    worker_heartbeat_sec: float = Field(default=5.0, alias="WORKER_HEARTBEAT_SEC")
+    worker_drain_sec: float = Field(default=30.0, alias="WORKER_DRAIN_SEC")
+    # 녹음 파일은 별도 writer 스레드에서 블록 단위로 기록 (fsync: none | close | block)
+    recording_block_kb: int = Field(default=64, alias="RECORDING_BLOCK_KB")
+    recording_buffer_kb: int = Field(default=4096, alias="RECORDING_BUFFER_KB")
+    recording_fsync: str = Field(default="close", alias="RECORDING_FSYNC")
+    # 인코딩/디스크 I/O 를 나눠 맡는 writer 스레드 수 (한 파일은 항상 같은 스레드에서 순서대로 기록)
+    recording_writer_threads: int = Field(default=4, alias="RECORDING_WRITER_THREADS")
+    # opus | flac | wav (세션 진행 중 PyAV 로 스트리밍 인코딩)
+    recording_format: str = Field(default="opus", alias="RECORDING_FORMAT")
+    recording_bitrate: int = Field(default=24000, alias="RECORDING_BITRATE")
+    # 세션별 diarization JSONL 로그 (운영에서는 false 로 완전히 끌 수 있음)
+    diarization_log_enabled: bool = Field(default=True, alias="DIARIZATION_LOG_ENABLED")
+    log_sink_queue_size: int = Field(default=1024, alias="LOG_SINK_QUEUE_SIZE")
+    log_sink_flush_sec: float = Field(default=1.0, alias="LOG_SINK_FLUSH_SEC")
 
     # ----- Q&A parameters -----
     qa_time_window_sec: int = Field(default=15, alias="QA_TIME_WINDOW_SEC")
@@ -73,6 +127,25 @@ class Settings(BaseSettings):
 
     openai_api_key: Optional[str] = Field(default=None, alias="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4o-mini", alias="OPENAI_MODEL")
+    # 리포트 생성 시 같은 방의 OCR 작업(queued/processing)이 끝나기를 기다리는 최대 시간, 넘으면 pending 으로 응답
+    llm_ocr_wait_sec: float = Field(default=30.0, alias="LLM_OCR_WAIT_SEC")
+
+    # OCR 작업 큐 (MongoDB ocr_jobs 기반, 프로세스 내 worker 수 / 재시도 횟수 / lease 만료 시 다른 worker 가 회수)
+    ocr_workers: int = Field(default=2, alias="OCR_WORKERS")
+    ocr_max_attempts: int = Field(default=3, alias="OCR_MAX_ATTEMPTS")
+    ocr_lease_sec: float = Field(default=120.0, alias="OCR_LEASE_SEC")
+    ocr_poll_sec: float = Field(default=5.0, alias="OCR_POLL_SEC")
+    # 여러 페이지 PDF 는 페이지별로 나눠 Upstage OCR 을 동시에 호출 (문서당 동시 요청 수)
+    ocr_page_concurrency: int = Field(default=4, alias="OCR_PAGE_CONCURRENCY")
+    # 전자 문서는 내장 텍스트 레이어를 바로 사용 (공백 제외 글자 수가 min_chars 미만인 페이지만 OCR)
+    ocr_text_layer_enabled: bool = Field(default=True, alias="OCR_TEXT_LAYER_ENABLED")
+    ocr_text_layer_min_chars: int = Field(default=50, alias="OCR_TEXT_LAYER_MIN_CHARS")
+    # OCR 결과 캐시 (PDF 해시 기준, 디스크 + MongoDB TTL). 프롬프트/스키마 외 요인이 바뀌면 version 을 올림
+    ocr_cache_enabled: bool = Field(default=True, alias="OCR_CACHE_ENABLED")
+    ocr_cache_dir: Path = Field(default=Path("./data/ocr_cache"), alias="OCR_CACHE_DIR")
+    ocr_cache_size_mb: int = Field(default=512, alias="OCR_CACHE_SIZE_MB")
+    ocr_cache_ttl_days: int = Field(default=30, alias="OCR_CACHE_TTL_DAYS")
+    ocr_cache_version: str = Field(default="1", alias="OCR_CACHE_VERSION")
 
     def model_post_init(self, __context: Any) -> None:  # type: ignore[override]
         # GOOGLE_APPLICATION_CREDENTIALS 정규화 및 환경변수 설정
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import mimetypes
+import signal
+import threading
+from contextlib import asynccontextmanager
+from typing import Callable
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
 from starlette.staticfiles import StaticFiles
 
 from app.api import v1_router
+from app.api.v1.stt import session_manager
 from app.core.config import get_settings
-from app.sessions.manager import SessionManager
+from app.services import get_ocr_job_runner
+from app.use_cases.ocr.ocr_usecase import get_ocr_page_stats
 
 
 import logging
@@ -16,12 +25,80 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+
+_DRAIN_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+def _drain_on_exit_signal() -> Callable[[], None]:
+    """Drain STT sessions before uvicorn reacts to SIGTERM/SIGINT.
+
+    uvicorn closes every WebSocket as soon as it sees the signal and only runs
+    the lifespan shutdown afterwards, too late for ``session.redirect`` to
+    reach anyone. Intercept the signal, drain, then hand it to uvicorn's own
+    handler; a second signal skips the wait. Returns a callable that restores
+    the original handlers.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+    loop = asyncio.get_running_loop()
+    originals = {sig: signal.getsignal(sig) for sig in _DRAIN_SIGNALS}
+    draining = False
+
+    def forward(sig: int) -> None:
+        original = originals[sig]
+        if callable(original):
+            original(sig, None)
+        else:
+            signal.signal(sig, original)
+            signal.raise_signal(sig)
+
+    def start_drain(sig: int) -> None:
+        task = loop.create_task(session_manager.drain(timeout=settings.worker_drain_sec))
+        task.add_done_callback(lambda _: forward(sig))
+
+    def on_signal(sig: int, _frame) -> None:
+        nonlocal draining
+        if draining:
+            forward(sig)
+            return
+        draining = True
+        logger.info("Received %s; draining STT sessions before shutdown", signal.Signals(sig).name)
+        loop.call_soon_threadsafe(start_drain, sig)
+
+    for sig in _DRAIN_SIGNALS:
+        signal.signal(sig, on_signal)
+
+    def restore() -> None:
+        for sig, original in originals.items():
+            if signal.getsignal(sig) is on_signal:
+                signal.signal(sig, original)
+
+    return restore
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await session_manager.warm_up()
+    ocr_jobs = get_ocr_job_runner()
+    await ocr_jobs.start()
+    restore_signals = _drain_on_exit_signal()
+    try:
+        yield
+    finally:
+        restore_signals()
+        await ocr_jobs.stop()
+        # No-op when the signal hook already drained; covers other shutdown paths.
+        await session_manager.drain(timeout=settings.worker_drain_sec)
+        await session_manager.stop_all()
+
+
 app = FastAPI(
     title="BMR STT Backend",
     version="0.1.0",
     debug=settings.debug,
     redirect_slashes=False,
-    docs_url="/docs"
+    docs_url="/docs",
+    lifespan=lifespan,
 )
 
 allowed_origins = {
@@ -38,6 +115,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Session recordings are Ogg Opus / FLAC (see RECORDING_FORMAT).
+mimetypes.add_type("audio/ogg", ".opus")
+mimetypes.add_type("audio/flac", ".flac")
+
 app.mount(
     "/recordings",
     StaticFiles(directory=settings.storage_dir, html=False),
@@ -47,6 +128,6 @@ app.mount(
 
 @app.get("/health", tags=["health"])
 async def health_check() -> JSONResponse:
-    return JSONResponse({"status": "ok"})
+    return JSONResponse({"status": "ok", "stt": session_manager.get_capacity(), "ocr": get_ocr_page_stats()})
 
 app.include_router(v1_router)
@@ -33,6 +33,12 @@ class OcrBase(BaseModel):
         default=None,
         description="Storage key for the uploaded document within object storage.",
     )
+    attempts: int = Field(default=0, description="Number of processing attempts made by the job runner.")
+    error: Optional[str] = Field(default=None, description="Last processing error, if any.")
+    lease_token: Optional[str] = Field(
+        default=None,
+        description="Token of the job runner claim currently holding the job.",
+    )
 
 
 class OcrDetailResponse(BaseModel):
@@ -58,6 +64,7 @@ class OcrDetailResponse(BaseModel):
         default=None,
         description="Pre-signed URL for downloading the uploaded document.",
     )
+    error: Optional[str] = Field(default=None, description="Last processing error, if any.")
 
 
 class OcrUploadResponse(BaseModel):
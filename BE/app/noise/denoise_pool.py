@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from app.noise.spectral_reducer import SpectralNoiseReducer
+
+logger = logging.getLogger(__name__)
+
+_PROCESS = "process"
+_RELEASE = "release"
+_RESET = "reset"
+
+
+def _worker_main(
+    requests: "multiprocessing.Queue",
+    responses: "multiprocessing.Queue",
+    sample_rate: int,
+    idle_sec: float,
+) -> None:
+    """Worker loop: one ``SpectralNoiseReducer`` per session routed here.
+
+    ``_PROCESS`` requests carry a wall-clock deadline (the caller's timeout);
+    ones that are already past it when dequeued are dropped unprocessed,
+    since the caller has passed the raw chunk through and nobody reads the
+    result.
+    """
+    reducers: Dict[str, Tuple[SpectralNoiseReducer, float]] = {}
+    next_sweep = time.monotonic() + idle_sec
+    while True:
+        try:
+            message = requests.get(timeout=idle_sec)
+        except queue.Empty:
+            message = ()
+        if message is None:
+            break
+
+        now = time.monotonic()
+        if message:
+            op, request_id, session_id, payload, deadline = message
+            if op == _RELEASE:
+                entry = reducers.pop(session_id, None)
+                if entry:
+                    entry[0].close()
+            elif op == _RESET:
+                entry = reducers.get(session_id)
+                if entry:
+                    entry[0].reset()
+            elif time.time() > deadline:
+                pass
+            else:
+                entry = reducers.get(session_id)
+                reducer = entry[0] if entry else SpectralNoiseReducer(sample_rate=sample_rate)
+                reducers[session_id] = (reducer, now)
+                try:
+                    result = bytes(reducer.process(payload))
+                except Exception:  # pragma: no cover - defensive
+                    result = payload
+                responses.put((request_id, result))
+
+        if now >= next_sweep:
+            # Sessions that stopped sending audio (muted, stalled) give their state back.
+            for session_id, (reducer, last_used) in list(reducers.items()):
+                if now - last_used >= idle_sec:
+                    reducer.close()
+                    del reducers[session_id]
+            next_sweep = now + idle_sec
+
+
+class DenoisePool:
+    """Fixed set of worker processes shared by every session for denoising.
+
+    Chunks are tagged with their session id and always routed to the same
+    worker (crc32 of the id), which keeps that session's filter state, so
+    ordering and STFT continuity are preserved. Worker state is created on
+    the first chunk and dropped on ``release`` or after ``idle_sec`` without
+    audio, so CPU and memory follow active audio rather than open sessions.
+    A chunk that is not back within ``timeout`` passes through unprocessed;
+    the worker skips it if it has not started yet, and the session's reducer
+    is reset so no samples from it leak into later outputs.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        workers: int,
+        timeout: float = 0.1,
+        idle_sec: float = 30.0,
+    ) -> None:
+        self._sample_rate = sample_rate
+        self._size = max(workers, 1)
+        self._timeout = timeout
+        self._idle_sec = idle_sec
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._requests: List["multiprocessing.Queue"] = []
+        self._workers: List[multiprocessing.Process] = []
+        self._responses: Optional["multiprocessing.Queue"] = None
+        self._collector: Optional[threading.Thread] = None
+        self._pending: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future[bytes]]] = {}
+        self._ids = itertools.count()
+        self._started = False
+        self._closed = False
+        self._chunks = 0
+        self._timeouts = 0
+        self._restarts = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started or self._closed:
+                return
+            self._responses = self._context.Queue()
+            for index in range(self._size):
+                self._requests.append(self._context.Queue())
+                self._workers.append(self._spawn_worker(index))
+            self._collector = threading.Thread(target=self._collect, name="denoise-pool-collector", daemon=True)
+            self._collector.start()
+            self._started = True
+        logger.info("Denoise pool started with %d workers", self._size)
+
+    async def process(self, session_id: str, chunk: bytes) -> bytes:
+        if self._closed or not chunk:
+            return chunk
+        if not self._started:
+            self.start()
+
+        index = self._route(session_id)
+        self._ensure_worker(index)
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bytes] = loop.create_future()
+        request_id = next(self._ids)
+        self._pending[request_id] = (loop, future)
+        # Chunks may be memoryviews over frame planes; the IPC hop needs bytes.
+        # Wall clock, since the deadline is compared in another process.
+        deadline = time.time() + self._timeout
+        self._requests[index].put((_PROCESS, request_id, session_id, bytes(chunk), deadline))
+        self._chunks += 1
+        try:
+            return await asyncio.wait_for(future, timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            # Queued behind the late request, so the next chunk starts from clean stream state.
+            self._requests[index].put((_RESET, -1, session_id, b"", 0.0))
+            return chunk
+        finally:
+            self._pending.pop(request_id, None)
+
+    def release(self, session_id: str) -> None:
+        if not self._started or self._closed:
+            return
+        self._requests[self._route(session_id)].put((_RELEASE, -1, session_id, b"", 0.0))
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "workers": self._size,
+            "chunks": self._chunks,
+            "timeouts": self._timeouts,
+            "restarts": self._restarts,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._started
+        if not started:
+            return
+
+        for requests in self._requests:
+            requests.put(None)
+        for worker in self._workers:
+            worker.join(timeout=1.0)
+            if worker.is_alive():
+                worker.terminate()
+        if self._responses is not None:
+            self._responses.put(None)
+        if self._collector is not None:
+            self._collector.join(timeout=1.0)
+
+    def _route(self, session_id: str) -> int:
+        return zlib.crc32(session_id.encode("utf-8")) % self._size
+
+    def _spawn_worker(self, index: int) -> multiprocessing.Process:
+        worker = self._context.Process(
+            target=_worker_main,
+            args=(self._requests[index], self._responses, self._sample_rate, self._idle_sec),
+            name=f"denoise-worker-{index}",
+            daemon=True,
+        )
+        worker.start()
+        return worker
+
+    def _ensure_worker(self, index: int) -> None:
+        if self._workers[index].is_alive():
+            return
+        with self._lock:
+            if self._closed or self._workers[index].is_alive():
+                return
+            logger.warning("Denoise worker %d exited (code=%s); respawning", index, self._workers[index].exitcode)
+            self._workers[index] = self._spawn_worker(index)
+            self._restarts += 1
+
+    def _collect(self) -> None:
+        assert self._responses is not None
+        while True:
+            try:
+                message = self._responses.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            request_id, result = message
+            entry = self._pending.get(request_id)
+            if entry is None:
+                continue
+            loop, future = entry
+            try:
+                loop.call_soon_threadsafe(_resolve, future, result)
+            except RuntimeError:
+                # Event loop already closed.
+                continue
+
+
+def _resolve(future: asyncio.Future[bytes], result: bytes) -> None:
+    if not future.done():
+        future.set_result(result)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import errno
 import logging
 import os
 import subprocess
 import threading
-import time
-from typing import Optional
+from collections import deque
+from typing import Deque, Optional, Tuple
 
 import ffmpeg
 
@@ -13,19 +14,162 @@ import ffmpeg
 logger = logging.getLogger(__name__)
 
 
+class _OutputBuffer:
+    """Bounded byte ring filled by the stdout reader and drained by ``process``.
+
+    Readers block on a condition variable instead of polling. Bytes that a
+    reader gave up on (timeout) are remembered in ``_skip`` and discarded when
+    they eventually arrive, so the output never drifts behind the input.
+
+    Silence standing in for an input chunk that could not be fed (``add_gap``)
+    is anchored to the ffmpeg output still in flight and only enters the ring
+    once that output has arrived, so the stream stays in input order.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._buffer = bytearray(capacity)
+        self._capacity = capacity
+        self._read_pos = 0
+        self._size = 0
+        self._skip = 0
+        self._wanted = 0
+        self._closed = False
+        self._fed = 0
+        self._arrived = 0
+        self._gaps: Deque[Tuple[int, int]] = deque()
+        self._cond = threading.Condition(threading.Lock())
+        self.overflow_bytes = 0
+        self.skipped_bytes = 0
+
+    def expect(self, length: int) -> None:
+        """Record ``length`` bytes fed to ffmpeg whose output has not arrived yet."""
+        with self._cond:
+            self._fed += length
+
+    def add_gap(self, length: int) -> None:
+        """Queue ``length`` bytes of silence after the output currently in flight."""
+        with self._cond:
+            self._gaps.append((self._fed, length))
+            self._flush_gaps()
+            self._notify()
+
+    def write(self, data: bytes) -> None:
+        view = memoryview(data)
+        with self._cond:
+            while view:
+                self._flush_gaps()
+                take = len(view)
+                if self._gaps:
+                    take = min(take, self._gaps[0][0] - self._arrived)
+                self._append(view[:take])
+                self._arrived += take
+                view = view[take:]
+            self._flush_gaps()
+            self._notify()
+
+    def _flush_gaps(self) -> None:
+        while self._gaps and self._gaps[0][0] <= self._arrived:
+            _, length = self._gaps.popleft()
+            self._append(memoryview(bytes(length)))
+
+    def _notify(self) -> None:
+        if self._wanted and self._size >= self._wanted:
+            self._cond.notify()
+
+    def _append(self, view: memoryview) -> None:
+        if self._skip:
+            skipped = min(self._skip, len(view))
+            self._skip -= skipped
+            self.skipped_bytes += skipped
+            view = view[skipped:]
+        length = len(view)
+        if not length:
+            return
+        if length > self._capacity:
+            view = view[length - self._capacity:]
+            self.overflow_bytes += length - self._capacity
+            length = self._capacity
+        excess = self._size + length - self._capacity
+        if excess > 0:
+            # Drop the oldest output rather than blocking the reader thread.
+            self._read_pos = (self._read_pos + excess) % self._capacity
+            self._size -= excess
+            self.overflow_bytes += excess
+        write_pos = (self._read_pos + self._size) % self._capacity
+        first = min(length, self._capacity - write_pos)
+        self._buffer[write_pos:write_pos + first] = view[:first]
+        if first < length:
+            self._buffer[: length - first] = view[first:]
+        self._size += length
+
+    def read_exact(self, length: int, timeout: float) -> tuple[bytes, int]:
+        """Return ``length`` bytes, zero-filling whatever is not ready in time.
+
+        The second element is the number of zero-filled bytes.
+        """
+        with self._cond:
+            if self._size < length and not self._closed:
+                self._wanted = length
+                try:
+                    self._cond.wait_for(lambda: self._size >= length or self._closed, timeout=timeout)
+                finally:
+                    self._wanted = 0
+            take = min(self._size, length)
+            start = self._read_pos
+            first = min(take, self._capacity - start)
+            data = bytes(self._buffer[start:start + first]) + bytes(self._buffer[: take - first])
+            self._read_pos = (start + take) % self._capacity
+            self._size -= take
+            missing = length - take
+            self._skip += missing
+        if missing:
+            data += bytes(missing)
+        return data, missing
+
+    def reset(self) -> None:
+        with self._cond:
+            self._read_pos = 0
+            self._size = 0
+            self._skip = 0
+            self._closed = False
+            self._fed = 0
+            self._arrived = 0
+            self._gaps.clear()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
 class FFmpegNoiseReducer:
-    """Streaming FFmpeg noise reducer using python-ffmpeg."""
+    """Streaming FFmpeg noise reducer using python-ffmpeg.
 
-    def __init__(self, sample_rate: int, timeout: float = 0.02) -> None:
+    Every ``process`` call returns exactly ``len(chunk)`` bytes delayed by a
+    fixed ``latency`` (the first ``latency`` seconds are silence). Output is
+    handed over through a condition variable, so nothing polls. If ffmpeg
+    falls behind, the missing bytes are zero-filled and the late bytes are
+    discarded on arrival. If its stdin pipe is full, the input chunk is
+    replaced by silence instead of blocking the caller. A broken pipe
+    restarts the process and re-primes the latency.
+    """
+
+    def __init__(self, sample_rate: int, timeout: float = 0.02, latency: float = 0.1) -> None:
         self.sample_rate = sample_rate
         self._timeout = timeout
+        bytes_per_second = sample_rate * 2
+        self._latency_bytes = int(bytes_per_second * latency) // 2 * 2
         self._process: Optional[subprocess.Popen[bytes]] = None
         self._stdout_thread: Optional[threading.Thread] = None
         self._stderr_thread: Optional[threading.Thread] = None
-        self._buffer = bytearray()
+        self._output = _OutputBuffer(capacity=bytes_per_second)
+        self._prime_remaining = self._latency_bytes
         self._lock = threading.Lock()
         self._closed = False
         self._available = True
+        self._restarts = 0
+        self._underrun_bytes = 0
+        self._dropped_input_bytes = 0
 
     def _spawn(self) -> None:
         if not self._available or self._process is not None:
@@ -57,10 +201,26 @@ class FFmpegNoiseReducer:
             logger.warning("ffmpeg binary not found on PATH. Noise reduction disabled.")
             return
 
+        if self._process.stdin is not None:
+            os.set_blocking(self._process.stdin.fileno(), False)
+
         self._closed = False
-        self._stdout_thread = threading.Thread(target=self._stdout_loop, name="ffmpeg-nr-stdout", daemon=True)
+        self._output.reset()
+        self._prime_remaining = self._latency_bytes
+        process = self._process
+        self._stdout_thread = threading.Thread(
+            target=self._stdout_loop,
+            args=(process,),
+            name="ffmpeg-nr-stdout",
+            daemon=True,
+        )
         self._stdout_thread.start()
-        self._stderr_thread = threading.Thread(target=self._stderr_loop, name="ffmpeg-nr-stderr", daemon=True)
+        self._stderr_thread = threading.Thread(
+            target=self._stderr_loop,
+            args=(process,),
+            name="ffmpeg-nr-stderr",
+            daemon=True,
+        )
         self._stderr_thread.start()
 
     def process(self, chunk: bytes) -> bytes:
@@ -71,46 +231,41 @@ class FFmpegNoiseReducer:
         if self._process is None or self._process.stdin is None:
             return chunk
 
-        ready = self._pop_buffer(len(chunk), timeout=0.0)
-        output: Optional[bytes] = None
-        if len(ready) >= len(chunk):
-            output = ready[: len(chunk)]
-            remainder = ready[len(chunk):]
-            if remainder:
-                self._prepend_buffer(remainder)
-        elif ready:
-            self._prepend_buffer(ready)
-
         if not self._feed(chunk):
             return chunk
 
-        if output is not None:
-            return output
+        length = len(chunk)
+        primed = min(self._prime_remaining, length)
+        self._prime_remaining -= primed
+        if primed == length:
+            return bytes(length)
 
-        processed = self._pop_buffer(len(chunk), timeout=self._timeout)
-        if len(processed) >= len(chunk):
-            result = processed[: len(chunk)]
-            remainder = processed[len(chunk):]
-            if remainder:
-                self._prepend_buffer(remainder)
-            return result
+        data, missing = self._output.read_exact(length - primed, timeout=self._timeout)
+        self._underrun_bytes += missing
+        if primed:
+            data = bytes(primed) + data
+        return data
 
-        if processed:
-            self._prepend_buffer(processed)
-
-        return chunk
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "restarts": self._restarts,
+            "underrun_bytes": self._underrun_bytes,
+            "skipped_bytes": self._output.skipped_bytes,
+            "overflow_bytes": self._output.overflow_bytes,
+            "dropped_input_bytes": self._dropped_input_bytes,
+        }
 
     def close(self) -> None:
         self._closed = True
+        self._output.close()
         with self._lock:
-            if self._process:
+            process = self._process
+            self._process = None
+            if process and process.stdin:
                 try:
-                    if self._process.stdin:
-                        self._process.stdin.close()
+                    process.stdin.close()
                 except Exception:
                     pass
-            process = self._process
-            self._process = None
 
         if process:
             try:
@@ -134,12 +289,8 @@ class FFmpegNoiseReducer:
         self._stdout_thread = None
         self._stderr_thread = None
 
-        with self._lock:
-            self._buffer.clear()
-
-    def _stdout_loop(self) -> None:
-        assert self._process is not None
-        stdout = self._process.stdout
+    def _stdout_loop(self, process: subprocess.Popen[bytes]) -> None:
+        stdout = process.stdout
         if stdout is None:
             return
         while not self._closed:
@@ -151,12 +302,10 @@ class FFmpegNoiseReducer:
                 break
             if not data:
                 break
-            with self._lock:
-                self._buffer.extend(data)
+            self._output.write(data)
 
-    def _stderr_loop(self) -> None:
-        assert self._process is not None
-        stderr = self._process.stderr
+    def _stderr_loop(self, process: subprocess.Popen[bytes]) -> None:
+        stderr = process.stderr
         if stderr is None:
             return
         try:
@@ -167,16 +316,44 @@ class FFmpegNoiseReducer:
         except Exception as exc:
             logger.warning("Exception in ffmpeg noise reducer stderr thread: %s", exc)
 
+    def _write_stdin(self, chunk: bytes) -> bool:
+        """Write without blocking; returns ``False`` when the pipe is full."""
+        assert self._process is not None and self._process.stdin is not None
+        fd = self._process.stdin.fileno()
+        view = memoryview(chunk)
+        while view:
+            try:
+                written = os.write(fd, view)
+            except BlockingIOError:
+                written = 0
+            except OSError as exc:
+                if exc.errno != errno.EAGAIN:
+                    raise
+                written = 0
+            if not written:
+                if len(view) == len(chunk):
+                    return False
+                # A partial write must be completed to keep samples aligned.
+                os.set_blocking(fd, True)
+                try:
+                    os.write(fd, view)
+                finally:
+                    os.set_blocking(fd, False)
+                return True
+            view = view[written:]
+        return True
+
     def _feed(self, chunk: bytes) -> bool:
         if self._process is None or self._process.stdin is None:
             return False
         try:
-            if hasattr(self._process.stdin, "write"):
-                self._process.stdin.write(chunk)
+            if self._write_stdin(chunk):
+                self._output.expect(len(chunk))
             else:
-                os.write(self._process.stdin.fileno(), chunk)  # type: ignore[arg-type]
-            if hasattr(self._process.stdin, "flush"):
-                self._process.stdin.flush()
+                # Backpressure: ffmpeg is behind. Keep lengths aligned with silence,
+                # placed after the output of the chunks it is still working on.
+                self._dropped_input_bytes += len(chunk)
+                self._output.add_gap(len(chunk))
             return True
         except (BrokenPipeError, OSError) as exc:  # pragma: no cover - defensive
             logger.warning("ffmpeg noise reducer pipe broken: %s", exc)
@@ -184,12 +361,11 @@ class FFmpegNoiseReducer:
             self._spawn()
             if self._process and self._process.stdin:
                 try:
-                    if hasattr(self._process.stdin, "write"):
-                        self._process.stdin.write(chunk)
+                    if self._write_stdin(chunk):
+                        self._output.expect(len(chunk))
                     else:
-                        os.write(self._process.stdin.fileno(), chunk)  # type: ignore[arg-type]
-                    if hasattr(self._process.stdin, "flush"):
-                        self._process.stdin.flush()
+                        self._output.add_gap(len(chunk))
+                    self._restarts += 1
                     logger.info("ffmpeg noise reducer process respawned successfully")
                     return True
                 except Exception as retry_exc:  # pragma: no cover - defensive
@@ -201,27 +377,3 @@ class FFmpegNoiseReducer:
             self.close()
             self._available = False
             return False
-
-    def _pop_buffer(self, expected: int, timeout: float) -> bytes:
-        if expected <= 0:
-            return b""
-        deadline = time.monotonic() + max(timeout, 0.0)
-        collected = bytearray()
-        while len(collected) < expected and not self._closed:
-            with self._lock:
-                if self._buffer:
-                    take = min(expected - len(collected), len(self._buffer))
-                    collected.extend(self._buffer[:take])
-                    del self._buffer[:take]
-            if len(collected) >= expected or timeout == 0:
-                break
-            if time.monotonic() >= deadline:
-                break
-            time.sleep(0.001)
-        return bytes(collected)
-
-    def _prepend_buffer(self, data: bytes) -> None:
-        if not data:
-            return
-        with self._lock:
-            self._buffer = bytearray(data) + self._buffer
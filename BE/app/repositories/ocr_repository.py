@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 from typing import List, Optional
+from uuid import uuid4
 
 from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection
+from pymongo import ASCENDING, ReturnDocument
 
 from app.models import OcrBase
 
@@ -35,6 +38,33 @@ class OcrRepository:
             session=session,
         )
 
+    async def enqueue(self, record: OcrBase, *, session: Optional[AsyncIOMotorClientSession] = None) -> None:
+        """Upsert ``record`` as a fresh queued job, clearing state left by a previous upload of the same id."""
+        if not record.ocr_id:
+            raise ValueError("ocr_id is required for enqueue operations.")
+
+        document = record.model_dump(exclude_none=True)
+        ocr_id = document.pop("ocr_id", None)
+        created_at = document.pop("created_at", None)
+
+        # None fields are skipped by model_dump, so the previous attempt's result/lease is removed
+        # explicitly, in the same write: a claim between two writes would otherwise lose its lease.
+        # Clearing lease_token also makes a still-running old attempt's complete/fail a no-op.
+        stale = ("detail", "error", "worker_id", "lease_token", "available_at", "lease_expires_at")
+        update_doc = {
+            "$set": document | {"ocr_id": ocr_id},
+            "$unset": {field: "" for field in stale if field not in document},
+        }
+        if created_at is not None:
+            update_doc["$setOnInsert"] = {"created_at": created_at}
+
+        await self._collection.update_one(
+            {"_id": record.ocr_id},
+            update_doc,
+            upsert=True,
+            session=session,
+        )
+
     async def get(self, user_id: str, ocr_id: str) -> Optional[OcrBase]:
         document = await self._collection.find_one({"_id": ocr_id, "user_id": user_id})
         return self._deserialize(document)
@@ -56,6 +86,68 @@ class OcrRepository:
         )
         return result.modified_count == 1
 
+    async def ensure_queue_indexes(self) -> None:
+        await self._collection.create_index([("status", ASCENDING), ("available_at", ASCENDING)])
+
+    async def claim_next(self, worker_id: str, lease_seconds: float) -> Optional[OcrBase]:
+        """Atomically take the oldest runnable job (queued, or processing with an expired lease).
+
+        Each claim gets a fresh ``lease_token``; renew/complete/fail only apply to the claim holding it.
+        """
+        now = datetime.utcnow()
+        document = await self._collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued", "available_at": {"$lte": now}},
+                    {"status": "queued", "available_at": None},
+                    {"status": "processing", "lease_expires_at": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": "processing",
+                    "worker_id": worker_id,
+                    "lease_token": uuid4().hex,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._deserialize(document)
+
+    async def renew_lease(self, ocr_id: str, lease_token: str, lease_seconds: float) -> bool:
+        result = await self._collection.update_one(
+            {"_id": ocr_id, "lease_token": lease_token, "status": "processing"},
+            {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}},
+        )
+        return result.modified_count == 1
+
+    async def complete(self, ocr_id: str, lease_token: str, detail: dict) -> bool:
+        result = await self._collection.update_one(
+            {"_id": ocr_id, "lease_token": lease_token, "status": "processing"},
+            {
+                "$set": {"status": "done", "detail": detail, "error": None},
+                "$unset": {"lease_token": "", "lease_expires_at": "", "available_at": ""},
+            },
+        )
+        return result.modified_count == 1
+
+    async def fail(self, ocr_id: str, lease_token: str, error: str, retry_at: Optional[datetime]) -> bool:
+        """Requeue the job for ``retry_at``, or mark it failed when ``retry_at`` is None."""
+        updates: dict = {"error": error}
+        if retry_at is None:
+            updates["status"] = "failed"
+        else:
+            updates["status"] = "queued"
+            updates["available_at"] = retry_at
+        result = await self._collection.update_one(
+            {"_id": ocr_id, "lease_token": lease_token, "status": "processing"},
+            {"$set": updates, "$unset": {"lease_token": "", "lease_expires_at": ""}},
+        )
+        return result.modified_count == 1
+
     def _deserialize(self, document: Optional[dict]) -> Optional[OcrBase]:
         if not document:
             return None
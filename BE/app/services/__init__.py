@@ -1,5 +1,6 @@
 from .room_service import RoomService, get_room_service
 from .storage_service import StorageService, get_storage_service
+from .ocr_job_runner import OcrJobRunner, get_ocr_job_runner
 from .ocr_service import OcrService, get_ocr_service
 from .llm_service import LlmService, get_llm_service
 from .stt_service import STTService, get_stt_service
@@ -9,6 +10,8 @@ __all__ = [
     "get_room_service",
     "StorageService",
     "get_storage_service",
+    "OcrJobRunner",
+    "get_ocr_job_runner",
     "OcrService",
     "get_ocr_service",
     "LlmService",
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from typing import Any, Dict, List, Optional
 
+from app.core.config import settings
 from app.database.mongodb import get_llm_collection, get_session
 from app.models import LLMReportAck, LLMReportDetail, LLMReportTriggerPayload
 from app.repositories import LlmRepository
@@ -24,7 +25,8 @@ class LlmService:
         payload: Optional[LLMReportTriggerPayload] = None,
     ) -> LLMReportAck:
         report = await self._generate_report(user_id, room_id, payload)
-        await self._persist_report(report)
+        if report.status == "done":
+            await self._persist_report(report)
         return LLMReportAck(room_id=room_id, status=report.status, user_id=user_id)
 
     async def get_report(self, user_id: str, room_id: str) -> LLMReportDetail:
@@ -33,7 +35,8 @@ class LlmService:
             return report
 
         report = await self._generate_report(user_id, room_id, None)
-        await self._persist_report(report)
+        if report.status == "done":
+            await self._persist_report(report)
         return report
 
     async def _persist_report(self, report: LLMReportDetail) -> None:
@@ -52,6 +55,18 @@ class LlmService:
         room_service = get_room_service()
         stt_service = get_stt_service()
 
+        # 업로드 직후라 OCR 이 아직 끝나지 않은 계약서를 빼고 리포트를 만들지 않도록 잠시 기다리고,
+        # 그래도 남아 있으면 저장하지 않고 pending 으로 응답 (클라이언트가 다시 요청)
+        pending_ocr_ids = await ocr_service.wait_for_pending(user_id, room_id, settings.llm_ocr_wait_sec)
+        if pending_ocr_ids:
+            return LLMReportDetail(
+                room_id=room_id,
+                user_id=user_id,
+                status="pending",
+                created_at=datetime.now(UTC),
+                detail={"pending_ocr_ids": pending_ocr_ids},
+            )
+
         stt_details: List[Dict[str, Any]] = await stt_service.get_transcript_triplets(room_id)
         ocr_details: List[Dict[str, Any]] = await ocr_service.list_details(user_id, room_id)
         room_checklist: Optional[List[Dict[str, Any]]] = await room_service.get_room_checklist(user_id, room_id)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.database.mongodb import get_ocr_collection
+from app.models import OcrBase
+from app.repositories import OcrRepository
+from app.use_cases.ocr.ocr_usecase import get_ocr_usecase
+
+logger = logging.getLogger(__name__)
+
+
+class OcrJobRunner:
+    """In-process OCR workers fed by the Mongo-backed ``ocr_jobs`` queue.
+
+    Upload requests only persist a ``queued`` record and ``submit`` it; up to
+    ``concurrency`` workers claim jobs atomically and hold a lease that they
+    renew while working. A job whose worker died (lease expired) is claimed
+    again by any process, and a failed attempt is requeued with exponential
+    backoff until ``max_attempts`` is reached, after which it is ``failed``.
+
+    Documents submitted by this process are kept in memory so the worker can
+    skip the S3 download; recovered or retried jobs read the stored object.
+    A cached document is dropped once its claim is lost, or when no worker
+    here took it within one lease (another process most likely did).
+    """
+
+    def __init__(
+        self,
+        repository: OcrRepository,
+        concurrency: int,
+        max_attempts: int = 3,
+        lease_seconds: float = 120.0,
+        poll_interval: float = 5.0,
+        retry_base_seconds: float = 10.0,
+    ) -> None:
+        self._repository = repository
+        self._concurrency = max(concurrency, 1)
+        self._max_attempts = max(max_attempts, 1)
+        self._lease_seconds = lease_seconds
+        self._poll_interval = poll_interval
+        self._retry_base_seconds = retry_base_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._documents: Dict[str, Tuple[bytes, float]] = {}
+        self._max_documents = self._concurrency * 4
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        try:
+            await self._repository.ensure_queue_indexes()
+        except Exception as exc:  # pragma: no cover - best-effort
+            logger.warning("OCR queue index creation failed: %s", exc)
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ocr-worker-{index}")
+            for index in range(self._concurrency)
+        ]
+        logger.info("OCR job runner started with %d workers", self._concurrency)
+
+    async def stop(self) -> None:
+        # In-flight jobs keep their lease and are picked up again after it expires.
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def submit(self, ocr_id: str, content: Optional[bytes] = None) -> None:
+        """Wake a worker for a freshly queued job."""
+        if content is not None:
+            self._stash(ocr_id, content)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _stash(self, ocr_id: str, content: bytes) -> None:
+        now = time.monotonic()
+        for stale_id, (_, stored_at) in list(self._documents.items()):
+            if now - stored_at > self._lease_seconds:
+                del self._documents[stale_id]
+        if len(self._documents) < self._max_documents:
+            self._documents[ocr_id] = (content, now)
+
+    async def _worker(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            # Cleared before claiming so a submit during the claim is not missed.
+            self._wakeup.clear()
+            try:
+                job = await self._repository.claim_next(self.worker_id, self._lease_seconds)
+            except Exception as exc:
+                logger.warning("OCR job claim failed: %s", exc)
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run_job(job)
+            except Exception as exc:
+                # Bookkeeping failed (e.g. Mongo unavailable); the lease expiry recovers the job.
+                logger.warning("OCR job %s bookkeeping failed: %s", job.ocr_id, exc)
+
+    async def _run_job(self, job: OcrBase) -> None:
+        ocr_id = job.ocr_id or ""
+        lease_token = job.lease_token or ""
+        stashed = self._documents.pop(ocr_id, None)
+        content = stashed[0] if stashed else None
+        lease = asyncio.create_task(self._keep_lease(ocr_id, lease_token))
+        try:
+            usecase = get_ocr_usecase()
+            if content is not None:
+                detail = await usecase.process(content)
+            elif job.object_key:
+                detail = await usecase.process_object(job.object_key)
+            else:
+                raise ValueError("OCR job has neither content nor object_key")
+        except asyncio.CancelledError:
+            if content is not None and not lease.done():
+                self._stash(ocr_id, content)
+            raise
+        except Exception as exc:
+            retry_at = None
+            if job.attempts < self._max_attempts:
+                retry_at = datetime.utcnow() + timedelta(seconds=self._retry_base_seconds * 2 ** (job.attempts - 1))
+            logger.warning(
+                "OCR job %s attempt %d/%d failed: %s",
+                ocr_id,
+                job.attempts,
+                self._max_attempts,
+                exc,
+            )
+            requeued = await self._repository.fail(ocr_id, lease_token, str(exc), retry_at)
+            if requeued and retry_at is not None and content is not None:
+                self._stash(ocr_id, content)
+        else:
+            if not await self._repository.complete(ocr_id, lease_token, detail):
+                logger.warning("OCR job %s finished after its lease was taken over", ocr_id)
+        finally:
+            lease.cancel()
+
+    async def _keep_lease(self, ocr_id: str, lease_token: str) -> None:
+        """Renew the claim until cancelled; returns once the claim is lost."""
+        while True:
+            await asyncio.sleep(self._lease_seconds / 3)
+            try:
+                renewed = await self._repository.renew_lease(ocr_id, lease_token, self._lease_seconds)
+            except Exception as exc:  # pragma: no cover - best-effort
+                logger.warning("OCR job %s lease renewal failed: %s", ocr_id, exc)
+                continue
+            if not renewed:
+                logger.warning("OCR job %s lost its lease to another claim", ocr_id)
+                self._documents.pop(ocr_id, None)
+                return
+
+
+_ocr_job_runner: Optional[OcrJobRunner] = None
+
+
+def get_ocr_job_runner() -> OcrJobRunner:
+    """Return the process-wide OcrJobRunner."""
+    global _ocr_job_runner
+    if _ocr_job_runner is None:
+        _ocr_job_runner = OcrJobRunner(
+            OcrRepository(get_ocr_collection()),
+            concurrency=settings.ocr_workers,
+            max_attempts=settings.ocr_max_attempts,
+            lease_seconds=settings.ocr_lease_sec,
+            poll_interval=settings.ocr_poll_sec,
+        )
+    return _ocr_job_runner
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
@@ -7,13 +9,17 @@ from uuid import uuid4
 from app.database.mongodb import get_ocr_collection, get_session
 from app.models import OcrBase, OcrDetailResponse, OcrUploadResponse
 from app.repositories import OcrRepository
+from app.services.ocr_job_runner import OcrJobRunner, get_ocr_job_runner
 from app.services.storage_service import StorageService, get_storage_service
-from app.use_cases.ocr.ocr_usecase import get_ocr_usecase
+
+PENDING_STATUSES = {"queued", "processing"}
+
 
 class OcrService:
-    def __init__(self, repository: OcrRepository, storage: StorageService) -> None:
+    def __init__(self, repository: OcrRepository, storage: StorageService, jobs: OcrJobRunner) -> None:
         self._repository = repository
         self._storage = storage
+        self._jobs = jobs
 
     async def upload_document(
         self,
@@ -31,24 +37,25 @@ class OcrService:
         ocr_id = file_stem
         object_key = f"ocr/{user_id}/{filename}"
 
+        # 원본은 재시도/장애 복구용으로 먼저 S3 에 저장하고, OCR 은 job runner 가 백그라운드에서 처리
         await self._storage.upload_bytes(
             object_key,
             content,
             content_type=content_type or "application/octet-stream",
         )
-        ocr_usecase = get_ocr_usecase()
         record = OcrBase(
             ocr_id=ocr_id,
             user_id=user_id,
             room_id=room_id,
             file_type=safe_file_type,
-            status="done",
-            detail=await ocr_usecase.process(object_key),  # 추후 합치면 제공될 예정!
+            status="queued",
             object_key=object_key,
         )
 
         async with get_session() as session:
-            await self._repository.upsert(record, session=session)
+            await self._repository.enqueue(record, session=session)
+        # 같은 프로세스의 worker 는 메모리의 바이트를 그대로 사용 (S3 재다운로드 없음)
+        self._jobs.submit(ocr_id, content)
 
         url = await self._storage.generate_presigned_url(object_key)
         return OcrUploadResponse(ocr_id=ocr_id, status=record.status, object_url=url)
@@ -62,7 +69,7 @@ class OcrService:
         pending = False
 
         for record in records:
-            if record.status != "done":
+            if record.status in PENDING_STATUSES:
                 pending = True
             object_url = None
             if record.object_key:
@@ -77,17 +84,35 @@ class OcrService:
                     created_at=record.created_at,
                     detail=record.detail,
                     object_url=object_url,
+                    error=record.error,
                 )
             )
 
         return responses, pending
 
+    async def wait_for_pending(
+        self,
+        user_id: str,
+        room_id: str,
+        timeout: float,
+        poll_interval: float = 1.0,
+    ) -> List[str]:
+        """Wait up to ``timeout`` seconds for the room's queued/processing OCR jobs; return those still pending."""
+        deadline = time.monotonic() + timeout
+        while True:
+            records = await self._repository.list_by_room(user_id, room_id)
+            pending = [record.ocr_id or "" for record in records if record.status in PENDING_STATUSES]
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                return pending
+            await asyncio.sleep(min(poll_interval, remaining))
+
     async def list_details(self, user_id: str, room_id: str) -> List[Dict[str, Any]]:
         records = await self._repository.list_by_room(user_id, room_id)
-        return [record.detail for record in records]
+        return [record.detail for record in records if record.status == "done"]
 
 
 def get_ocr_service() -> OcrService:
     repository = OcrRepository(get_ocr_collection())
     storage = get_storage_service()
-    return OcrService(repository, storage)
+    return OcrService(repository, storage, get_ocr_job_runner())
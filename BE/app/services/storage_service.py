@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
 
 import boto3
 from botocore.client import Config
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
 
 class StorageService:
-    """S3-backed storage utility for room assets."""
+    """S3-backed storage utility for room assets.
+
+    Blocking boto3 calls run on the service's own bounded executor, so
+    request-path storage work never queues behind long-lived threads in the
+    event loop's default executor.
+    """
 
     def __init__(self) -> None:
         self._bucket = settings.AWS_S3_BUCKET
         self._expires_in = settings.AWS_PRESIGN_EXPIRES
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.storage_io_threads,
+            thread_name_prefix="storage-io",
+        )
         self._client = boto3.client(
             "s3",
             region_name=settings.AWS_REGION,
@@ -23,9 +35,13 @@ class StorageService:
             config=Config(
                 signature_version="s3v4",
                 s3={"addressing_style": "virtual"},
+                max_pool_connections=settings.storage_io_threads,
             ),
         )
 
+    async def _run(self, func: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func)
+
     async def upload_bytes(
         self,
         key: str,
@@ -45,7 +61,7 @@ class StorageService:
                 params["ContentType"] = content_type
             self._client.put_object(**params)
 
-        await asyncio.to_thread(_upload)
+        await self._run(_upload)
 
     async def download_bytes(self, key: str) -> bytes:
         """Download binary content from S3 at the provided key.
@@ -67,7 +83,7 @@ class StorageService:
             )
             return response['Body'].read()
         
-        return await asyncio.to_thread(_download)
+        return await self._run(_download)
 
     async def generate_presigned_url(self, key: str) -> str:
         """Generate a time-bound URL for accessing an object."""
@@ -79,7 +95,7 @@ class StorageService:
                 ExpiresIn=self._expires_in,
             )
 
-        return await asyncio.to_thread(_generate)
+        return await self._run(_generate)
 
     async def delete_object(self, key: str) -> None:
         """Delete an object from storage."""
@@ -87,7 +103,7 @@ class StorageService:
         def _delete() -> None:
             self._client.delete_object(Bucket=self._bucket, Key=key)
 
-        await asyncio.to_thread(_delete)
+        await self._run(_delete)
 
 
 _storage_service: Optional[StorageService] = None
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+CAPACITY_EXCEEDED = "CAPACITY_EXCEEDED"
+USER_LIMIT_EXCEEDED = "USER_LIMIT_EXCEEDED"
+
+
+class SessionRejected(Exception):
+    """Raised when a new session would exceed node or per-user capacity."""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class AdmissionController:
+    """Per-node and per-user session slots.
+
+    Every live ``STTSession`` (including one parked for resume) holds one
+    slot from ``admit`` until ``release``. Each session costs a recognizer
+    thread, a gRPC stream, recording writers and possibly a denoiser, so the
+    node limit is also the size of the recognizer executor. ``max_per_user``
+    of 0 disables the per-user limit; sessions admitted without a
+    ``user_key`` (anonymous clients) only count against the node limit.
+    """
+
+    def __init__(self, max_sessions: int, max_per_user: int = 0) -> None:
+        self._max_sessions = max(max_sessions, 1)
+        self._max_per_user = max(max_per_user, 0)
+        self._lock = threading.Lock()
+        self._owners: Dict[str, Optional[str]] = {}
+        self._per_user: Counter[str] = Counter()
+        self._rejected: Counter[str] = Counter()
+
+    @property
+    def max_sessions(self) -> int:
+        return self._max_sessions
+
+    def admit(self, session_id: str, user_key: Optional[str]) -> None:
+        with self._lock:
+            if len(self._owners) >= self._max_sessions:
+                self._rejected[CAPACITY_EXCEEDED] += 1
+                raise SessionRejected(CAPACITY_EXCEEDED, "서버의 동시 세션 한도에 도달했습니다. 잠시 후 다시 시도해주세요.")
+            if user_key is not None and self._max_per_user and self._per_user[user_key] >= self._max_per_user:
+                self._rejected[USER_LIMIT_EXCEEDED] += 1
+                raise SessionRejected(USER_LIMIT_EXCEEDED, "사용자당 동시 세션 한도에 도달했습니다.")
+            self._owners[session_id] = user_key
+            if user_key is not None:
+                self._per_user[user_key] += 1
+
+    def release(self, session_id: str) -> None:
+        with self._lock:
+            if session_id not in self._owners:
+                return
+            user_key = self._owners.pop(session_id)
+            if user_key is None:
+                return
+            self._per_user[user_key] -= 1
+            if self._per_user[user_key] <= 0:
+                del self._per_user[user_key]
+
+    def sessions_of(self, user_key: str) -> List[str]:
+        with self._lock:
+            return [session_id for session_id, owner in self._owners.items() if owner == user_key]
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            active = len(self._owners)
+            return {
+                "max_sessions": self._max_sessions,
+                "max_sessions_per_user": self._max_per_user,
+                "active_sessions": active,
+                "headroom": max(self._max_sessions - active, 0),
+                "rejected_capacity": self._rejected[CAPACITY_EXCEEDED],
+                "rejected_user_limit": self._rejected[USER_LIMIT_EXCEEDED],
+            }
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_SPILL = "spill"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, OVERFLOW_SPILL)
+
+
+class AudioRingBuffer:
+    """Fixed-size byte ring between the event loop and the recognizer thread.
+
+    ``write`` is called from the asyncio loop and never blocks: it copies the
+    chunk into a preallocated ``bytearray`` and only signals the condition
+    when the reader is actually parked. ``read`` is called from the gRPC
+    request thread and returns everything buffered (up to ``max_bytes``) in a
+    single contiguous ``bytes`` object, so a slow reader naturally coalesces
+    several small chunks into one request.
+
+    With ``min_bytes``/``max_latency`` the reader additionally waits until a
+    right-sized request has accumulated, but never holds the oldest buffered
+    byte for longer than ``max_latency`` seconds.
+
+    ``overflow`` decides what happens when a write does not fit (coalescing
+    is not a separate policy; every read already merges whatever queued up):
+
+    * ``drop_newest`` rejects the incoming chunk.
+    * ``drop_oldest`` evicts the oldest buffered audio to make room; the
+      evicted byte count (and how much older audio was kept ahead of the
+      incoming chunk) is reported by ``take_evicted``.
+    * ``spill`` appends to an unlinked temp file (up to ``spill_max_bytes``)
+      and the reader replays it in order before returning to the ring.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        overflow: str = OVERFLOW_DROP_NEWEST,
+        spill_max_bytes: int = 0,
+        spill_dir: Optional[Path] = None,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+        self._buffer = bytearray(capacity)
+        self._capacity = capacity
+        self._read_pos = 0
+        self._size = 0
+        self._closed = False
+        self._reader_waiting = False
+        self._wake_bytes = 1
+        self._oldest_at = 0.0
+        self._cond = threading.Condition(threading.Lock())
+
+        self._overflow = overflow
+        self._spill_max_bytes = spill_max_bytes
+        self._spill_dir = spill_dir
+        self._spill_fd: Optional[int] = None
+        self._spill_written = 0
+        self._spill_read = 0
+
+        self._bytes_written = 0
+        self._bytes_dropped = 0
+        self._bytes_spilled = 0
+        self._evicted = 0
+        self._evicted_kept = 0
+        self._peak = 0
+        self._reads = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, data: bytes) -> bool:
+        """Append ``data``; returns ``False`` when the chunk had to be dropped."""
+        length = len(data)
+        if not length:
+            return True
+        with self._cond:
+            if self._closed:
+                return False
+            if self._spill_fd is not None or length > self._capacity - self._size:
+                if not self._overflow_write(data, length):
+                    self._bytes_dropped += length
+                    return False
+            else:
+                if not self._size:
+                    self._oldest_at = time.monotonic()
+                self._copy_in(data, length)
+            self._bytes_written += length
+            depth = self._size + self._spill_pending
+            if depth > self._peak:
+                self._peak = depth
+            if self._reader_waiting and depth >= self._wake_bytes:
+                self._cond.notify()
+        return True
+
+    def take_evicted(self) -> Tuple[int, int]:
+        """Bytes evicted by ``drop_oldest`` since the last call.
+
+        Also returns how many buffered bytes sat between the evicted audio and
+        the chunk whose write caused the (latest) eviction.
+        """
+        with self._cond:
+            evicted, self._evicted = self._evicted, 0
+            return evicted, self._evicted_kept
+
+    def read(
+        self,
+        max_bytes: int,
+        timeout: Optional[float] = None,
+        *,
+        min_bytes: int = 0,
+        max_latency: float = 0.0,
+    ) -> Optional[bytes]:
+        """Block until audio is available and return up to ``max_bytes`` of it.
+
+        When ``min_bytes`` is set, keep waiting until that much is buffered or
+        the oldest buffered byte is ``max_latency`` seconds old. Returns
+        ``b""`` when ``timeout`` elapses with nothing buffered and ``None``
+        once the buffer is closed and fully drained.
+        """
+        with self._cond:
+            if not self._size and not self._spill_pending and not self._closed:
+                self._wait(1, timeout)
+            if not self._size and self._spill_pending:
+                return self._read_spill(max_bytes)
+            if min_bytes > self._size and self._size and not self._closed:
+                remaining = self._oldest_at + max_latency - time.monotonic()
+                if remaining > 0:
+                    self._wait(min(min_bytes, max_bytes), remaining)
+            if not self._size:
+                if self._spill_pending:
+                    return self._read_spill(max_bytes)
+                if self._closed:
+                    self._release_spill()
+                    return None
+                return b""
+            chunk = self._copy_out(min(self._size, max_bytes))
+            self._reads += 1
+            return chunk
+
+    def _wait(self, wake_bytes: int, timeout: Optional[float]) -> None:
+        self._reader_waiting = True
+        self._wake_bytes = wake_bytes
+        try:
+            self._cond.wait_for(
+                lambda: self._size + self._spill_pending >= wake_bytes or self._closed,
+                timeout=timeout,
+            )
+        finally:
+            self._reader_waiting = False
+            self._wake_bytes = 1
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def clear(self) -> None:
+        with self._cond:
+            self._read_pos = 0
+            self._size = 0
+            self._release_spill()
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "buffered_bytes": self._size + self._spill_pending,
+            "peak_bytes": self._peak,
+            "written_bytes": self._bytes_written,
+            "dropped_bytes": self._bytes_dropped,
+            "spilled_bytes": self._bytes_spilled,
+            "reads": self._reads,
+        }
+
+    @property
+    def _spill_pending(self) -> int:
+        return self._spill_written - self._spill_read
+
+    def _overflow_write(self, data: bytes, length: int) -> bool:
+        """Handle a write that does not fit in the ring (lock held)."""
+        if self._overflow == OVERFLOW_DROP_OLDEST:
+            if length > self._capacity:
+                data, length = memoryview(data)[length - self._capacity:], self._capacity
+            evict = length - (self._capacity - self._size)
+            evict += evict % 2
+            evict = min(evict, self._size)
+            self._read_pos = (self._read_pos + evict) % self._capacity
+            self._size -= evict
+            self._evicted += evict
+            self._evicted_kept = self._size
+            self._bytes_dropped += evict
+            if not self._size:
+                self._oldest_at = time.monotonic()
+            self._copy_in(data, length)
+            return True
+
+        if self._overflow == OVERFLOW_SPILL and self._spill_pending + length <= self._spill_max_bytes:
+            try:
+                if self._spill_fd is None:
+                    fd, path = tempfile.mkstemp(prefix="stt-spill-", dir=self._spill_dir)
+                    os.unlink(path)
+                    self._spill_fd = fd
+                os.pwrite(self._spill_fd, data, self._spill_written)
+            except OSError as exc:  # pragma: no cover - disk errors
+                logger.warning("Audio spill write failed: %s", exc)
+                return False
+            self._spill_written += length
+            self._bytes_spilled += length
+            return True
+        return False
+
+    def _read_spill(self, max_bytes: int) -> bytes:
+        """Replay spilled audio; the ring is empty whenever this runs (lock held)."""
+        assert self._spill_fd is not None
+        length = min(self._spill_pending, max_bytes)
+        length -= length % 2
+        chunk = os.pread(self._spill_fd, length, self._spill_read)
+        self._spill_read += len(chunk)
+        self._reads += 1
+        if not self._spill_pending:
+            # Caught up: new writes go back to the ring.
+            self._release_spill()
+        return chunk
+
+    def _release_spill(self) -> None:
+        if self._spill_fd is not None:
+            try:
+                os.close(self._spill_fd)
+            except OSError:  # pragma: no cover - defensive
+                pass
+        self._spill_fd = None
+        self._spill_written = 0
+        self._spill_read = 0
+
+    def _copy_in(self, data: bytes, length: int) -> None:
+        write_pos = (self._read_pos + self._size) % self._capacity
+        first = min(length, self._capacity - write_pos)
+        view = memoryview(data)
+        self._buffer[write_pos:write_pos + first] = view[:first]
+        if first < length:
+            self._buffer[: length - first] = view[first:]
+        self._size += length
+
+    def _copy_out(self, length: int) -> bytes:
+        # Keep 16-bit samples intact; writers only ever append whole samples.
+        length -= length % 2
+        start = self._read_pos
+        first = min(length, self._capacity - start)
+        with memoryview(self._buffer) as view:
+            if first == length:
+                chunk = bytes(view[start:start + length])
+            else:
+                chunk = b"".join((view[start:], view[: length - first]))
+        self._read_pos = (start + length) % self._capacity
+        self._size -= length
+        return chunk
@@ -2,30 +2,70 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Deque, Optional
 
 import av
 from av.audio.resampler import AudioResampler
 
 from app.core.config import Settings
+from app.noise.denoise_pool import DenoisePool
 from app.noise.ffmpeg_reducer import FFmpegNoiseReducer
+from app.noise.spectral_reducer import SpectralNoiseReducer
+from app.sessions.audio_buffer import OVERFLOW_DROP_OLDEST, AudioRingBuffer
+from app.sessions.vad import AudioTimeline, EnergyVAD
 from app.util.analysis_writer import AnalysisWriter
+from app.util.recording_encoder import EncodedRecordingWriter, recording_suffix
 logger = logging.getLogger(__name__)
 
 
+def frame_to_pcm(frame: av.AudioFrame) -> list[memoryview]:
+    """Per-channel s16 PCM of ``frame`` as views over its planes (no copy).
+
+    Planes are padded for alignment, so each view is trimmed to the samples
+    actually present. Interleaved multi-channel input falls back to a copy.
+    """
+    if frame.format.name == "s16" and len(frame.layout.channels) == 1:
+        plane = frame.planes[0]
+        return [memoryview(plane)[: frame.samples * 2]]
+    ndarray = frame.to_ndarray()
+    if ndarray.ndim == 1:
+        return [memoryview(ndarray).cast("B")]
+    return [memoryview(channel_data.copy()).cast("B") for channel_data in ndarray]
+
+
 class AudioPipeline:
     def __init__(
         self,
         session_id: str,
         settings: Settings,
-        output_queue: asyncio.Queue[Optional[bytes]],
+        output_buffer: AudioRingBuffer,
+        denoise_pool: Optional[DenoisePool] = None,
     ) -> None:
         self._session_id = session_id
         self._settings = settings
-        self._output_queue = output_queue
+        self._output_buffer = output_buffer
         self._bytes_sent = 0
         self._chunks_sent = 0
+        self._first_chunk_at: float = 0.0
+        self._track_evictions = settings.stt_audio_overflow == OVERFLOW_DROP_OLDEST
+        self._overflowing = False
+
+        bytes_per_ms = settings.stt_sample_rate * 2 // 1000
+        self._timeline = AudioTimeline(settings.stt_sample_rate * 2)
+        self._vad: Optional[EnergyVAD] = None
+        if settings.stt_vad_enabled:
+            self._vad = EnergyVAD(margin_db=settings.stt_vad_margin_db, min_db=settings.stt_vad_min_db)
+        self._vad_hangover_bytes = settings.stt_vad_hangover_ms * bytes_per_ms
+        self._vad_preroll_bytes = settings.stt_vad_preroll_ms * bytes_per_ms
+        self._vad_keepalive_bytes = settings.stt_vad_keepalive_ms * bytes_per_ms
+        self._hangover_left = 0
+        self._silence_run = 0
+        self._preroll: Deque[bytes] = deque()
+        self._preroll_size = 0
 
         self._resampler = AudioResampler(
             format="s16",
@@ -33,93 +73,194 @@ class AudioPipeline:
             rate=settings.stt_sample_rate,
         )
 
-        self._noise_reducer = None
-        # try:
-        #     self._noise_reducer = FFmpegNoiseReducer(sample_rate=settings.stt_sample_rate)
-        # except Exception as exc:  # pragma: no cover - defensive
-        #     logger.warning("Noise reducer initialization failed: %s", exc)
-        #     self._noise_reducer = None
+        # "pooled" mode denoises in shared worker processes instead of per session.
+        self._denoise_pool = denoise_pool
+        self._noise_reducer = None if denoise_pool else self._create_noise_reducer()
+        # The ffmpeg reducer waits on its subprocess (pipe writes, output, respawns), so it runs
+        # on a thread of its own; one thread keeps the chunks in order.
+        self._noise_executor: Optional[ThreadPoolExecutor] = None
+        if isinstance(self._noise_reducer, FFmpegNoiseReducer):
+            self._noise_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ffmpeg-reducer")
 
         self._logs_dir = settings.logs_dir
-        self._recording_path = Path(settings.storage_dir) / f"{session_id}.wav"
-        self._recording_writer = AnalysisWriter(self._recording_path, sample_rate=settings.stt_sample_rate)
+        suffix = recording_suffix(settings.recording_format)
+        self._recording_path = Path(settings.storage_dir) / f"{session_id}{suffix}"
+        self._recording_writer: Optional[AnalysisWriter] = self._create_recording_writer()
         try:
             self._recording_writer.open()
         except Exception as exc:  # pragma: no cover - best-effort
             logger.warning("Failed to open recording writer: %s", exc)
             self._recording_writer = None
 
-        analysis_path = Path(settings.analysis_dir) / f"{session_id}.wav"
-        if analysis_path != self._recording_path:
-            analysis_writer = AnalysisWriter(analysis_path, sample_rate=settings.stt_sample_rate)
-            try:
-                analysis_writer.open()
-            except Exception as exc:  # pragma: no cover - best-effort
-                logger.warning("Failed to open analysis writer: %s", exc)
-                analysis_writer = None
-            self._analysis_writer = analysis_writer
-        else:
-            self._analysis_writer = self._recording_writer
+        # The analysis copy has the same content: write once, link/copy at close.
+        self._analysis_path = Path(settings.analysis_dir) / f"{session_id}{suffix}"
+
+    def _create_recording_writer(self) -> AnalysisWriter:
+        settings = self._settings
+        options = {
+            "sample_rate": settings.stt_sample_rate,
+            "block_bytes": settings.recording_block_kb * 1024,
+            "max_buffer_bytes": settings.recording_buffer_kb * 1024,
+            "fsync": settings.recording_fsync,
+            "writer_threads": settings.recording_writer_threads,
+        }
+        if self._recording_path.suffix == ".wav":
+            return AnalysisWriter(self._recording_path, **options)
+        return EncodedRecordingWriter(
+            self._recording_path,
+            recording_format=settings.recording_format,
+            bitrate=settings.recording_bitrate,
+            **options,
+        )
+
+    def _create_noise_reducer(self):
+        mode = self._settings.noise_reduction.lower()
+        try:
+            if mode == "spectral":
+                return SpectralNoiseReducer(sample_rate=self._settings.stt_sample_rate)
+            if mode == "ffmpeg":
+                return FFmpegNoiseReducer(sample_rate=self._settings.stt_sample_rate)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Noise reducer initialization failed: %s", exc)
+            return None
+        if mode not in {"", "none", "pooled"}:
+            logger.warning("Unknown NOISE_REDUCTION mode %r; noise reduction disabled", mode)
+        return None
 
     async def handle_frame(self, frame: av.AudioFrame) -> None:
-        pcm_chunks = self._to_pcm_bytes(frame)
+        # Chunks are memoryviews over the resampled frame planes; the only
+        # copies are into the recognizer ring buffer and the recording buffer.
+        pcm_chunks = self._to_pcm(frame)
         for chunk in pcm_chunks:
-            reduced = self._apply_noise_reduction(chunk)
-            await self._push_chunk(reduced)
+            reduced = await self._apply_noise_reduction(chunk)
+            self._gate_chunk(reduced)
             if self._recording_writer:
                 self._recording_writer.append(reduced)
-            if self._analysis_writer and self._analysis_writer is not self._recording_writer:
-                self._analysis_writer.append(reduced)
-
-    def _to_pcm_bytes(self, frame: av.AudioFrame) -> list[bytes]:
-        frames = self._resampler.resample(frame)
-        result: list[bytes] = []
-        for resampled in frames:
-            ndarray = resampled.to_ndarray()
-            if ndarray is None:
-                continue
-            if ndarray.ndim == 1:
-                result.append(ndarray.tobytes())
-            else:
-                for channel_data in ndarray:
-                    result.append(channel_data.tobytes())
+
+    def _to_pcm(self, frame: av.AudioFrame) -> list[memoryview]:
+        result: list[memoryview] = []
+        for resampled in self._resampler.resample(frame):
+            result.extend(frame_to_pcm(resampled))
         return result
 
-    def _apply_noise_reduction(self, chunk: bytes) -> bytes:
+    async def _apply_noise_reduction(self, chunk: bytes) -> bytes:
+        if self._denoise_pool:
+            return await self._denoise_pool.process(self._session_id, chunk)
         if not self._noise_reducer:
             return chunk
+        if self._noise_executor:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._noise_executor, self._noise_reducer.process, chunk)
         return self._noise_reducer.process(chunk)
 
-    async def _push_chunk(self, chunk: bytes) -> None:
-        try:
-            self._output_queue.put_nowait(chunk)
-            self._bytes_sent += len(chunk)
-            self._chunks_sent += 1
-            if self._chunks_sent <= 5 or self._chunks_sent % 20 == 0:
-                logger.debug(
-                    "Session %s queued audio chunk size=%d total_bytes=%d chunks=%d",
+    def _gate_chunk(self, chunk: bytes) -> None:
+        """Forward speech (plus hangover and pre-roll) and hold back silence."""
+        if self._vad is None:
+            self._push_chunk(chunk)
+            return
+
+        if self._vad.is_speech(chunk):
+            self._hangover_left = self._vad_hangover_bytes
+            self._silence_run = 0
+            self._flush_preroll()
+            self._push_chunk(chunk)
+            return
+
+        if self._hangover_left > 0:
+            self._hangover_left -= len(chunk)
+            self._push_chunk(chunk)
+            return
+
+        self._preroll.append(chunk)
+        self._preroll_size += len(chunk)
+        self._silence_run += len(chunk)
+        while self._preroll and self._preroll_size - len(self._preroll[0]) >= self._vad_preroll_bytes:
+            dropped = self._preroll.popleft()
+            self._preroll_size -= len(dropped)
+            self._timeline.advance(len(dropped), sent=False)
+
+        if self._silence_run >= self._vad_keepalive_bytes:
+            # Let a little real audio through so the upstream stream does not time out.
+            self._silence_run = 0
+            self._flush_preroll()
+
+    def _flush_preroll(self) -> None:
+        while self._preroll:
+            self._push_chunk(self._preroll.popleft())
+        self._preroll_size = 0
+
+    def _push_chunk(self, chunk: bytes) -> None:
+        sent = self._output_buffer.write(chunk)
+        self._timeline.advance(len(chunk), sent=sent)
+        evicted, kept = self._output_buffer.take_evicted() if self._track_evictions else (0, 0)
+        if evicted:
+            # The evicted audio is the oldest still queued: it sits before ``kept`` older bytes and this chunk.
+            self._timeline.retract(evicted, after=kept + len(chunk))
+        if not sent or evicted:
+            if not self._overflowing:
+                self._overflowing = True
+                logger.warning(
+                    "Session %s audio buffer overflow (policy=%s); recognizer is falling behind",
                     self._session_id,
-                    len(chunk),
-                    self._bytes_sent,
-                    self._chunks_sent,
+                    self._settings.stt_audio_overflow,
                 )
-        except asyncio.QueueFull:
-            logger.debug("Audio queue full. Dropping chunk.")
+            if not sent:
+                return
+        else:
+            self._overflowing = False
+        if not self._chunks_sent:
+            self._first_chunk_at = time.monotonic()
+        self._bytes_sent += len(chunk)
+        self._chunks_sent += 1
+        if self._chunks_sent <= 5 or self._chunks_sent % 20 == 0:
+            logger.debug(
+                "Session %s queued audio chunk size=%d total_bytes=%d chunks=%d",
+                self._session_id,
+                len(chunk),
+                self._bytes_sent,
+                self._chunks_sent,
+            )
 
     def close(self) -> None:
-        if self._noise_reducer:
+        if self._denoise_pool:
+            self._denoise_pool.release(self._session_id)
+        if self._noise_executor:
+            # Queued behind any chunk still being processed on that thread.
+            self._noise_executor.submit(self._noise_reducer.close)
+            self._noise_executor.shutdown(wait=False)
+            self._noise_executor = None
+        elif self._noise_reducer:
             self._noise_reducer.close()
         if self._recording_writer:
-            self._recording_writer.close()
-        if self._analysis_writer and self._analysis_writer is not self._recording_writer:
-            self._analysis_writer.close()
+            copies = [self._analysis_path] if self._analysis_path != self._recording_path else []
+            self._recording_writer.close(copy_to=copies)
+            self._recording_writer = None
 
     @property
     def recording_path(self) -> Path:
         return self._recording_path
 
-    def get_stats(self) -> dict[str, int]:
+    @property
+    def timeline(self) -> AudioTimeline:
+        return self._timeline
+
+    def get_stats(self) -> dict[str, float]:
+        buffer_stats = self._output_buffer.get_stats()
+        requests = buffer_stats["reads"]
+        bytes_per_ms = self._settings.stt_sample_rate * 2 / 1000
+        elapsed = time.monotonic() - self._first_chunk_at if self._chunks_sent else 0.0
         return {
             "bytes": self._bytes_sent,
             "chunks": self._chunks_sent,
+            "requests": requests,
+            # Effective StreamingRecognizeRequest rate after chunk aggregation.
+            "request_rate": round(requests / elapsed, 2) if elapsed > 0 else 0.0,
+            # Audio held back by the VAD (or dropped) and never sent upstream.
+            "suppressed_bytes": self._timeline.suppressed_bytes,
+            "suppressed_seconds": round(self._timeline.suppressed_seconds, 2),
+            # Recognizer backlog: current depth, high-water mark and overflow losses.
+            "buffer_ms": round(buffer_stats["buffered_bytes"] / bytes_per_ms),
+            "buffer_peak_ms": round(buffer_stats["peak_bytes"] / bytes_per_ms),
+            "dropped_bytes": buffer_stats["dropped_bytes"],
+            "spilled_bytes": buffer_stats["spilled_bytes"],
         }
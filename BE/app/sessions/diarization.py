@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import json
 import logging
+import time
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Iterable, List, Optional, Set, Tuple
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
 
 from google.cloud.speech_v1.types import SpeechRecognitionAlternative, SpeechRecognitionResult, WordInfo
 
+from app.util.log_sink import JsonlLogSink
+
 
 logger = logging.getLogger(__name__)
 
@@ -42,16 +43,32 @@ def _time_to_seconds(time_info: WordInfo) -> Tuple[float, float]:
 
 
 class DiarizationProcessor:
-    def __init__(self, logs_dir: Path) -> None:
-        self._log_path = Path(logs_dir) / "diarization_latest.json"
+    def __init__(
+        self,
+        log_sink: Optional[JsonlLogSink] = None,
+        time_map: Optional[Callable[[float], float]] = None,
+    ) -> None:
+        self._log_sink = log_sink
+        self._time_map = time_map
         self.reset()
 
     def reset(self) -> None:
         self._seen_keys: Set[Tuple[Optional[int], float, float, str]] = set()
         self._last_word_end: float = 0.0
+        self._time_offset: float = 0.0
         self._last_transcript: str = ""
         self._last_emitted_transcript: str = ""
 
+    def begin_stream(self, time_offset: float) -> None:
+        """Prepare for a new recognizer stream whose time 0.0 is ``time_offset``.
+
+        Word times are rebased onto the session timeline, so words re-recognised
+        from replayed overlap audio fall before ``_last_word_end`` and are skipped.
+        """
+        self._time_offset = time_offset
+        self._last_transcript = ""
+        self._last_emitted_transcript = ""
+
     def build_segments(self, result: SpeechRecognitionResult) -> List[Segment]:
         if not result.alternatives:
             return []
@@ -98,7 +115,7 @@ class DiarizationProcessor:
 
         for word in words:
             speaker_tag = word.speaker_tag or None
-            word_start, word_end = _time_to_seconds(word)
+            word_start, word_end = (self._rebase(value) for value in _time_to_seconds(word))
             if word_end <= self._last_word_end + epsilon:
                 continue
 
@@ -136,6 +153,12 @@ class DiarizationProcessor:
 
         return self._assemble_segments(segments_meta, transcript)
 
+    def _rebase(self, stream_seconds: float) -> float:
+        sent_seconds = stream_seconds + self._time_offset
+        if self._time_map is None:
+            return sent_seconds
+        return self._time_map(sent_seconds)
+
     @staticmethod
     def _finalize_text(words: Iterable[str]) -> str:
         text = " ".join(words)
@@ -156,13 +179,19 @@ class DiarizationProcessor:
             deduped.append(segment)
         return deduped
 
-    def _write_log(self, segments: Iterable[Segment]) -> None:
-        try:
-            payload = [segment.to_dict() for segment in segments]
-            self._log_path.parent.mkdir(parents=True, exist_ok=True)
-            self._log_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception as exc:  # pragma: no cover - logging only
-            logger.debug("Failed to write diarization log: %s", exc)
+    def close(self) -> None:
+        if self._log_sink:
+            self._log_sink.close()
+
+    def _write_log(self, segments: List[Segment]) -> None:
+        if self._log_sink is None or not segments:
+            return
+        self._log_sink.write(
+            {
+                "ts": time.time(),
+                "segments": [segment.to_dict() for segment in segments],
+            },
+        )
 
     def _diff_transcript(self, text: str) -> str:
         if not text:
@@ -1,30 +1,274 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Mapping
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
+import orjson
 from fastapi import WebSocket
 
+logger = logging.getLogger(__name__)
 
-async def emit(websocket: WebSocket, event: str, payload: Mapping[str, Any] | None = None) -> None:
-    await websocket.send_json(
-        {
-            "event": event,
-            "data": payload or {},
-        },
+# Only the newest of these matters; older ones are dropped from a batch.
+_SUPERSEDED = ("stt.partial", "stt.stats")
+
+
+class EventChannel:
+    """Outbound event queue for one session's WebSocket.
+
+    ``post`` may be called from any thread and never blocks: events are
+    appended under a lock and a single sender task is woken (one cross-thread
+    hop per batch, not per event). Everything that accumulated by the time the
+    sender runs goes out as one frame: a single ``{"event", "data"}`` object,
+    or a JSON array of them when several were batched. Within a batch only
+    the newest ``stt.partial``/``stt.stats`` survives, and a partial that is
+    followed by ``stt.final_segments`` is dropped. A slow client therefore
+    receives fewer, larger frames instead of a growing backlog of stale
+    partials. Encoding uses orjson.
+
+    With ``replay_size`` > 0 every message carries its ``seq`` and the channel
+    keeps the last ``replay_size`` sent events (plus the newest partial and
+    stats) so the session can outlive its WebSocket: ``detach`` keeps events
+    flowing into that history, ``attach`` binds a new socket and replays
+    everything after the client's last seen ``seq``.
+    """
+
+    def __init__(
+        self,
+        websocket: Optional[WebSocket],
+        max_pending: int = 256,
+        replay_size: int = 0,
+    ) -> None:
+        self._websocket = websocket
+        self._max_pending = max_pending
+        self._history: Deque[Tuple[int, str, Mapping[str, Any]]] = deque(maxlen=max(replay_size, 0))
+        self._latest: Dict[str, Tuple[int, str, Mapping[str, Any]]] = {}
+        self._evicted_seq = 0
+        self._replay_after: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[int, str, Mapping[str, Any]]] = []
+        self._seq = 0
+        self._sent_seq = 0
+        self._wake_scheduled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flushed: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+        self._frames = 0
+        self._dropped = 0
+
+    def post(self, event: str, payload: Mapping[str, Any] | None = None) -> int:
+        """Queue an event from any thread; returns its sequence number."""
+        with self._lock:
+            if self._closed:
+                return self._seq
+            self._seq += 1
+            self._pending.append((self._seq, event, payload or {}))
+            if len(self._pending) > self._max_pending:
+                self._pending = self._compact(self._pending)
+            seq = self._seq
+            schedule = not self._wake_scheduled and self._loop is not None
+            if schedule:
+                self._wake_scheduled = True
+        if schedule:
+            if threading.get_ident() == self._loop_thread:
+                self._wake()
+            else:
+                try:
+                    self._loop.call_soon_threadsafe(self._wake)
+                except RuntimeError:
+                    # Event loop already closed.
+                    pass
+        return seq
+
+    async def send(self, event: str, payload: Mapping[str, Any] | None = None) -> None:
+        """Queue an event from the event loop and wait until it was written."""
+        self.start()
+        seq = self.post(event, payload)
+        await self._wait_sent(seq)
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._wakeup = asyncio.Event()
+        self._flushed = asyncio.Condition()
+        self._task = self._loop.create_task(self._run())
+        with self._lock:
+            if self._pending:
+                self._wake_scheduled = True
+                self._wakeup.set()
+
+    async def close(self) -> None:
+        """Flush what is queued, then stop the sender task."""
+        if self._task is None:
+            self._closed = True
+            return
+        with self._lock:
+            last = self._seq
+        await self._wait_sent(last)
+        self._closed = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def detach(self) -> None:
+        """Stop writing to the current socket; events keep accumulating for replay."""
+        with self._lock:
+            self._websocket = None
+
+    def attach(self, websocket: WebSocket, last_seq: int) -> bool:
+        """Bind a new socket and replay events after ``last_seq``.
+
+        Returns ``False`` when some of those events already fell out of the
+        replay history, i.e. the client missed more than can be replayed.
+        """
+        with self._lock:
+            self._websocket = websocket
+            self._replay_after = last_seq
+            complete = last_seq >= self._evicted_seq
+            schedule = not self._wake_scheduled and self._loop is not None
+            if schedule:
+                self._wake_scheduled = True
+        if schedule:
+            self._wake()
+        return complete
+
+    def get_stats(self) -> dict[str, int]:
+        return {"frames": self._frames, "dropped": self._dropped}
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait_sent(self, seq: int) -> None:
+        assert self._flushed is not None
+        async with self._flushed:
+            await self._flushed.wait_for(lambda: self._sent_seq >= seq or self._task is None or self._task.done())
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None and self._flushed is not None
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+                self._wake_scheduled = False
+                websocket = self._websocket
+                replay_after, self._replay_after = self._replay_after, None
+            if not batch and replay_after is None:
+                continue
+
+            last_seq = batch[-1][0] if batch else None
+            batch = self._compact(batch)
+            for entry in batch:
+                self._remember(entry)
+            if replay_after is not None:
+                # The history already holds this batch, so it goes out once, in order.
+                batch = self._replay(replay_after)
+            if batch and websocket is not None:
+                replayable = self._history.maxlen > 0
+                messages = [
+                    {"event": event, "data": payload, "seq": seq} if replayable else {"event": event, "data": payload}
+                    for seq, event, payload in batch
+                ]
+                frame = messages[0] if len(messages) == 1 else messages
+                try:
+                    await websocket.send_text(orjson.dumps(frame).decode("utf-8"))
+                    self._frames += 1
+                except Exception as exc:
+                    # Client went away; keep draining so waiters are released.
+                    logger.debug("Event channel send failed: %s", exc)
+                    with self._lock:
+                        if self._websocket is websocket:
+                            self._websocket = None
+
+            if last_seq is not None:
+                async with self._flushed:
+                    self._sent_seq = last_seq
+                    self._flushed.notify_all()
+
+    def _remember(self, entry: Tuple[int, str, Mapping[str, Any]]) -> None:
+        event = entry[1]
+        if event in _SUPERSEDED:
+            # Delta partials are not replayable on their own; the session
+            # resends the full text after ``attach``.
+            if not _is_delta(entry):
+                self._latest[event] = entry
+            return
+        if len(self._history) == self._history.maxlen:
+            self._evicted_seq = self._history[0][0] if self._history else entry[0]
+        self._history.append(entry)
+
+    def _replay(self, after: int) -> List[Tuple[int, str, Mapping[str, Any]]]:
+        entries = [entry for entry in self._history if entry[0] > after]
+        entries.extend(entry for entry in self._latest.values() if entry[0] > after)
+        entries.sort(key=lambda entry: entry[0])
+        return self._compact(entries)
+
+    def _compact(
+        self,
+        batch: List[Tuple[int, str, Mapping[str, Any]]],
+    ) -> List[Tuple[int, str, Mapping[str, Any]]]:
+        """Drop superseded partials/stats while keeping everything else in order."""
+        kept: List[Tuple[int, str, Mapping[str, Any]]] = []
+        seen: set[str] = set()
+        for entry in reversed(batch):
+            event = entry[1]
+            if event == "stt.final_segments":
+                seen.add("stt.partial")
+            elif event in _SUPERSEDED:
+                if event in seen:
+                    self._dropped += 1
+                    continue
+                if not _is_delta(entry):
+                    # A delta partial only makes sense on top of the ones before it.
+                    seen.add(event)
+            kept.append(entry)
+        kept.reverse()
+        return kept
+
+
+def _is_delta(entry: Tuple[int, str, Mapping[str, Any]]) -> bool:
+    return bool(entry[2].get("offset"))
+
+
+EventTarget = Union[WebSocket, EventChannel]
+
+
+async def emit(target: EventTarget, event: str, payload: Mapping[str, Any] | None = None) -> None:
+    if isinstance(target, EventChannel):
+        await target.send(event, payload)
+        return
+    await target.send_text(
+        orjson.dumps(
+            {
+                "event": event,
+                "data": payload or {},
+            },
+        ).decode("utf-8"),
     )
 
 
-async def emit_partial(websocket: WebSocket, text: str) -> None:
-    await emit(websocket, "stt.partial", {"text": text})
+async def emit_partial(target: EventTarget, text: str) -> None:
+    await emit(target, "stt.partial", {"text": text})
 
 
-async def emit_final_segments(websocket: WebSocket, segments: Iterable[Mapping[str, Any]]) -> None:
-    await emit(websocket, "stt.final_segments", {"segments": list(segments)})
+async def emit_final_segments(target: EventTarget, segments: Iterable[Mapping[str, Any]]) -> None:
+    await emit(target, "stt.final_segments", {"segments": list(segments)})
 
 
-async def emit_qa_pairs(websocket: WebSocket, pairs: Iterable[Mapping[str, Any]], final: bool = False) -> None:
+async def emit_qa_pairs(target: EventTarget, pairs: Iterable[Mapping[str, Any]], final: bool = False) -> None:
     await emit(
-        websocket,
+        target,
         "stt.qa_pairs",
         {
             "pairs": list(pairs),
@@ -33,17 +277,17 @@ async def emit_qa_pairs(websocket: WebSocket, pairs: Iterable[Mapping[str, Any]]
     )
 
 
-async def emit_error(websocket: WebSocket, code: str, message: str) -> None:
-    await emit(websocket, "stt.error", {"code": code, "message": message})
+async def emit_error(target: EventTarget, code: str, message: str) -> None:
+    await emit(target, "stt.error", {"code": code, "message": message})
 
 
-async def emit_rtc_candidate(websocket: WebSocket, payload: Mapping[str, Any]) -> None:
-    await emit(websocket, "rtc.candidate", payload)
+async def emit_rtc_candidate(target: EventTarget, payload: Mapping[str, Any]) -> None:
+    await emit(target, "rtc.candidate", payload)
 
 
-async def emit_session_close(websocket: WebSocket, reason: str) -> None:
-    await emit(websocket, "session.close", {"reason": reason})
+async def emit_session_close(target: EventTarget, reason: str) -> None:
+    await emit(target, "session.close", {"reason": reason})
 
 
-async def emit_stats(websocket: WebSocket, stats: Mapping[str, Any]) -> None:
-    await emit(websocket, "stt.stats", stats)
+async def emit_stats(target: EventTarget, stats: Mapping[str, Any]) -> None:
+    await emit(target, "stt.stats", stats)
@@ -1,27 +1,114 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, Optional
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
 from fastapi import WebSocket
 
 from app.core.config import Settings
+from app.noise.denoise_pool import DenoisePool
+from app.sessions import events
+from app.sessions.admission import AdmissionController
+from app.sessions.registry import SessionRegistry
+from app.sessions.speech_pool import SpeechClientPool
 from app.sessions.stt_session import STTSession
 
+logger = logging.getLogger(__name__)
+
 
 class SessionManager:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._sessions: Dict[str, STTSession] = {}
         self._lock = asyncio.Lock()
+        self._speech_pool = SpeechClientPool(settings)
+        self._admission = AdmissionController(
+            max_sessions=settings.stt_max_sessions,
+            max_per_user=settings.stt_max_sessions_per_user,
+        )
+        # One long-lived thread per admitted session, kept apart from the default executor.
+        self._recognizer_executor = ThreadPoolExecutor(
+            max_workers=self._admission.max_sessions,
+            thread_name_prefix="stt-recognizer",
+        )
+        self._denoise_pool: Optional[DenoisePool] = None
+        if settings.noise_reduction.lower() == "pooled":
+            self._denoise_pool = DenoisePool(
+                sample_rate=settings.stt_sample_rate,
+                workers=settings.noise_reduction_workers,
+                timeout=settings.noise_reduction_timeout_ms / 1000,
+            )
+        self._registry = SessionRegistry(
+            settings.session_registry_dir,
+            public_url=settings.worker_public_url,
+            ttl=settings.worker_heartbeat_sec * 3,
+        )
+        self._heartbeat_task: Optional[asyncio.Task[None]] = None
+        self._parked: Dict[str, asyncio.Task[None]] = {}
+        self._drain_task: Optional[asyncio.Task[None]] = None
+
+    async def route(self, session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return a redirect target when this worker should not serve the client.
+
+        A known ``session_id`` sticks to the worker that owns it; a draining
+        worker sends new clients to the least-loaded live peer.
+        """
+        if session_id and session_id not in self._sessions:
+            owner = await asyncio.to_thread(self._registry.owner, session_id)
+            if owner and owner["worker_id"] != self._registry.worker_id:
+                return {
+                    "session_id": session_id,
+                    "worker_id": owner["worker_id"],
+                    "url": owner.get("url"),
+                    "reason": "owner",
+                }
+        if self._registry.draining:
+            # With no live peer there is nowhere to send the client; keep serving it.
+            target = await asyncio.to_thread(self._registry.pick_worker)
+            if target:
+                return {
+                    "session_id": session_id,
+                    "worker_id": target["worker_id"],
+                    "url": target.get("url"),
+                    "reason": "draining",
+                }
+        return None
+
+    async def create_session(self, websocket: WebSocket, user_key: Optional[str] = None) -> STTSession:
+        """Start a session, or raise ``SessionRejected`` when over capacity.
+
+        ``user_key`` is the authenticated user id (``None`` for anonymous
+        clients). A new session from a user supersedes that user's parked
+        sessions (e.g. a page reload), which are released first so they do
+        not count against the per-user limit until their grace period ends.
+        """
+        if user_key is not None:
+            for parked_id in self._admission.sessions_of(user_key):
+                if parked_id in self._parked:
+                    logger.info("Releasing parked session %s superseded by a new session", parked_id)
+                    await self.remove(parked_id)
 
-    async def create_session(self, websocket: WebSocket) -> STTSession:
         session_id = uuid4().hex
-        session = STTSession(session_id=session_id, websocket=websocket, settings=self._settings)
+        self._admission.admit(session_id, user_key)
+        try:
+            session = STTSession(
+                session_id=session_id,
+                websocket=websocket,
+                settings=self._settings,
+                speech_pool=self._speech_pool,
+                denoise_pool=self._denoise_pool,
+                recognizer_executor=self._recognizer_executor,
+            )
+        except Exception:
+            self._admission.release(session_id)
+            raise
 
         async with self._lock:
             self._sessions[session_id] = session
+        await asyncio.to_thread(self._registry.claim, session_id)
 
         return session
 
@@ -29,16 +116,161 @@ class SessionManager:
         async with self._lock:
             return self._sessions.get(session_id)
 
+    async def park(self, session_id: str, websocket: WebSocket) -> None:
+        """Keep a session whose WebSocket dropped alive for the resume grace period."""
+        async with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            return
+        if session.websocket is not websocket:
+            # Already resumed on a newer socket; the old one just noticed it is gone.
+            return
+        if not session.resumable:
+            await self.remove(session_id)
+            return
+
+        session.detach()
+        previous = self._parked.pop(session_id, None)
+        if previous:
+            previous.cancel()
+        self._parked[session_id] = asyncio.create_task(self._expire(session_id))
+
+    async def resume(
+        self,
+        session_id: str,
+        websocket: WebSocket,
+        last_seq: int = 0,
+    ) -> Optional[Tuple[STTSession, bool]]:
+        """Reattach ``websocket`` to a parked (or stale-attached) session.
+
+        Returns the session and whether every missed event could be replayed,
+        or ``None`` when the session is unknown or already expired.
+        """
+        async with self._lock:
+            session = self._sessions.get(session_id)
+            expiry = self._parked.pop(session_id, None)
+        if expiry:
+            expiry.cancel()
+        if session is None or not session.resumable:
+            return None
+        return session, session.attach(websocket, last_seq)
+
+    async def _expire(self, session_id: str) -> None:
+        await asyncio.sleep(self._settings.stt_resume_grace_sec)
+        logger.info("Session %s was not resumed within %.0fs", session_id, self._settings.stt_resume_grace_sec)
+        self._parked.pop(session_id, None)
+        await self.remove(session_id)
+
     async def remove(self, session_id: str) -> None:
         async with self._lock:
             session = self._sessions.pop(session_id, None)
+            expiry = self._parked.pop(session_id, None)
+        if expiry:
+            expiry.cancel()
 
         if session:
-            await session.stop()
+            try:
+                await session.stop()
+            finally:
+                self._admission.release(session_id)
+            await asyncio.to_thread(self._registry.release, session_id)
 
     async def stop_all(self) -> None:
         async with self._lock:
             sessions = list(self._sessions.values())
             self._sessions.clear()
+            parked = list(self._parked.values())
+            self._parked.clear()
 
+        for expiry in parked:
+            expiry.cancel()
         await asyncio.gather(*(session.stop() for session in sessions), return_exceptions=True)
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        try:
+            await asyncio.to_thread(self._registry.close)
+        except Exception as exc:  # pragma: no cover - best-effort
+            logger.warning("Session registry cleanup failed: %s", exc)
+        for session in sessions:
+            self._admission.release(session.session_id)
+        self._recognizer_executor.shutdown(wait=False)
+        self._speech_pool.close()
+        if self._denoise_pool:
+            self._denoise_pool.close()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop taking sessions, point connected clients elsewhere, then wait.
+
+        Runs once; later calls wait for the first drain. Parked sessions have
+        no client to redirect and are left to ``stop_all``. When no peer can
+        take the clients nothing is sent and there is nothing to wait for.
+        """
+        if self._drain_task is None:
+            self._drain_task = asyncio.create_task(self._drain(timeout))
+        await asyncio.shield(self._drain_task)
+
+    async def _drain(self, timeout: float) -> None:
+        await asyncio.to_thread(self._registry.set_draining, True)
+        async with self._lock:
+            sessions = [session for sid, session in self._sessions.items() if sid not in self._parked]
+        if not sessions:
+            return
+        target = await asyncio.to_thread(self._registry.pick_worker)
+        if not target:
+            logger.info("Draining with no live peer; %d sessions stay until shutdown", len(sessions))
+            return
+        logger.info("Draining %d sessions (target=%s)", len(sessions), target["worker_id"])
+        payload = {"worker_id": target["worker_id"], "url": target.get("url"), "reason": "draining"}
+        await asyncio.gather(
+            *(
+                events.emit(session.event_channel, "session.redirect", {**payload, "session_id": session.session_id})
+                for session in sessions
+            ),
+            return_exceptions=True,
+        )
+
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self._active_count() and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.5)
+
+    def _active_count(self) -> int:
+        return sum(1 for session_id in self._sessions if session_id not in self._parked)
+
+    async def warm_up(self) -> None:
+        try:
+            await asyncio.to_thread(self._registry.register)
+        except Exception as exc:  # pragma: no cover - best-effort
+            logger.warning("Session registry registration failed: %s", exc)
+        else:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        try:
+            await asyncio.to_thread(self._speech_pool.warm_up)
+        except Exception as exc:  # pragma: no cover - best-effort
+            logger.warning("Speech client warm-up failed: %s", exc)
+        if self._denoise_pool:
+            try:
+                await asyncio.to_thread(self._denoise_pool.start)
+            except Exception as exc:  # pragma: no cover - best-effort
+                logger.warning("Denoise pool start failed: %s", exc)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.worker_heartbeat_sec)
+            try:
+                await asyncio.to_thread(self._registry.heartbeat)
+            except Exception as exc:  # pragma: no cover - best-effort
+                logger.warning("Session registry heartbeat failed: %s", exc)
+
+    def get_capacity(self) -> Dict[str, Any]:
+        """Headroom snapshot for ``/health`` (load balancers route on it)."""
+        capacity: Dict[str, Any] = dict(self._admission.get_stats())
+        capacity["parked_sessions"] = len(self._parked)
+        capacity["draining"] = self._registry.draining
+        if self._registry.draining:
+            capacity["headroom"] = 0
+        return capacity
+
+    @property
+    def speech_pool(self) -> SpeechClientPool:
+        return self._speech_pool
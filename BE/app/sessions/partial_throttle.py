@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class PartialThrottle:
+    """Rate limiter for one session's ``stt.partial`` events.
+
+    ``update`` is called from the recognizer thread for every interim result.
+    At most one partial is sent per ``interval`` seconds. A text that arrives
+    inside the interval is held, and a timer on the event loop sends the
+    newest held text when the interval ends, so the client always ends up
+    with the latest interim. ``flush`` sends any held text immediately (call
+    it before emitting a final) and starts the next utterance from scratch,
+    without waiting out the interval.
+
+    With ``delta`` enabled the payload carries only the changed suffix:
+    ``{"text": suffix, "offset": n}``, where ``n`` is the length of the
+    prefix shared with the previously sent text, in UTF-16 code units so the
+    browser can apply ``prev.slice(0, n) + text`` directly.
+    """
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], interval: float, delta: bool = False) -> None:
+        self._send = send
+        self._interval = max(interval, 0.0)
+        self._delta = delta
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._newest = ""
+        self._sent_text = ""
+        self._sent_at = 0.0
+        self._timer_generation = 0
+        self._timer_armed = False
+        self._sent = 0
+
+    @property
+    def sent(self) -> int:
+        return self._sent
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def update(self, text: str) -> None:
+        with self._lock:
+            if text == self._newest:
+                return
+            self._newest = text
+            now = time.monotonic()
+            due = self._sent_at + self._interval
+            if now >= due and not self._timer_armed:
+                self._emit_locked(now)
+                return
+            if self._timer_armed or self._loop is None:
+                return
+            self._timer_armed = True
+            generation = self._timer_generation
+            delay = max(due - now, 0.0)
+        try:
+            self._loop.call_soon_threadsafe(self._arm, generation, delay)
+        except RuntimeError:
+            # Event loop already closed.
+            pass
+
+    def flush(self) -> None:
+        """Send the held text now and reset for the next utterance."""
+        with self._lock:
+            self._timer_generation += 1
+            self._timer_armed = False
+            if self._newest != self._sent_text:
+                self._emit_locked(time.monotonic())
+            self._newest = ""
+            self._sent_text = ""
+            # The first interim of the next utterance goes out immediately.
+            self._sent_at = 0.0
+
+    def resync(self) -> None:
+        """Resend the newest text in full, e.g. to a client that missed deltas."""
+        with self._lock:
+            if not self._newest:
+                return
+            self._sent_text = ""
+            self._emit_locked(time.monotonic())
+
+    def _arm(self, generation: int, delay: float) -> None:
+        assert self._loop is not None
+        self._loop.call_later(delay, self._on_timer, generation)
+
+    def _on_timer(self, generation: int) -> None:
+        with self._lock:
+            if generation != self._timer_generation:
+                return
+            self._timer_armed = False
+            if self._newest != self._sent_text:
+                self._emit_locked(time.monotonic())
+
+    def _emit_locked(self, now: float) -> None:
+        text = self._newest
+        if self._delta:
+            payload: Dict[str, Any] = self._delta_payload(self._sent_text, text)
+        else:
+            payload = {"text": text}
+        self._sent_text = text
+        self._sent_at = now
+        self._sent += 1
+        self._send(payload)
+
+    @staticmethod
+    def _delta_payload(previous: str, text: str) -> Dict[str, Any]:
+        common = 0
+        for old_char, new_char in zip(previous, text):
+            if old_char != new_char:
+                break
+            common += 1
+        offset = len(text[:common].encode("utf-16-le")) // 2
+        return {"text": text[common:], "offset": offset}
@@ -12,6 +12,7 @@ QUESTION_PATTERN = re.compile(
     r"(?:\?|요\??|까\??|나요\??|니|냐|나\??|죠\??|지요\??|습니까\??|습니까요\??|아니야)\s*$",
     re.IGNORECASE,
 )
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[\.\?\!])\s+")
 
 
 @dataclass
@@ -23,20 +24,33 @@ class Sentence:
 
 
 class QAExtractor:
+    """Pairs questions with answers as final segments arrive.
+
+    Sentences are split once per segment and kept in ``self._sentences``. Only
+    newly appended sentences are checked for questions; a question stays in
+    ``self._pending`` until its answer window (``qa_sentence_window`` sentences
+    or ``qa_time_window_sec`` seconds) is closed, so each final costs
+    O(new sentences + open questions) instead of a rescan of the transcript.
+    """
+
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
-        self._segments: List[Segment] = []
+        self._sentences: List[Sentence] = []
+        self._pending: List[int] = []
         self._emitted: set[Tuple[str, str, float]] = set()
 
     def append_segments(self, segments: List[Segment]) -> List[dict]:
-        self._segments.extend(segments)
-        sentences = self._segments_to_sentences(self._segments)
-        return self._extract(sentences)
+        first_new = len(self._sentences)
+        self._sentences.extend(self._segments_to_sentences(segments))
+        for idx in range(first_new, len(self._sentences)):
+            if QUESTION_PATTERN.search(self._sentences[idx].text):
+                self._pending.append(idx)
+        return self._extract(self._sentences)
 
     def _segments_to_sentences(self, segments: List[Segment]) -> List[Sentence]:
         sentences: List[Sentence] = []
         for segment in segments:
-            parts = re.split(r"(?<=[\.\?\!])\s+", segment.text.strip())
+            parts = SENTENCE_SPLIT_PATTERN.split(segment.text.strip())
             cursor = segment.start
             duration = max(segment.end - segment.start, 0.001)
             per_sentence = duration / max(len(parts), 1)
@@ -56,11 +70,12 @@ class QAExtractor:
 
     def _extract(self, sentences: List[Sentence]) -> List[dict]:
         pairs: List[dict] = []
-        for idx, question in enumerate(sentences):
-            if not QUESTION_PATTERN.search(question.text):
-                continue
-
+        still_pending: List[int] = []
+        for idx in self._pending:
+            question = sentences[idx]
             answer = self._find_answer(idx, question, sentences)
+            if not self._is_settled(idx, question, answer, sentences):
+                still_pending.append(idx)
             if not answer:
                 continue
 
@@ -81,8 +96,25 @@ class QAExtractor:
                     "confidence": confidence,
                 },
             )
+        self._pending = still_pending
         return pairs
 
+    def _is_settled(
+        self,
+        idx: int,
+        question: Sentence,
+        answer: Optional[Sentence],
+        sentences: List[Sentence],
+    ) -> bool:
+        # An answer from another speaker ends the search in _find_answer for good.
+        if answer is not None and answer.speaker != question.speaker:
+            return True
+        limit = idx + self._settings.qa_sentence_window
+        if len(sentences) > limit:
+            return True
+        max_time = question.end + self._settings.qa_time_window_sec
+        return any(sentence.start > max_time for sentence in sentences[idx + 1:])
+
     def _find_answer(self, idx: int, question: Sentence, sentences: List[Sentence]) -> Optional[Sentence]:
         max_time = question.end + self._settings.qa_time_window_sec
         limit = idx + self._settings.qa_sentence_window
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRegistry:
+    """File-backed ownership table shared by every worker on a node.
+
+    Each worker writes ``workers/<worker_id>.json`` (pid, public URL,
+    session count, draining flag, heartbeat) and each live session is
+    recorded as ``sessions/<session_id>.json`` naming its owner. Mutations
+    take an exclusive ``flock`` on ``registry.lock``, so uvicorn workers (or
+    separate processes on one host) agree on who owns a session. A worker
+    whose heartbeat is older than ``ttl`` seconds, or whose pid is gone, is
+    considered dead and its sessions may be claimed by others.
+
+    All methods do small blocking file I/O; call them off the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        public_url: Optional[str] = None,
+        ttl: float = 15.0,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        self._directory = Path(directory)
+        self._workers_dir = self._directory / "workers"
+        self._sessions_dir = self._directory / "sessions"
+        self._lock_path = self._directory / "registry.lock"
+        self._public_url = public_url
+        self._ttl = ttl
+        self._hostname = socket.gethostname()
+        self.worker_id = worker_id or f"{self._hostname}-{os.getpid()}"
+        self._sessions: set[str] = set()
+        self._draining = False
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def register(self) -> None:
+        self._workers_dir.mkdir(parents=True, exist_ok=True)
+        self._sessions_dir.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            self._write_worker()
+
+    def heartbeat(self) -> None:
+        with self._locked():
+            self._write_worker()
+
+    def set_draining(self, draining: bool = True) -> None:
+        self._draining = draining
+        with self._locked():
+            self._write_worker()
+
+    def claim(self, session_id: str) -> None:
+        with self._locked():
+            self._sessions.add(session_id)
+            self._write_json(self._sessions_dir / f"{session_id}.json", {"worker_id": self.worker_id})
+            self._write_worker()
+
+    def release(self, session_id: str) -> None:
+        with self._locked():
+            self._sessions.discard(session_id)
+            path = self._sessions_dir / f"{session_id}.json"
+            owner = self._read_json(path)
+            if owner and owner.get("worker_id") == self.worker_id:
+                path.unlink(missing_ok=True)
+            self._write_worker()
+
+    def owner(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Live worker record owning ``session_id`` (``None`` if unowned or dead)."""
+        with self._locked():
+            record = self._read_json(self._sessions_dir / f"{session_id}.json")
+            if not record:
+                return None
+            worker = self._read_json(self._workers_dir / f"{record.get('worker_id')}.json")
+            if not worker or not self._is_alive(worker):
+                return None
+            return worker
+
+    def pick_worker(self) -> Optional[Dict[str, Any]]:
+        """Least-loaded live, non-draining worker other than this one."""
+        candidates = [
+            worker
+            for worker in self.live_workers()
+            if worker["worker_id"] != self.worker_id and not worker.get("draining")
+        ]
+        return min(candidates, key=lambda worker: worker.get("sessions", 0), default=None)
+
+    def live_workers(self) -> List[Dict[str, Any]]:
+        workers: List[Dict[str, Any]] = []
+        with self._locked():
+            for path in self._workers_dir.glob("*.json"):
+                worker = self._read_json(path)
+                if not worker:
+                    continue
+                if self._is_alive(worker):
+                    workers.append(worker)
+                elif worker.get("hostname") == self._hostname:
+                    # Crashed local worker: forget it and its sessions.
+                    self._purge(worker["worker_id"])
+        return workers
+
+    def close(self) -> None:
+        with self._locked():
+            for session_id in list(self._sessions):
+                (self._sessions_dir / f"{session_id}.json").unlink(missing_ok=True)
+            self._sessions.clear()
+            (self._workers_dir / f"{self.worker_id}.json").unlink(missing_ok=True)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _write_worker(self) -> None:
+        self._write_json(
+            self._workers_dir / f"{self.worker_id}.json",
+            {
+                "worker_id": self.worker_id,
+                "hostname": self._hostname,
+                "pid": os.getpid(),
+                "url": self._public_url,
+                "sessions": len(self._sessions),
+                "draining": self._draining,
+                "heartbeat": time.time(),
+            },
+        )
+
+    def _is_alive(self, worker: Dict[str, Any]) -> bool:
+        if time.time() - float(worker.get("heartbeat", 0)) > self._ttl:
+            return False
+        if worker.get("hostname") == self._hostname:
+            try:
+                os.kill(int(worker.get("pid", 0)), 0)
+            except ProcessLookupError:
+                return False
+            except PermissionError:
+                pass
+        return True
+
+    def _purge(self, worker_id: str) -> None:
+        for path in self._sessions_dir.glob("*.json"):
+            record = self._read_json(path)
+            if record and record.get("worker_id") == worker_id:
+                path.unlink(missing_ok=True)
+        (self._workers_dir / f"{worker_id}.json").unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temp, path)
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+import grpc
+from google.auth.exceptions import DefaultCredentialsError
+from google.cloud import speech_v1 as speech
+from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+from google.oauth2 import service_account
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechClientPool:
+    """Process-wide pool of Google Speech clients shared by every session.
+
+    Credentials are loaded once and each client owns its own gRPC channel
+    (a dedicated HTTP/2 connection). Streams are multiplexed over at most
+    ``stt_channel_pool_size`` channels; a lease always goes to the channel
+    with the fewest active streams, and new channels are only opened once
+    every existing one carries ``stt_streams_per_channel`` streams.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._size = max(settings.stt_channel_pool_size, 1)
+        self._streams_per_channel = max(settings.stt_streams_per_channel, 1)
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._credentials_loaded = False
+        self._clients: List[speech.SpeechClient] = []
+        self._active: List[int] = []
+        self._closed = False
+
+    @contextmanager
+    def lease(self) -> Iterator[speech.SpeechClient]:
+        index, client = self._acquire()
+        try:
+            yield client
+        finally:
+            with self._lock:
+                # close() already dropped every counter; a lease outliving it has nothing to release.
+                if not self._closed:
+                    self._active[index] -= 1
+
+    def warm_up(self, timeout: float = 5.0) -> None:
+        """Open the first channel ahead of the first session."""
+        with self._lock:
+            if self._closed or self._clients:
+                return
+            self._clients.append(self._create_client())
+            self._active.append(0)
+            channel = self._clients[0].transport.grpc_channel
+        try:
+            grpc.channel_ready_future(channel).result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            logger.warning("Speech channel not ready after %.1fs; continuing lazily", timeout)
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "channels": len(self._clients),
+                "streams": sum(self._active),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            clients = self._clients
+            self._clients = []
+            self._active = []
+        for client in clients:
+            try:
+                client.transport.close()
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.warning("Failed to close speech channel: %s", exc)
+
+    def _acquire(self) -> Tuple[int, speech.SpeechClient]:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("speech client pool is closed")
+            index = self._least_loaded()
+            saturated = index is None or self._active[index] >= self._streams_per_channel
+            if saturated and len(self._clients) < self._size:
+                self._clients.append(self._create_client())
+                self._active.append(0)
+                index = len(self._clients) - 1
+            elif saturated:
+                logger.warning(
+                    "All %d speech channels carry >= %d streams; multiplexing further",
+                    len(self._clients),
+                    self._streams_per_channel,
+                )
+            assert index is not None
+            self._active[index] += 1
+            return index, self._clients[index]
+
+    def _least_loaded(self) -> Optional[int]:
+        if not self._clients:
+            return None
+        return min(range(len(self._active)), key=self._active.__getitem__)
+
+    def _load_credentials(self):
+        if self._credentials_loaded:
+            return self._credentials
+        if self._settings.google_application_credentials:
+            try:
+                self._credentials = service_account.Credentials.from_service_account_file(
+                    str(self._settings.google_application_credentials),
+                )
+            except FileNotFoundError as exc:
+                raise DefaultCredentialsError(str(exc)) from exc
+        self._credentials_loaded = True
+        return self._credentials
+
+    def _create_client(self) -> speech.SpeechClient:
+        channel = SpeechGrpcTransport.create_channel(
+            credentials=self._load_credentials(),
+            options=[
+                # Without a local subchannel pool gRPC would collapse identical
+                # channels onto one connection and defeat the pool.
+                ("grpc.use_local_subchannel_pool", 1),
+                ("grpc.keepalive_time_ms", 30_000),
+                ("grpc.max_send_message_length", -1),
+                ("grpc.max_receive_message_length", -1),
+            ],
+        )
+        logger.info("Opened speech channel %d/%d", len(self._clients) + 1, self._size)
+        return speech.SpeechClient(transport=SpeechGrpcTransport(channel=channel))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Tuple
+
+
+class StreamWindow:
+    """Audio bookkeeping for rolling a recognizer over consecutive streams.
+
+    Google caps a single ``streaming_recognize`` call at roughly five minutes,
+    so long sessions are split into several streams. This class remembers the
+    tail of audio sent on the current stream and where the last final result
+    ended, so the next stream can replay the not-yet-finalised audio. Word
+    offsets reported by a stream are relative to its own first byte;
+    ``offset`` converts them back to the session timeline.
+    """
+
+    def __init__(self, bytes_per_second: int, max_replay_ms: int) -> None:
+        self._bytes_per_second = bytes_per_second
+        self._max_replay_bytes = self._align(bytes_per_second * max_replay_ms // 1000)
+        self._history: Deque[Tuple[int, bytes]] = deque()
+        self._history_bytes = 0
+        self._stream_bytes = 0
+        self._last_final_bytes = 0
+        self._offset = 0.0
+        self._streams = 1
+
+    @property
+    def offset(self) -> float:
+        """Session time (seconds) that corresponds to 0.0 in the current stream."""
+        return self._offset
+
+    @property
+    def streams(self) -> int:
+        return self._streams
+
+    @property
+    def stream_seconds(self) -> float:
+        return self._stream_bytes / self._bytes_per_second
+
+    def record(self, chunk: bytes) -> None:
+        self._history.append((self._stream_bytes, chunk))
+        self._history_bytes += len(chunk)
+        self._stream_bytes += len(chunk)
+        while self._history and self._history_bytes - len(self._history[0][1]) >= self._max_replay_bytes:
+            _, dropped = self._history.popleft()
+            self._history_bytes -= len(dropped)
+
+    def mark_final(self, stream_end_seconds: float) -> None:
+        end = self._align(int(stream_end_seconds * self._bytes_per_second))
+        self._last_final_bytes = max(self._last_final_bytes, min(end, self._stream_bytes))
+
+    def rollover(self) -> bytes:
+        """Start a new stream and return the audio it must replay first."""
+        replay_from = max(self._last_final_bytes, self._stream_bytes - self._max_replay_bytes, 0)
+        parts = []
+        for start, chunk in self._history:
+            end = start + len(chunk)
+            if end <= replay_from:
+                continue
+            parts.append(chunk[max(replay_from - start, 0):])
+        replay = b"".join(parts)
+
+        self._offset += replay_from / self._bytes_per_second
+        self._history.clear()
+        self._history_bytes = 0
+        self._stream_bytes = 0
+        self._last_final_bytes = 0
+        self._streams += 1
+        return replay
+
+    @staticmethod
+    def _align(value: int) -> int:
+        return value - value % 2
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from concurrent.futures import Executor
 from typing import Any, Dict, Optional, Set
 
 from aiortc import (
@@ -17,8 +18,11 @@ from aiortc.rtcicetransport import Candidate
 from fastapi import WebSocket
 
 from app.core.config import Settings
+from app.noise.denoise_pool import DenoisePool
+from app.sessions.audio_buffer import AudioRingBuffer
 from app.sessions.audio_pipeline import AudioPipeline
 from app.sessions import events
+from app.sessions.speech_pool import SpeechClientPool
 from app.sessions.transcriber import Transcriber
 logger = logging.getLogger(__name__)
 
@@ -31,26 +35,42 @@ class STTSession:
         session_id: str,
         websocket: WebSocket,
         settings: Settings,
+        speech_pool: SpeechClientPool,
+        denoise_pool: Optional[DenoisePool] = None,
+        recognizer_executor: Optional[Executor] = None,
     ) -> None:
         self.session_id = session_id
         self.websocket = websocket
         self.settings = settings
 
         self._closed = asyncio.Event()
+        self._resumable = settings.stt_resume_grace_sec > 0
+        self._events = events.EventChannel(
+            websocket,
+            replay_size=settings.stt_resume_replay_events if self._resumable else 0,
+        )
         self._tasks: Set[asyncio.Task[None]] = set()
-        self._audio_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=64)
+        bytes_per_ms = settings.stt_sample_rate * 2 // 1000
+        self._audio_buffer = AudioRingBuffer(
+            capacity=settings.stt_audio_buffer_ms * bytes_per_ms,
+            overflow=settings.stt_audio_overflow,
+            spill_max_bytes=settings.stt_audio_spill_max_sec * 1000 * bytes_per_ms,
+        )
         self._logs_dir = settings.logs_dir
         self._audio_pipeline = AudioPipeline(
             session_id=session_id,
             settings=settings,
-            output_queue=self._audio_queue,
+            output_buffer=self._audio_buffer,
+            denoise_pool=denoise_pool,
         )
         self._transcriber = Transcriber(
             session_id=session_id,
             settings=settings,
-            websocket=websocket,
-            audio_queue=self._audio_queue,
+            event_channel=self._events,
+            audio_buffer=self._audio_buffer,
+            speech_pool=speech_pool,
             audio_pipeline=self._audio_pipeline,
+            recognizer_executor=recognizer_executor,
         )
         self._transcriber_started = False
         self._room_id: Optional[str] = None
@@ -70,18 +90,33 @@ class STTSession:
         if not ice_servers:
             ice_servers = [RTCIceServer("stun:stun.l.google.com:19302")]
 
-        configuration = RTCConfiguration(iceServers=ice_servers)
-        self._pc = RTCPeerConnection(configuration=configuration)
-        self._pc.addTransceiver("audio", direction="recvonly")
-        self._pc.on("connectionstatechange")(self._on_connection_state_change)
-        self._pc.on("track")(self._on_track)
-        self._pc.on("icecandidate")(self._on_icecandidate)
+        self._rtc_configuration = RTCConfiguration(iceServers=ice_servers)
+        self._pc = self._create_peer_connection()
+
+    def _create_peer_connection(self) -> RTCPeerConnection:
+        pc = RTCPeerConnection(configuration=self._rtc_configuration)
+        pc.addTransceiver("audio", direction="recvonly")
+        pc.on("connectionstatechange")(self._on_connection_state_change)
+        pc.on("track")(self._on_track)
+        pc.on("icecandidate")(self._on_icecandidate)
+        return pc
 
     async def handle_offer(self, offer: Dict[str, Any]) -> Dict[str, Any]:
         logger.debug("Session %s handling offer", self.session_id)
         if "sdp" not in offer or "type" not in offer:
             raise ValueError("Invalid offer payload")
 
+        if self._resumable and self._pc.remoteDescription is not None:
+            # A resumed client whose media path broke renegotiates from scratch;
+            # the new track feeds the same pipeline and transcriber.
+            logger.info("Session %s replacing peer connection after resume", self.session_id)
+            previous, self._pc = self._pc, self._create_peer_connection()
+            previous.remove_all_listeners()
+            try:
+                await previous.close()
+            except Exception as exc:  # pragma: no cover - diagnostics
+                logger.warning("Session %s previous peer connection close failed: %s", self.session_id, exc)
+
         remote_description = RTCSessionDescription(sdp=offer["sdp"], type=offer["type"])
         await self._pc.setRemoteDescription(remote_description)
 
@@ -161,17 +196,35 @@ class STTSession:
         except Exception as exc:  # pragma: no cover - diagnostics
             logger.exception("Session %s peer connection close failed: %s", self.session_id, exc)
 
-        # Drain audio queue to unblock consumer
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        # Drop buffered audio and unblock the consumer
+        self._audio_buffer.clear()
+        self._audio_buffer.close()
+
+        await events.emit_session_close(self._events, "session stopped")
+        await self._events.close()
+
+    @property
+    def event_channel(self) -> events.EventChannel:
+        return self._events
 
-        await events.emit_session_close(self.websocket, "session stopped")
+    @property
+    def resumable(self) -> bool:
+        return self._resumable and not self._closed.is_set()
 
-    def get_audio_queue(self) -> asyncio.Queue[Optional[bytes]]:
-        return self._audio_queue
+    def detach(self) -> None:
+        """Keep recognising while the client is away; events wait for replay."""
+        logger.info("Session %s detached from its WebSocket", self.session_id)
+        self._events.detach()
+
+    def attach(self, websocket: WebSocket, last_seq: int) -> bool:
+        logger.info("Session %s resumed after seq %d", self.session_id, last_seq)
+        self.websocket = websocket
+        complete = self._events.attach(websocket, last_seq)
+        self._transcriber.resync_partial()
+        return complete
+
+    def get_audio_buffer(self) -> AudioRingBuffer:
+        return self._audio_buffer
 
     def configure(self, payload: Dict[str, Any]) -> None:
         room_id = payload.get("roomId") or payload.get("room_id")
@@ -181,10 +234,14 @@ class STTSession:
 
     def _on_connection_state_change(self) -> None:
         logger.debug("Session %s connection state: %s", self.session_id, self._pc.connectionState)
-        if self._pc.connectionState in {"failed", "closed"}:
-            asyncio.create_task(self.stop())
         if self._pc.connectionState == "failed":
             logger.error("Session %s peer connection failed", self.session_id)
+        if self._pc.connectionState in {"failed", "closed"}:
+            if self._resumable:
+                # The client may come back and renegotiate; the manager's grace
+                # timer or an explicit close ends the session otherwise.
+                return
+            asyncio.create_task(self.stop())
 
     def _on_track(self, track: MediaStreamTrack) -> None:
         if track.kind != "audio":
@@ -211,10 +268,8 @@ class STTSession:
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("Audio consumption failed for session %s: %s", self.session_id, exc)
         finally:
-            try:
-                self._audio_queue.put_nowait(None)
-            except asyncio.QueueFull:
-                pass
+            if not self._resumable:
+                self._audio_buffer.close()
 
     async def _ensure_transcriber_started(self) -> None:
         if not self._transcriber_started:
@@ -232,4 +287,4 @@ class STTSession:
             }
 
         logger.debug("Session %s emitting local ICE candidate", self.session_id)
-        await events.emit_rtc_candidate(self.websocket, payload)
+        await events.emit_rtc_candidate(self._events, payload)
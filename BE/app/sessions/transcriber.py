@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 import time
+from concurrent.futures import Executor
+from pathlib import Path
 from typing import Iterable, Optional, TYPE_CHECKING
 
 from google.api_core import exceptions as google_exceptions
@@ -10,17 +13,21 @@ from google.cloud import speech_v1 as speech
 from google.cloud.speech_v1 import types as speech_types
 from google.cloud.speech_v1.types import StreamingRecognizeResponse, SpeechRecognitionResult
 from google.auth.exceptions import DefaultCredentialsError
-from google.oauth2 import service_account
 
 from app.core.config import Settings
 from app.models import QAPair, TranscriptSegment
 from app.sessions import events
 from app.sessions.diarization import DiarizationProcessor, Segment
+from app.sessions.partial_throttle import PartialThrottle
 from app.sessions.qa_extractor import QAExtractor
+from app.sessions.stream_window import StreamWindow
 from app.use_cases import get_stt_use_case
+from app.util.log_sink import JsonlLogSink, get_jsonl_writer
 
 if TYPE_CHECKING:
+    from app.sessions.audio_buffer import AudioRingBuffer
     from app.sessions.audio_pipeline import AudioPipeline
+    from app.sessions.speech_pool import SpeechClientPool
 
 
 logger = logging.getLogger(__name__)
@@ -31,22 +38,42 @@ class Transcriber:
         self,
         session_id: str,
         settings: Settings,
-        websocket,
-        audio_queue: asyncio.Queue[Optional[bytes]],
+        event_channel: events.EventChannel,
+        audio_buffer: 'AudioRingBuffer',
+        speech_pool: 'SpeechClientPool',
         audio_pipeline: 'AudioPipeline' | None = None,
+        recognizer_executor: Optional[Executor] = None,
     ) -> None:
         self._session_id = session_id
         self._settings = settings
-        self._websocket = websocket
-        self._audio_queue = audio_queue
+        self._events = event_channel
+        self._audio_buffer = audio_buffer
+        self._speech_pool = speech_pool
         self._audio_pipeline = audio_pipeline
+        # Blocking streaming loop runs for the whole session; ``None`` means the loop's default executor.
+        self._recognizer_executor = recognizer_executor
+        self._request_bytes = max(settings.stt_sample_rate * 2 * settings.stt_request_target_ms // 1000, 2)
+        self._request_max_latency = settings.stt_request_max_latency_ms / 1000
+        self._bytes_per_second = settings.stt_sample_rate * 2
+        self._stream_window = StreamWindow(self._bytes_per_second, settings.stt_stream_replay_max_ms)
+        self._pending_replay = b""
+        self._replay_pos = 0
+        self._stream_generation = 0
+        # Serialises ring reads/stream-window bookkeeping with rollover, so a chunk
+        # read while the upstream stream ends lands in the window and is replayed.
+        self._stream_lock = threading.Lock()
+        self._audio_finished = False
 
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._task: Optional[asyncio.Task[None]] = None
         self._stop_event = asyncio.Event()
         self._partial_text: str = ""
         self._final_count = 0
-        self._partial_count = 0
+        self._partial_throttle = PartialThrottle(
+            lambda payload: self._events.post("stt.partial", payload),
+            interval=settings.stt_partial_interval_ms / 1000,
+            delta=settings.stt_partial_delta,
+        )
         self._started_at: float = 0.0
 
         self._qa_extractor = QAExtractor(settings)
@@ -55,13 +82,19 @@ class Transcriber:
         self._transcript_segments: list[TranscriptSegment] = []
         self._last_final_transcript: str = ""
         self._room_id: Optional[str] = None
-        self._diarizer = DiarizationProcessor(settings.logs_dir)
+        self._timeline = audio_pipeline.timeline if audio_pipeline else None
+        self._diarizer = DiarizationProcessor(
+            self._create_log_sink(),
+            time_map=self._timeline.to_session if self._timeline else None,
+        )
 
     async def start(self) -> None:
         if self._task is not None:
             logger.debug("Transcriber already running for session %s", self._session_id)
             return
         self._loop = asyncio.get_running_loop()
+        self._events.start()
+        self._partial_throttle.bind(self._loop)
         self._stop_event.clear()
         self._started_at = time.monotonic()
         self._qa_extractor = QAExtractor(self._settings)
@@ -70,6 +103,10 @@ class Transcriber:
         self._transcript_segments = []
         self._last_final_transcript = ""
         self._diarizer.reset()
+        self._stream_window = StreamWindow(self._bytes_per_second, self._settings.stt_stream_replay_max_ms)
+        self._pending_replay = b""
+        self._replay_pos = 0
+        self._audio_finished = False
         self._task = asyncio.create_task(self._run())
         logger.debug("Transcriber started for session %s", self._session_id)
 
@@ -79,10 +116,7 @@ class Transcriber:
             return
 
         self._stop_event.set()
-        try:
-            self._audio_queue.put_nowait(None)
-        except asyncio.QueueFull:
-            pass
+        self._audio_buffer.close()
 
         logger.debug("Awaiting transcriber task shutdown for session %s", self._session_id)
         try:
@@ -92,45 +126,49 @@ class Transcriber:
         finally:
             if self._loop:
                 await events.emit_qa_pairs(
-                    self._websocket,
+                    self._events,
                     [pair.model_dump() for pair in self._qa_pairs],
                     final=True,
                 )
             await self._persist_results()
+            self._diarizer.close()
             logger.debug("Transcriber task finished for session %s", self._session_id)
             self._task = None
 
+    def resync_partial(self) -> None:
+        self._partial_throttle.resync()
+
     def set_room_id(self, room_id: Optional[str]) -> None:
         if room_id:
             self._room_id = room_id
 
+    def _create_log_sink(self) -> Optional[JsonlLogSink]:
+        if not self._settings.diarization_log_enabled:
+            return None
+        writer = get_jsonl_writer(
+            max_queue=self._settings.log_sink_queue_size,
+            flush_interval=self._settings.log_sink_flush_sec,
+        )
+        path = Path(self._settings.logs_dir) / "diarization" / f"{self._session_id}.jsonl"
+        return JsonlLogSink(path, writer)
+
     async def _run(self) -> None:
         try:
             logger.debug("Transcriber run loop starting for session %s", self._session_id)
-            await asyncio.to_thread(self._streaming_recognize)
+            await asyncio.get_running_loop().run_in_executor(self._recognizer_executor, self._streaming_recognize)
         except DefaultCredentialsError as exc:
             logger.error("Google credentials not configured for session %s: %s", self._session_id, exc)
             if self._loop:
-                await events.emit_error(self._websocket, "GOOGLE_AUTH_MISSING", str(exc))
+                await events.emit_error(self._events, "GOOGLE_AUTH_MISSING", str(exc))
         except Exception as exc:  # pragma: no cover - fallback reporting
             logger.exception("Transcriber run failed for session %s: %s", self._session_id, exc)
             if self._loop:
-                await events.emit_error(self._websocket, "UPSTREAM_FAIL", str(exc))
+                await events.emit_error(self._events, "UPSTREAM_FAIL", str(exc))
         finally:
             logger.debug("Transcriber run loop finished for session %s", self._session_id)
 
     def _streaming_recognize(self) -> None:
         logger.debug("Session %s streaming_recognize begin", self._session_id)
-        if self._settings.google_application_credentials:
-            try:
-                credentials = service_account.Credentials.from_service_account_file(
-                    str(self._settings.google_application_credentials),
-                )
-                client = speech.SpeechClient(credentials=credentials)
-            except FileNotFoundError as exc:
-                raise DefaultCredentialsError(str(exc)) from exc
-        else:
-            client = speech.SpeechClient()
         config = speech_types.RecognitionConfig(
             encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
             sample_rate_hertz=self._settings.stt_sample_rate,
@@ -150,18 +188,26 @@ class Transcriber:
 
         logger.debug("Session %s streaming_recognize start", self._session_id)
 
-        request_iterator = self._request_generator(streaming_config)
         try:
-            responses = client.streaming_recognize(requests=request_iterator, config=streaming_config)
-            for response in responses:
-                self._handle_response(response)
+            while not self._stop_event.is_set():
+                self._diarizer.begin_stream(self._stream_window.offset)
+                request_iterator = self._request_generator(streaming_config)
+                try:
+                    with self._speech_pool.lease() as client:
+                        responses = client.streaming_recognize(requests=request_iterator, config=streaming_config)
+                        for response in responses:
+                            self._handle_response(response)
+                except google_exceptions.OutOfRange as exc:
+                    # Upstream hit the stream duration limit before our own rollover did.
+                    logger.info("Session %s stream limit reached upstream: %s", self._session_id, exc)
+
+                if self._audio_finished or self._stop_event.is_set():
+                    break
+                self._roll_over_stream()
         except google_exceptions.GoogleAPICallError as exc:
             logger.warning("Session %s Google STT error: %s", self._session_id, exc)
             if self._loop:
-                asyncio.run_coroutine_threadsafe(
-                    events.emit_error(self._websocket, "UPSTREAM_FAIL", str(exc)),
-                    self._loop,
-                )
+                self._events.post("stt.error", {"code": "UPSTREAM_FAIL", "message": str(exc)})
         finally:
             duration = max(time.monotonic() - self._started_at, 0.0)
             logger.debug(
@@ -171,18 +217,68 @@ class Transcriber:
                 self._final_count,
             )
 
+    def _roll_over_stream(self) -> None:
+        # Waits for a read in flight on the finished stream (at most one request's latency);
+        # that chunk is already recorded, so it is part of the replay.
+        with self._stream_lock:
+            unsent = self._pending_replay[self._replay_pos:]
+            self._stream_generation += 1
+            self._pending_replay = self._stream_window.rollover() + unsent
+            self._replay_pos = 0
+        self._partial_text = ""
+        self._last_final_transcript = ""
+        logger.info(
+            "Session %s rolling over to stream #%d at %.2fs (replaying %.2fs)",
+            self._session_id,
+            self._stream_window.streams,
+            self._stream_window.offset,
+            len(self._pending_replay) / self._bytes_per_second,
+        )
+
     def _request_generator(self, streaming_config: speech_types.StreamingRecognitionConfig):
+        rollover_after = self._settings.stt_stream_rollover_sec
+        # With VAD gating less audio than wall time is sent, but the upstream
+        # limit is on stream duration, so roll over on whichever comes first.
+        stream_started = time.monotonic()
+        generation = self._stream_generation
+        while True:
+            # Replay is consumed in place so a stream that ends mid-replay hands the rest on.
+            with self._stream_lock:
+                if generation != self._stream_generation:
+                    return
+                if self._replay_pos >= len(self._pending_replay):
+                    self._pending_replay, self._replay_pos = b"", 0
+                    break
+                chunk = self._pending_replay[self._replay_pos:self._replay_pos + self._request_bytes]
+                self._replay_pos += len(chunk)
+                self._stream_window.record(chunk)
+            yield speech_types.StreamingRecognizeRequest(audio_content=chunk)
+
         while not self._stop_event.is_set():
-            if self._loop is None:
-                break
-            future = asyncio.run_coroutine_threadsafe(self._audio_queue.get(), self._loop)
-            try:
-                chunk = future.result()
-            except Exception as exc:
-                logger.warning("request_generator future exception for session %s: %s", self._session_id, exc)
+            remaining = min(
+                rollover_after - self._stream_window.stream_seconds,
+                rollover_after - (time.monotonic() - stream_started),
+            )
+            if remaining <= 0:
+                logger.debug("Session %s request_generator closing stream for rollover", self._session_id)
                 break
+            with self._stream_lock:
+                if generation != self._stream_generation:
+                    # The stream was closed upstream; the next stream reads from here.
+                    break
+                chunk = self._audio_buffer.read(
+                    self._request_bytes,
+                    timeout=1.0,
+                    min_bytes=self._request_bytes,
+                    max_latency=self._request_max_latency,
+                )
+                if chunk:
+                    # Recorded before the rollover can run, so if this stream is already
+                    # gone the chunk is replayed on the next one instead of being lost.
+                    self._stream_window.record(chunk)
             if chunk is None:
-                logger.debug("Session %s request_generator received sentinel", self._session_id)
+                logger.debug("Session %s request_generator reached end of audio", self._session_id)
+                self._audio_finished = True
                 break
             if not chunk:
                 continue
@@ -208,15 +304,14 @@ class Transcriber:
             if not result.is_final:
                 if transcript != self._partial_text:
                     self._partial_text = transcript
-                    self._partial_count += 1
-                    asyncio.run_coroutine_threadsafe(
-                        events.emit_partial(self._websocket, transcript),
-                        self._loop,
-                    )
+                    self._partial_throttle.update(transcript)
                 continue
 
+            self._stream_window.mark_final(self._duration_to_seconds(getattr(result, "result_end_time", None)))
             last_partial = self._partial_text
             self._partial_text = ""
+            # Deliver the newest held partial before the final and restart the delta base.
+            self._partial_throttle.flush()
             segments: list[Segment] = self._diarizer.build_segments(result)
             partial_diff = self._extract_new_text(last_partial) if last_partial else ""
 
@@ -239,13 +334,7 @@ class Transcriber:
             if not segments:
                 continue
 
-            asyncio.run_coroutine_threadsafe(
-                events.emit_final_segments(
-                    self._websocket,
-                    [segment.to_dict() for segment in segments],
-                ),
-                self._loop,
-            )
+            self._events.post("stt.final_segments", {"segments": [segment.to_dict() for segment in segments]})
 
             for segment in segments:
                 self._append_transcript_segment(segment)
@@ -253,13 +342,9 @@ class Transcriber:
             qa_payloads = self._qa_extractor.append_segments(segments)
             new_pairs = self._register_qa_pairs(qa_payloads)
             if new_pairs:
-                asyncio.run_coroutine_threadsafe(
-                    events.emit_qa_pairs(
-                        self._websocket,
-                        [pair.model_dump() for pair in new_pairs],
-                        final=False,
-                    ),
-                    self._loop,
+                self._events.post(
+                    "stt.qa_pairs",
+                    {"pairs": [pair.model_dump() for pair in new_pairs], "final": False},
                 )
 
             self._final_count += 1
@@ -267,20 +352,26 @@ class Transcriber:
 
             if self._loop:
                 stats = {
-                    "partials": self._partial_count,
+                    "partials": self._partial_throttle.sent,
                     "finals": self._final_count,
                     "bytes": 0,
                     "chunks": 0,
+                    "requests": 0,
+                    "request_rate": 0.0,
+                    "streams": self._stream_window.streams,
                 }
                 if self._audio_pipeline:
                     pipeline_stats = self._audio_pipeline.get_stats()
                     stats["bytes"] = pipeline_stats.get("bytes", 0)
                     stats["chunks"] = pipeline_stats.get("chunks", 0)
+                    stats["requests"] = pipeline_stats.get("requests", 0)
+                    stats["request_rate"] = pipeline_stats.get("request_rate", 0.0)
+                    stats["suppressed_bytes"] = pipeline_stats.get("suppressed_bytes", 0)
+                    stats["suppressed_seconds"] = pipeline_stats.get("suppressed_seconds", 0.0)
+                    for key in ("buffer_ms", "buffer_peak_ms", "dropped_bytes", "spilled_bytes"):
+                        stats[key] = pipeline_stats.get(key, 0)
 
-                asyncio.run_coroutine_threadsafe(
-                    events.emit_stats(self._websocket, stats),
-                    self._loop,
-                )
+                self._events.post("stt.stats", stats)
 
     def _extract_new_text(self, transcript: str) -> str:
         if not transcript:
@@ -297,16 +388,22 @@ class Transcriber:
         alternative = result.alternatives[0]
         words = list(getattr(alternative, "words", []))
         if words:
-            start = self._duration_to_seconds(getattr(words[0], "start_time", None))
-            end = self._duration_to_seconds(getattr(words[-1], "end_time", None))
+            start = self._to_session_time(self._duration_to_seconds(getattr(words[0], "start_time", None)))
+            end = self._to_session_time(self._duration_to_seconds(getattr(words[-1], "end_time", None)))
         else:
             start = self._transcript_segments[-1].end if self._transcript_segments else 0.0
-            end = self._duration_to_seconds(getattr(result, "result_end_time", None))
+            end = self._to_session_time(self._duration_to_seconds(getattr(result, "result_end_time", None)))
             if end < start:
                 end = start
 
         return Segment(speaker=None, text=text, start=start, end=end)
 
+    def _to_session_time(self, stream_seconds: float) -> float:
+        sent_seconds = self._stream_window.offset + stream_seconds
+        if self._timeline is None:
+            return sent_seconds
+        return self._timeline.to_session(sent_seconds)
+
     def _append_transcript_segment(self, segment: Segment) -> None:
         transcript_segment = TranscriptSegment.from_values(
             segment.speaker,
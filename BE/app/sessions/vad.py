@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import List, Tuple
+
+import numpy as np
+
+
+class EnergyVAD:
+    """Lightweight energy / zero-crossing voice activity detector.
+
+    Tracks an adaptive noise floor (drops immediately, rises slowly) and marks
+    a 16-bit PCM chunk as speech when its level is ``margin_db`` above that
+    floor and above ``min_db``. High zero-crossing chunks (hiss, fan noise)
+    need an extra 10 dB to count as speech.
+    """
+
+    _MAX_ZCR = 0.25
+    _FLOOR_RISE = 0.002
+
+    def __init__(self, margin_db: float = 9.0, min_db: float = -50.0) -> None:
+        self._margin_db = margin_db
+        self._min_db = min_db
+        self._noise_db = min_db
+        # Scratch arrays reused across chunks (grown on demand).
+        self._values = np.empty(0, dtype=np.float32)
+        self._signs = np.empty(0, dtype=bool)
+
+    def is_speech(self, chunk: bytes) -> bool:
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        size = samples.size
+        if not size:
+            return False
+        if self._values.size < size:
+            self._values = np.empty(size, dtype=np.float32)
+            self._signs = np.empty(size, dtype=bool)
+
+        values = self._values[:size]
+        np.copyto(values, samples)
+        rms = float(np.sqrt(np.dot(values, values) / size))
+        level_db = 20.0 * np.log10(rms / 32768.0 + 1e-10)
+        signs = np.signbit(samples, out=self._signs[:size])
+        # Sign changes between neighbours, written back into the sign buffer.
+        crossings = np.not_equal(signs[1:], signs[:-1], out=signs[:-1])
+        zcr = np.count_nonzero(crossings) / size
+
+        if level_db < self._noise_db:
+            self._noise_db = level_db
+        else:
+            self._noise_db += (level_db - self._noise_db) * self._FLOOR_RISE
+
+        threshold = max(self._noise_db + self._margin_db, self._min_db)
+        if zcr > self._MAX_ZCR:
+            threshold += 10.0
+        return level_db > threshold
+
+
+class AudioTimeline:
+    """Maps recognizer (sent-audio) time back to session time.
+
+    Audio that never reaches the recognizer (VAD-suppressed silence, dropped
+    chunks) shortens the timeline Google sees. Each time audio resumes after
+    such a gap a breakpoint ``(sent_seconds, session_seconds)`` is recorded,
+    so word offsets can be shifted back onto the recording's timeline.
+    Written from the event loop, read from the recognizer thread; appends
+    of whole tuples (or swapping in a new list) keep readers consistent
+    without a lock.
+    """
+
+    def __init__(self, bytes_per_second: int) -> None:
+        self._bytes_per_second = bytes_per_second
+        self._sent_bytes = 0
+        self._total_bytes = 0
+        self._gap_open = False
+        self._points: List[Tuple[float, float]] = [(0.0, 0.0)]
+
+    @property
+    def suppressed_bytes(self) -> int:
+        return self._total_bytes - self._sent_bytes
+
+    @property
+    def suppressed_seconds(self) -> float:
+        return self.suppressed_bytes / self._bytes_per_second
+
+    def advance(self, length: int, sent: bool) -> None:
+        if sent:
+            if self._gap_open:
+                self._points.append(
+                    (self._sent_bytes / self._bytes_per_second, self._total_bytes / self._bytes_per_second),
+                )
+                self._gap_open = False
+            self._sent_bytes += length
+        else:
+            self._gap_open = True
+        self._total_bytes += length
+
+    def retract(self, length: int, after: int = 0) -> None:
+        """Audio already counted as sent was discarded before the recognizer saw it.
+
+        The discarded ``length`` bytes end ``after`` bytes before the newest
+        sent audio. They are cut out of the sent timeline: everything sent
+        later moves up by ``length`` and keeps its session time. The new
+        breakpoint list replaces the old one in a single assignment.
+        """
+        end = max(self._sent_bytes - after, 0)
+        start = max(end - length, 0)
+        if end <= start:
+            return
+        start_seconds = start / self._bytes_per_second
+        end_seconds = end / self._bytes_per_second
+        cut_seconds = end_seconds - start_seconds
+        points = [point for point in self._points if point[0] < start_seconds]
+        points.append((start_seconds, self.to_session(end_seconds)))
+        points.extend(
+            (sent - cut_seconds, session) for sent, session in self._points if sent > end_seconds
+        )
+        self._points = points
+        self._sent_bytes -= end - start
+
+    def to_session(self, sent_seconds: float) -> float:
+        points = self._points
+        index = bisect_right(points, sent_seconds, key=lambda point: point[0]) - 1
+        sent_start, session_start = points[max(index, 0)]
+        return session_start + (sent_seconds - sent_start)
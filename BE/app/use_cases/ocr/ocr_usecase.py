@@ -1,37 +1,70 @@
-"""OCR Service - S3에서 PDF를 불러와 Upstage OCR 처리 후 OpenAI 파싱"""
+"""OCR Service - 업로드된 PDF(메모리/임시 파일 또는 S3)를 Upstage OCR 처리 후 OpenAI 파싱"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import BinaryIO, Dict, Union
 
 from app.services.storage_service import get_storage_service
 from .services.upstage_client import get_upstage_client
 from .services.openai_parser import get_openai_parser
 from .services.schema_loader import get_schema_loader
+from .services.ocr_cache import build_cache_key, build_page_cache_key, document_digest, get_ocr_cache
+from .services.pdf_pages import is_text_layer_usable, read_text_layers, split_pdf_pages
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+UPSTAGE_ENGINE = "upstage-ocr"
+
+PAGE_SOURCE_TEXT_LAYER = "text_layer"
+PAGE_SOURCE_UPSTAGE = "upstage"
+
+# 페이지별 텍스트 출처 누적 (메트릭용, /health 로 노출)
+_page_sources: Counter[str] = Counter()
 
 
 class OCRUsecase:
-    """OCR 처리: S3 다운로드 → Upstage OCR → OpenAI 파싱"""
+    """OCR 처리: PDF 바이트 → 페이지별 텍스트 레이어 추출 / Upstage OCR → OpenAI 파싱"""
 
     def __init__(self):
         self.storage_service = get_storage_service()
         self.upstage_client = get_upstage_client()
         self.openai_parser = get_openai_parser()
         self.schema_loader = get_schema_loader()
+        self.cache = get_ocr_cache()
 
-    async def process(self, s3_key: str, contract_type: str = "주택임대차표준계약서") -> dict:
+    async def process(
+        self,
+        document: Union[bytes, BinaryIO],
+        contract_type: str = "주택임대차표준계약서",
+    ) -> dict:
         """
-        S3 PDF → Upstage OCR → OpenAI 파싱 → 구조화된 데이터
+        PDF → Upstage OCR → OpenAI 파싱 → 구조화된 데이터
 
         Args:
-            s3_key: S3 객체 키 (파일 경로)
+            document: PDF 바이너리 또는 읽기 가능한 파일 객체 (예: 업로드 SpooledTemporaryFile)
             contract_type: 계약서 타입 (기본: 주택임대차표준계약서)
 
         Returns:
             dict: 파싱된 계약서 데이터 (스키마에 맞는 구조)
         """
-        # STEP 1: S3에서 PDF 다운로드 (메모리)
-        pdf_bytes = await self.storage_service.download_bytes(s3_key)
+        # STEP 1: PDF 바이트 확보 (업로드 경로는 S3 를 거치지 않음)
+        if isinstance(document, (bytes, bytearray, memoryview)):
+            pdf_bytes = bytes(document)
+        else:
+            document.seek(0)
+            pdf_bytes = await asyncio.to_thread(document.read)
+
+        # 같은 문서 + 같은 스키마/프롬프트/모델이면 캐시된 결과 반환
+        digest = document_digest(pdf_bytes)
+        cache_key = build_cache_key(digest, contract_type, self._cache_version(contract_type))
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # STEP 2: Upstage OCR API 호출 (원본 텍스트 추출)
-        ocr_result = await self.upstage_client.ocr_document(pdf_bytes)
-        raw_text = ocr_result.get("text", "")
+        # STEP 2: 원본 텍스트 추출 (텍스트 레이어 우선, 이미지 페이지만 Upstage OCR 병렬 호출)
+        raw_text = await self._extract_text(pdf_bytes, digest)
 
         # STEP 3: 완성된 프롬프트 생성 (스키마 + OCR 텍스트 삽입)
         full_prompt = self.schema_loader.load_prompt(contract_type, raw_text)
@@ -39,9 +72,97 @@ class OCRUsecase:
         # STEP 4: OpenAI API로 구조화된 데이터 파싱
         parsed_data = await self.openai_parser.parse_with_schema(full_prompt)
 
-        # STEP 5: 파싱된 데이터 반환
+        # STEP 5: 캐시에 저장 후 파싱된 데이터 반환
+        await self.cache.set(cache_key, parsed_data, contract_type=contract_type)
         return parsed_data
 
+    async def process_object(self, s3_key: str, contract_type: str = "주택임대차표준계약서") -> dict:
+        """
+        이미 S3 에 있는 PDF 처리 (재처리 등 원본 바이트가 없는 경우)
+
+        Args:
+            s3_key: S3 객체 키 (파일 경로)
+            contract_type: 계약서 타입 (기본: 주택임대차표준계약서)
+
+        Returns:
+            dict: 파싱된 계약서 데이터 (스키마에 맞는 구조)
+        """
+        pdf_bytes = await self.storage_service.download_bytes(s3_key)
+        return await self.process(pdf_bytes, contract_type)
+
+    async def _extract_text(self, pdf_bytes: bytes, digest: str) -> str:
+        """
+        페이지별 텍스트 추출 후 페이지 순서대로 이어 붙임
+
+        - 내장 텍스트 레이어가 쓸 만한 페이지(전자 문서)는 로컬에서 바로 추출
+        - 이미지뿐인 페이지(스캔본)만 한 페이지짜리 PDF 로 나눠 Upstage OCR 을 동시에 호출
+
+        OCR 페이지 결과는 개별 캐시되므로 일부 페이지가 실패해 작업이 재시도되어도
+        성공한 페이지는 다시 호출하지 않는다.
+
+        Args:
+            pdf_bytes: PDF 파일의 바이너리 데이터
+            digest: document_digest 로 구한 PDF 해시 (페이지 캐시 키용)
+
+        Returns:
+            str: 전체 문서의 텍스트
+        """
+        try:
+            layers = await asyncio.to_thread(read_text_layers, pdf_bytes)
+        except Exception as exc:
+            # pdfium 이 못 여는 PDF 는 Upstage 에 통째로 맡김
+            logger.warning("PDF open failed, sending whole document to Upstage: %s", exc)
+            _page_sources[PAGE_SOURCE_UPSTAGE] += 1
+            return await self._ocr_page(digest, 0, pdf_bytes, asyncio.Semaphore(1))
+
+        sources = [
+            PAGE_SOURCE_TEXT_LAYER
+            if settings.ocr_text_layer_enabled and is_text_layer_usable(text, settings.ocr_text_layer_min_chars)
+            else PAGE_SOURCE_UPSTAGE
+            for text in layers
+        ]
+        _page_sources.update(sources)
+        logger.info("OCR page sources (%d pages): %s", len(sources), ",".join(sources))
+
+        texts = [text if source == PAGE_SOURCE_TEXT_LAYER else "" for text, source in zip(layers, sources)]
+        ocr_indices = [index for index, source in enumerate(sources) if source == PAGE_SOURCE_UPSTAGE]
+        if ocr_indices:
+            pages = await asyncio.to_thread(split_pdf_pages, pdf_bytes, ocr_indices)
+            semaphore = asyncio.Semaphore(max(settings.ocr_page_concurrency, 1))
+            # 실패한 페이지가 있어도 나머지 페이지는 끝까지 받아 캐시에 남김
+            results = await asyncio.gather(
+                *(self._ocr_page(digest, index, page, semaphore) for index, page in zip(ocr_indices, pages)),
+                return_exceptions=True,
+            )
+            for index, result in zip(ocr_indices, results):
+                if isinstance(result, BaseException):
+                    raise result
+                texts[index] = result
+        return "\n\n".join(text.strip() for text in texts if text.strip())
+
+    async def _ocr_page(
+        self,
+        digest: str,
+        page_index: int,
+        page_bytes: bytes,
+        semaphore: asyncio.Semaphore,
+    ) -> str:
+        """한 페이지 OCR (문서 해시 + 페이지 번호 캐시 우선)"""
+        cache_key = build_page_cache_key(digest, page_index, UPSTAGE_ENGINE)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached.get("text", "")
+
+        async with semaphore:
+            ocr_result = await self.upstage_client.ocr_document(page_bytes)
+        text = ocr_result.get("text", "")
+        await self.cache.set(cache_key, {"text": text})
+        return text
+
+    def _cache_version(self, contract_type: str) -> str:
+        """수동 버전 + OpenAI 모델 + 프롬프트/스키마 해시"""
+        return f"{settings.ocr_cache_version}-{settings.OPENAI_MODEL}-{self.schema_loader.fingerprint(contract_type)}"
+
 
 def get_ocr_usecase() -> OCRUsecase:
     """
@@ -51,3 +172,16 @@ def get_ocr_usecase() -> OCRUsecase:
         OCRUsecase: OCR 유스케이스 인스턴스
     """
     return OCRUsecase()
+
+
+def get_ocr_page_stats() -> Dict[str, int]:
+    """
+    프로세스 시작 후 페이지별 텍스트 출처 집계
+
+    Returns:
+        dict: {"text_layer": 로컬 추출 페이지 수, "upstage": OCR 호출 페이지 수}
+    """
+    return {
+        PAGE_SOURCE_TEXT_LAYER: _page_sources[PAGE_SOURCE_TEXT_LAYER],
+        PAGE_SOURCE_UPSTAGE: _page_sources[PAGE_SOURCE_UPSTAGE],
+    }
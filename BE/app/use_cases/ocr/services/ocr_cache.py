@@ -0,0 +1,206 @@
+"""OCR 결과 캐시 - PDF SHA-256 + 계약서 타입 + 스키마/프롬프트 버전 기준 (페이지별 원문 텍스트도 같은 캐시에 저장)"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import diskcache
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.core.config import settings
+from app.database.mongodb import get_collection
+
+logger = logging.getLogger(__name__)
+
+
+def document_digest(pdf_bytes: bytes) -> str:
+    """
+    문서 내용 해시 (문서당 한 번 계산해 캐시 키들에 재사용)
+
+    Args:
+        pdf_bytes: PDF 파일의 바이너리 데이터
+
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def build_cache_key(digest: str, contract_type: str, version: str) -> str:
+    """
+    문서 내용 기반 캐시 키 생성 (파일명/업로더와 무관)
+
+    Args:
+        digest: document_digest 로 구한 PDF 해시
+        contract_type: 계약서 타입
+        version: 스키마/프롬프트/모델 버전 문자열
+
+    Returns:
+        str: "<sha256>:<contract_type>:<version>"
+    """
+    return f"{digest}:{contract_type}:{version}"
+
+
+def build_page_cache_key(digest: str, page_index: int, engine: str) -> str:
+    """
+    페이지 단위 원문 텍스트 캐시 키 생성 (스키마/프롬프트와 무관)
+
+    분리된 한 페이지 PDF 는 생성 시각이 들어가 매번 바이트가 달라지므로 원본 문서 해시 + 페이지 번호를 쓴다.
+
+    Args:
+        digest: document_digest 로 구한 원본 PDF 해시
+        page_index: 0부터 시작하는 페이지 번호
+        engine: 텍스트를 추출한 엔진 (예: "upstage-ocr")
+
+    Returns:
+        str: "page:<sha256>:<page_index>:<engine>"
+    """
+    return f"page:{digest}:{page_index}:{engine}"
+
+
+class OcrResultCache:
+    """
+    2단계 OCR 결과 캐시
+
+    - 디스크(diskcache): 노드 로컬, 용량 초과 시 LRU 로 제거
+    - MongoDB(ocr_cache): 노드 간 공유, TTL 인덱스로 만료되며 조회할 때마다 만료 시각을 연장
+      (오래 안 쓰인 항목부터 사라지는 LRU 근사)
+
+    어느 계층이든 오류가 나면 캐시 미스로 취급하고 원래 OCR 흐름을 그대로 탄다.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path],
+        size_limit: int,
+        collection: Optional[AsyncIOMotorCollection],
+        ttl: timedelta,
+    ):
+        self._disk: Optional[diskcache.Cache] = None
+        if directory is not None:
+            self._disk = diskcache.Cache(
+                str(directory),
+                size_limit=size_limit,
+                eviction_policy="least-recently-used",
+            )
+        self._collection = collection
+        self._ttl = ttl
+        self._indexes_ready = False
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회 (디스크 → MongoDB 순, MongoDB 히트는 디스크에도 채움)
+
+        Args:
+            key: build_cache_key 로 만든 키
+
+        Returns:
+            dict | None: 캐시된 파싱 결과, 없으면 None
+        """
+        if self._disk is not None:
+            try:
+                value = await asyncio.to_thread(self._disk.get, key)
+            except Exception as exc:
+                logger.warning("OCR disk cache read failed: %s", exc)
+                value = None
+            if value is not None:
+                return value
+
+        if self._collection is None:
+            return None
+
+        try:
+            await self._ensure_indexes()
+            document = await self._collection.find_one_and_update(
+                {"_id": key},
+                {
+                    "$set": {"expires_at": self._expires_at()},
+                    "$inc": {"hits": 1},
+                },
+            )
+            if not document:
+                return None
+            value = json.loads(document["value"])
+        except Exception as exc:
+            # 손상된 항목도 미스로 처리 (다음 set 이 덮어씀)
+            logger.warning("OCR cache lookup failed: %s", exc)
+            return None
+
+        await self._set_disk(key, value)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], contract_type: Optional[str] = None) -> None:
+        """
+        캐시 저장 (두 계층 모두)
+
+        Args:
+            key: build_cache_key 로 만든 키
+            value: 파싱 결과
+            contract_type: 운영 조회용으로 함께 저장할 계약서 타입
+        """
+        await self._set_disk(key, value)
+
+        if self._collection is None:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            await self._ensure_indexes()
+            await self._collection.update_one(
+                {"_id": key},
+                {
+                    # 스키마 필드명에 '.' 이 들어갈 수 있어 JSON 문자열로 저장
+                    "$set": {
+                        "value": json.dumps(value, ensure_ascii=False),
+                        "contract_type": contract_type,
+                        "expires_at": self._expires_at(),
+                        "updated_at": now,
+                    },
+                    "$setOnInsert": {"created_at": now, "hits": 0},
+                },
+                upsert=True,
+            )
+        except Exception as exc:
+            logger.warning("OCR cache write failed: %s", exc)
+
+    async def _set_disk(self, key: str, value: Dict[str, Any]) -> None:
+        if self._disk is None:
+            return
+        try:
+            await asyncio.to_thread(self._disk.set, key, value)
+        except Exception as exc:
+            logger.warning("OCR disk cache write failed: %s", exc)
+
+    async def _ensure_indexes(self) -> None:
+        if self._indexes_ready or self._collection is None:
+            return
+        # expires_at 시각이 지나면 MongoDB 가 문서를 지움
+        await self._collection.create_index("expires_at", expireAfterSeconds=0)
+        self._indexes_ready = True
+
+    def _expires_at(self) -> datetime:
+        return datetime.now(timezone.utc) + self._ttl
+
+
+_ocr_cache: Optional[OcrResultCache] = None
+
+
+def get_ocr_cache() -> OcrResultCache:
+    """
+    프로세스 전역 OcrResultCache 반환 (diskcache 는 프로세스당 하나만 연다)
+
+    Returns:
+        OcrResultCache: OCR 결과 캐시
+    """
+    global _ocr_cache
+    if _ocr_cache is None:
+        _ocr_cache = OcrResultCache(
+            directory=settings.ocr_cache_dir if settings.ocr_cache_enabled else None,
+            size_limit=settings.ocr_cache_size_mb * 1024 * 1024,
+            collection=get_collection("ocr_cache") if settings.ocr_cache_enabled else None,
+            ttl=timedelta(days=settings.ocr_cache_ttl_days),
+        )
+    return _ocr_cache
@@ -0,0 +1,94 @@
+"""PDF 페이지 단위 처리 (pypdfium2) - 페이지 분리, 내장 텍스트 레이어 추출"""
+
+import io
+import threading
+from typing import List, Optional, Sequence
+
+import pypdfium2 as pdfium
+
+# pdfium 은 스레드 안전하지 않으므로 같은 프로세스 안의 호출을 직렬화
+_PDFIUM_LOCK = threading.Lock()
+
+
+def read_text_layers(pdf_bytes: bytes) -> List[str]:
+    """
+    페이지별 내장 텍스트 레이어 추출 (블로킹 호출이므로 asyncio.to_thread 로 실행)
+
+    Args:
+        pdf_bytes: PDF 파일의 바이너리 데이터
+
+    Returns:
+        list[str]: 페이지 순서대로 추출한 텍스트 (텍스트 레이어가 없는 페이지는 빈 문자열에 가까움)
+
+    Raises:
+        pypdfium2.PdfiumError: PDF 를 열 수 없을 때
+    """
+    with _PDFIUM_LOCK:
+        document = pdfium.PdfDocument(pdf_bytes)
+        try:
+            texts: List[str] = []
+            for index in range(len(document)):
+                page = document[index]
+                textpage = page.get_textpage()
+                try:
+                    texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                finally:
+                    textpage.close()
+                    page.close()
+            return texts
+        finally:
+            document.close()
+
+
+def is_text_layer_usable(text: str, min_chars: int) -> bool:
+    """
+    텍스트 레이어만으로 OCR 을 대신할 수 있는지 판단
+
+    스캔본은 글자가 거의 없고(쪽 번호, 캡션 정도), ToUnicode 가 없는 폰트는
+    U+FFFD/사설 영역 문자로 깨져 나오므로 둘 다 OCR 대상으로 돌린다.
+
+    Args:
+        text: read_text_layers 로 추출한 한 페이지 텍스트
+        min_chars: 공백을 제외한 최소 글자 수
+
+    Returns:
+        bool: 텍스트 레이어를 그대로 써도 되면 True
+    """
+    chars = [char for char in text if not char.isspace()]
+    if len(chars) < max(min_chars, 1):
+        return False
+    broken = sum(1 for char in chars if char == "\ufffd" or "\ue000" <= char <= "\uf8ff" or not char.isprintable())
+    return broken / len(chars) <= 0.1
+
+
+def split_pdf_pages(pdf_bytes: bytes, page_indices: Optional[Sequence[int]] = None) -> List[bytes]:
+    """
+    PDF 를 한 페이지짜리 PDF 들로 분리 (블로킹 호출이므로 asyncio.to_thread 로 실행)
+
+    Args:
+        pdf_bytes: PDF 파일의 바이너리 데이터
+        page_indices: 분리할 페이지 번호 목록 (0부터, 기본: 전체 페이지)
+
+    Returns:
+        list[bytes]: 요청한 페이지 순서대로 한 페이지짜리 PDF 바이너리 목록
+
+    Raises:
+        pypdfium2.PdfiumError: PDF 를 열 수 없을 때
+    """
+    with _PDFIUM_LOCK:
+        source = pdfium.PdfDocument(pdf_bytes)
+        try:
+            pages: List[bytes] = []
+            indices = range(len(source)) if page_indices is None else page_indices
+            for index in indices:
+                single = pdfium.PdfDocument.new()
+                try:
+                    single.import_pages(source, [index])
+                    buffer = io.BytesIO()
+                    single.save(buffer)
+                    pages.append(buffer.getvalue())
+                finally:
+                    single.close()
+            return pages
+        finally:
+            source.close()
@@ -1,6 +1,8 @@
 """스키마 및 프롬프트 로더"""
 
+import hashlib
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
@@ -35,6 +37,18 @@ class SchemaLoader:
         with open(schema_path, "r", encoding="utf-8") as f:
             return json.load(f)
 
+    def fingerprint(self, contract_type: str) -> str:
+        """
+        프롬프트 템플릿 + 스키마 파일 내용의 해시 (캐시 버전용)
+
+        Args:
+            contract_type: 계약서 타입 (예: "주택임대차표준계약서")
+
+        Returns:
+            str: 12자리 16진수 해시 (파일은 배포 때만 바뀌므로 프로세스당 한 번만 계산)
+        """
+        return _fingerprint(self.prompt_dir / f"{contract_type}.txt", self.schema_dir / f"{contract_type}.json")
+
     def load_prompt(self, contract_type: str, ocr_text: str) -> str:
         """
         계약서 타입에 맞는 프롬프트를 로드하고 스키마와 OCR 텍스트를 삽입하여 완성된 프롬프트 반환
@@ -74,6 +88,15 @@ class SchemaLoader:
         return full_prompt
 
 
+@lru_cache(maxsize=None)
+def _fingerprint(*paths: Path) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
 def get_schema_loader() -> SchemaLoader:
     """
     SchemaLoader 인스턴스를 생성하는 Factory 함수
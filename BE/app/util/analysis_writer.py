@@ -1,31 +1,218 @@
 from __future__ import annotations
 
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Iterable, Optional
 
 import wave
 
+logger = logging.getLogger(__name__)
+
+FSYNC_NONE = "none"
+FSYNC_CLOSE = "close"
+FSYNC_BLOCK = "block"
+
+_executors: list[ThreadPoolExecutor] = []
+_executor_lock = threading.Lock()
+_next_shard = 0
+
+
+def get_writer_executor(max_threads: int = 1) -> ThreadPoolExecutor:
+    """Pick one of up to ``max_threads`` writer threads shared by every recording writer.
+
+    Each writer keeps the thread it was given, so a file's blocks run in
+    submission order, while encoding for different sessions is spread
+    round-robin over the shards. Disk I/O and encoding stay off both the
+    event loop and the default executor.
+    """
+    global _next_shard
+    with _executor_lock:
+        if len(_executors) < max(max_threads, 1):
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"wav-writer-{len(_executors)}")
+            _executors.append(executor)
+            return executor
+        executor = _executors[_next_shard % len(_executors)]
+        _next_shard += 1
+        return executor
+
 
 class AnalysisWriter:
-    def __init__(self, path: Path, sample_rate: int) -> None:
+    """WAV writer whose disk I/O happens on a background thread.
+
+    ``append`` only copies the chunk into an in-memory buffer. Once
+    ``block_bytes`` have accumulated the block is handed to the writer
+    thread. At most ``max_buffer_bytes`` may be waiting (buffered or in
+    flight); beyond that new audio is dropped and counted rather than
+    stalling the caller. ``fsync`` is ``none``, ``close`` (once, when the
+    file is finalised) or ``block`` (after every block write). Writers
+    share up to ``writer_threads`` threads per process and each file stays
+    on the one it was given.
+
+    Subclasses change the container by overriding ``_open_sink``,
+    ``_write_sink`` and ``_close_sink``, all called on the writer thread;
+    ``open`` only queues the open, so file creation and encoder setup stay
+    off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sample_rate: int,
+        block_bytes: int = 64 * 1024,
+        max_buffer_bytes: int = 4 * 1024 * 1024,
+        fsync: str = FSYNC_CLOSE,
+        writer_threads: int = 1,
+    ) -> None:
         self._path = path
         self._sample_rate = sample_rate
-        self._wave_file: Optional[BinaryIO] = None
+        self._block_bytes = max(block_bytes, 2)
+        self._max_buffer_bytes = max(max_buffer_bytes, self._block_bytes)
+        self._fsync = fsync
+        self._opened = False
+        self._sink_open = False
+        self._wave_file: Optional[wave.Wave_write] = None
+        self._file: Optional[BinaryIO] = None
+        self._buffer = bytearray()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._dropped_bytes = 0
+        self._executor = get_writer_executor(writer_threads)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self._dropped_bytes
 
     def open(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        wave_file = wave.open(str(self._path), "wb")
+        # Queued ahead of every block, and the writer thread runs tasks in order.
+        self._opened = True
+        self._executor.submit(self._open_on_writer)
+
+    def append(self, chunk: bytes) -> None:
+        if not self._opened:
+            return
+        if len(self._buffer) + self._in_flight + len(chunk) > self._max_buffer_bytes:
+            self._dropped_bytes += len(chunk)
+            if self._dropped_bytes == len(chunk):
+                logger.warning("Recording writer for %s is behind; dropping audio", self._path.name)
+            return
+        self._buffer += chunk
+        if len(self._buffer) >= self._block_bytes:
+            self._submit_block()
+
+    def close(self, copy_to: Iterable[Path] = ()) -> "Future[None]":
+        """Flush, finalise the file and optionally link/copy it elsewhere.
+
+        Returns a future that completes once the file is on disk; callers on
+        the event loop need not wait for it.
+        """
+        if not self._opened:
+            done: "Future[None]" = Future()
+            done.set_result(None)
+            return done
+        self._opened = False
+        block, self._buffer = self._buffer, bytearray()
+        targets = [Path(target) for target in copy_to]
+        return self._executor.submit(self._finish, block, targets)
+
+    def _open_sink(self) -> None:
+        handle = open(self._path, "wb")
+        wave_file = wave.open(handle, "wb")
         wave_file.setnchannels(1)
         wave_file.setsampwidth(2)
         wave_file.setframerate(self._sample_rate)
+        self._file = handle
         self._wave_file = wave_file
 
-    def append(self, chunk: bytes) -> None:
-        if self._wave_file is None:
-            return
-        self._wave_file.writeframes(chunk)
+    def _write_sink(self, block: bytes) -> None:
+        assert self._wave_file is not None
+        self._wave_file.writeframes(block)
 
-    def close(self) -> None:
-        if self._wave_file:
+    def _close_sink(self) -> None:
+        if self._wave_file is not None:
             self._wave_file.close()
             self._wave_file = None
+
+    def _sync(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            return
+        fd = os.open(self._path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _submit_block(self) -> None:
+        # Hand the buffer itself to the writer thread instead of copying it.
+        block, self._buffer = self._buffer, bytearray()
+        with self._in_flight_lock:
+            self._in_flight += len(block)
+        self._executor.submit(self._write_block, block)
+
+    def _open_on_writer(self) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._open_sink()
+            self._sink_open = True
+        except Exception as exc:  # pragma: no cover - disk errors
+            logger.warning("Failed to open recording %s: %s", self._path, exc)
+            # Stop buffering audio that can never be written.
+            self._opened = False
+
+    def _write_block(self, block: bytearray) -> None:
+        try:
+            if not self._sink_open:
+                return
+            self._write_sink(block)
+            if self._fsync == FSYNC_BLOCK:
+                self._sync()
+        except Exception as exc:  # pragma: no cover - disk errors
+            logger.warning("Failed to write recording block to %s: %s", self._path, exc)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= len(block)
+
+    def _finish(self, block: bytearray, targets: list[Path]) -> None:
+        if not self._sink_open:
+            return
+        self._sink_open = False
+        try:
+            if block:
+                self._write_sink(block)
+            self._close_sink()
+            if self._fsync != FSYNC_NONE:
+                self._sync()
+        except Exception as exc:  # pragma: no cover - disk errors
+            logger.warning("Failed to finalise recording %s: %s", self._path, exc)
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+        for target in targets:
+            _link_or_copy(self._path, target)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            if target.samefile(source):
+                return
+            target.unlink()
+        try:
+            os.link(source, target)
+        except OSError:
+            # Different filesystem or links unsupported.
+            shutil.copyfile(source, target)
+    except Exception as exc:  # pragma: no cover - disk errors
+        logger.warning("Failed to place copy of %s at %s: %s", source, target, exc)
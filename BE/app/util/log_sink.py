@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJsonlWriter:
+    """Single background thread that appends JSON lines for many sinks.
+
+    Records are serialised and written off the caller's thread. The queue is
+    bounded; when it is full new records are dropped (and counted) instead of
+    blocking the producer. Open files are flushed every ``flush_interval``
+    seconds and when a sink is closed.
+
+    Closing never goes through the bounded queue: ``close_path`` only marks
+    the path, and the writer closes the file once the records queued for it
+    before the close have been written (within ``flush_interval``).
+    """
+
+    def __init__(self, max_queue: int = 1024, flush_interval: float = 1.0) -> None:
+        self._queue: "queue.Queue[Tuple[Path, Any]]" = queue.Queue(maxsize=max_queue)
+        self._flush_interval = flush_interval
+        self._files: Dict[Path, TextIO] = {}
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._queued: Counter[Path] = Counter()
+        self._closing: Set[Path] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def submit(self, path: Path, record: Any) -> None:
+        self._ensure_started()
+        with self._lock:
+            self._queued[path] += 1
+        try:
+            self._queue.put_nowait((path, record))
+        except queue.Full:
+            self._dropped += 1
+            self._release(path)
+
+    def close_path(self, path: Path) -> None:
+        """Close ``path`` after its queued records are written; never blocks the caller."""
+        self._ensure_started()
+        with self._lock:
+            self._closing.add(path)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="jsonl-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        next_flush = time.monotonic() + self._flush_interval
+        while True:
+            timeout = max(next_flush - time.monotonic(), 0.0)
+            try:
+                path, record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                path, record = None, None
+
+            if path is not None:
+                self._write(path, record)
+                self._release(path)
+            if self._closing:
+                self._close_finished()
+
+            if time.monotonic() >= next_flush:
+                self._flush_all()
+                next_flush = time.monotonic() + self._flush_interval
+
+    def _write(self, path: Path, record: Any) -> None:
+        try:
+            handle = self._files.get(path)
+            if handle is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handle = path.open("a", encoding="utf-8")
+                self._files[path] = handle
+            handle.write(json.dumps(record, ensure_ascii=False))
+            handle.write("\n")
+        except Exception as exc:  # pragma: no cover - logging only
+            logger.debug("Failed to write log record to %s: %s", path, exc)
+
+    def _release(self, path: Path) -> None:
+        with self._lock:
+            self._queued[path] -= 1
+            if self._queued[path] <= 0:
+                del self._queued[path]
+
+    def _close_finished(self) -> None:
+        with self._lock:
+            ready = [path for path in self._closing if path not in self._queued]
+            self._closing.difference_update(ready)
+        for path in ready:
+            self._close_file(path)
+
+    def _close_file(self, path: Path) -> None:
+        handle = self._files.pop(path, None)
+        if handle is None:
+            return
+        try:
+            handle.close()
+        except Exception as exc:  # pragma: no cover - logging only
+            logger.debug("Failed to close log file %s: %s", path, exc)
+
+    def _flush_all(self) -> None:
+        for path, handle in list(self._files.items()):
+            try:
+                handle.flush()
+            except Exception as exc:  # pragma: no cover - logging only
+                logger.debug("Failed to flush log file %s: %s", path, exc)
+
+
+class JsonlLogSink:
+    """Append-only JSONL log owned by a single session."""
+
+    def __init__(self, path: Path, writer: BackgroundJsonlWriter) -> None:
+        self._path = Path(path)
+        self._writer = writer
+        self._closed = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def write(self, record: Any) -> None:
+        if self._closed:
+            return
+        self._writer.submit(self._path, record)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.close_path(self._path)
+
+
+_writer: Optional[BackgroundJsonlWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_jsonl_writer(max_queue: int = 1024, flush_interval: float = 1.0) -> BackgroundJsonlWriter:
+    """Return the process-wide background JSONL writer."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = BackgroundJsonlWriter(max_queue=max_queue, flush_interval=flush_interval)
+    return _writer
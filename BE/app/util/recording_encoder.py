@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from fractions import Fraction
+from pathlib import Path
+from typing import Optional
+
+import av
+import numpy as np
+
+from app.util.analysis_writer import FSYNC_CLOSE, AnalysisWriter
+
+# recording_format -> (container format, codec, file suffix)
+RECORDING_FORMATS = {
+    "opus": ("ogg", "libopus", ".opus"),
+    "flac": ("flac", "flac", ".flac"),
+    "wav": ("wav", "pcm_s16le", ".wav"),
+}
+
+
+def recording_suffix(recording_format: str) -> str:
+    return RECORDING_FORMATS.get(recording_format.lower(), RECORDING_FORMATS["wav"])[2]
+
+
+class EncodedRecordingWriter(AnalysisWriter):
+    """Streams the session recording through a PyAV encoder (Opus or FLAC).
+
+    Blocks are encoded and muxed on the shared writer thread as they arrive,
+    so the file on disk is always a valid, growing stream and there is no
+    post-processing pass at close.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sample_rate: int,
+        recording_format: str = "opus",
+        bitrate: int = 24000,
+        block_bytes: int = 64 * 1024,
+        max_buffer_bytes: int = 4 * 1024 * 1024,
+        fsync: str = FSYNC_CLOSE,
+        writer_threads: int = 1,
+    ) -> None:
+        super().__init__(
+            path,
+            sample_rate=sample_rate,
+            block_bytes=block_bytes,
+            max_buffer_bytes=max_buffer_bytes,
+            fsync=fsync,
+            writer_threads=writer_threads,
+        )
+        self._container_format, self._codec, _ = RECORDING_FORMATS[recording_format.lower()]
+        self._bitrate = bitrate
+        self._container: Optional[av.container.OutputContainer] = None
+        self._stream: Optional[av.audio.stream.AudioStream] = None
+        self._samples = 0
+
+    def _open_sink(self) -> None:
+        container = av.open(str(self._path), mode="w", format=self._container_format)
+        stream = container.add_stream(self._codec, rate=self._sample_rate, layout="mono")
+        if self._codec == "libopus":
+            stream.bit_rate = self._bitrate
+        self._container = container
+        self._stream = stream
+
+    def _write_sink(self, block: bytes) -> None:
+        assert self._container is not None and self._stream is not None
+        samples = np.frombuffer(block, dtype=np.int16).reshape(1, -1)
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="mono")
+        frame.sample_rate = self._sample_rate
+        frame.pts = self._samples
+        frame.time_base = Fraction(1, self._sample_rate)
+        self._samples += samples.shape[1]
+        for packet in self._stream.encode(frame):
+            self._container.mux(packet)
+
+    def _close_sink(self) -> None:
+        if self._container is None or self._stream is None:
+            return
+        try:
+            for packet in self._stream.encode(None):
+                self._container.mux(packet)
+        finally:
+            self._container.close()
+            self._container = None
+            self._stream = None
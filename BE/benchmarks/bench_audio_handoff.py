@@ -0,0 +1,95 @@
+"""Event-loop CPU spent handing audio to recognizer threads.
+
+Usage: python benchmarks/bench_audio_handoff.py [sessions] [seconds]
+
+Simulates N sessions that each produce a 20 ms PCM chunk per tick on the
+event loop while a dedicated thread per session drains it, once with the
+previous ``asyncio.Queue`` + ``run_coroutine_threadsafe`` hop and once with
+``AudioRingBuffer``. Reports CPU time consumed by the event-loop thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.sessions.audio_buffer import AudioRingBuffer  # noqa: E402
+
+CHUNK = b"\x00\x01" * 320  # 20 ms @ 16 kHz mono s16
+TICK = 0.02
+TARGET_BYTES = 3200
+
+
+async def _produce(write, sessions: int, seconds: float) -> float:
+    loop_cpu_start = time.thread_time()
+    deadline = time.monotonic() + seconds
+    next_tick = time.monotonic()
+    while time.monotonic() < deadline:
+        for index in range(sessions):
+            write(index, CHUNK)
+        next_tick += TICK
+        await asyncio.sleep(max(next_tick - time.monotonic(), 0))
+    return time.thread_time() - loop_cpu_start
+
+
+async def run_queue(sessions: int, seconds: float) -> float:
+    loop = asyncio.get_running_loop()
+    queues = [asyncio.Queue(maxsize=64) for _ in range(sessions)]
+
+    def consume(queue: asyncio.Queue) -> None:
+        while True:
+            chunk = asyncio.run_coroutine_threadsafe(queue.get(), loop).result()
+            if chunk is None:
+                return
+
+    threads = [threading.Thread(target=consume, args=(queue,), daemon=True) for queue in queues]
+    for thread in threads:
+        thread.start()
+
+    def write(index: int, chunk: bytes) -> None:
+        try:
+            queues[index].put_nowait(chunk)
+        except asyncio.QueueFull:
+            pass
+
+    cpu = await _produce(write, sessions, seconds)
+    for queue in queues:
+        await queue.put(None)
+    await asyncio.to_thread(lambda: [thread.join() for thread in threads])
+    return cpu
+
+
+async def run_ring(sessions: int, seconds: float) -> float:
+    buffers = [AudioRingBuffer(capacity=160_000) for _ in range(sessions)]
+
+    def consume(buffer: AudioRingBuffer) -> None:
+        while buffer.read(TARGET_BYTES) is not None:
+            pass
+
+    threads = [threading.Thread(target=consume, args=(buffer,), daemon=True) for buffer in buffers]
+    for thread in threads:
+        thread.start()
+
+    cpu = await _produce(lambda index, chunk: buffers[index].write(chunk), sessions, seconds)
+    for buffer in buffers:
+        buffer.close()
+    await asyncio.to_thread(lambda: [thread.join() for thread in threads])
+    return cpu
+
+
+def main(sessions: int = 200, seconds: float = 5.0) -> None:
+    for name, runner in (("queue+run_coroutine_threadsafe", run_queue), ("AudioRingBuffer", run_ring)):
+        cpu = asyncio.run(runner(sessions, seconds))
+        print(f"{name:>32}: loop CPU {cpu:.3f}s over {seconds:.0f}s ({cpu / seconds * 100:.1f}% of a core)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5.0,
+    )
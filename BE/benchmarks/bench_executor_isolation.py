@@ -0,0 +1,118 @@
+"""Latency of short storage calls while long-lived recognizer loops are running.
+
+Usage: python benchmarks/bench_executor_isolation.py [sessions] [storage_calls]
+
+Each simulated session runs a blocking loop for the whole run, the way
+``Transcriber._streaming_recognize`` iterates a gRPC response stream. At
+the same time a steady stream of short blocking "S3" calls (10 ms each) is
+issued from the event loop. Three layouts are compared:
+
+* ``shared``: both on the loop's default executor (``asyncio.to_thread``
+  for recognizers and storage, the previous layout)
+* ``recognizer-pool``: recognizers on a dedicated pool sized to the
+  session count, storage still on the default executor
+* ``isolated``: recognizers on their pool, storage on its own bounded pool
+  (``StorageService``)
+
+Reported: p50/p99/max time from issuing a storage call to its completion,
+and how many calls timed out (5 s) because every thread was occupied.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+STORAGE_CALL_SEC = 0.010
+STORAGE_INTERVAL_SEC = 0.005
+STORAGE_TIMEOUT_SEC = 5.0
+RECOGNIZER_TICK_SEC = 0.020
+
+
+def _recognizer_loop(stop: threading.Event) -> None:
+    # Blocks a thread for the whole session, waking every 20 ms like a stream of responses.
+    while not stop.wait(RECOGNIZER_TICK_SEC):
+        pass
+
+
+def _storage_call() -> None:
+    time.sleep(STORAGE_CALL_SEC)
+
+
+async def _run_layout(
+    layout: str,
+    sessions: int,
+    storage_calls: int,
+) -> tuple[list[float], int]:
+    loop = asyncio.get_running_loop()
+    recognizer_pool: Optional[ThreadPoolExecutor] = None
+    storage_pool: Optional[ThreadPoolExecutor] = None
+    if layout in {"recognizer-pool", "isolated"}:
+        recognizer_pool = ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="stt-recognizer")
+    if layout == "isolated":
+        storage_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="storage-io")
+
+    stop = threading.Event()
+    recognizers = [loop.run_in_executor(recognizer_pool, _recognizer_loop, stop) for _ in range(sessions)]
+    await asyncio.sleep(0.2)
+
+    async def timed_call() -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(loop.run_in_executor(storage_pool, _storage_call)),
+                timeout=STORAGE_TIMEOUT_SEC,
+            )
+        except asyncio.TimeoutError:
+            return None
+        return time.perf_counter() - started
+
+    calls = []
+    for _ in range(storage_calls):
+        calls.append(asyncio.create_task(timed_call()))
+        await asyncio.sleep(STORAGE_INTERVAL_SEC)
+    results = await asyncio.gather(*calls)
+
+    stop.set()
+    await asyncio.gather(*recognizers)
+    for pool in (recognizer_pool, storage_pool):
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    latencies = [result for result in results if result is not None]
+    return latencies, sum(result is None for result in results)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    storage_calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    default_workers = min(32, (os.cpu_count() or 1) + 4)
+    print(f"{sessions} recognizer loops, {storage_calls} storage calls, default executor = {default_workers} threads")
+    print(f"{'layout':<16} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'timeouts':>9}")
+    for layout in ("shared", "recognizer-pool", "isolated"):
+        # A fresh loop per layout so each starts with an empty default executor.
+        latencies, timeouts = asyncio.run(_run_layout(layout, sessions, storage_calls))
+        print(
+            f"{layout:<16} "
+            f"{statistics.median(latencies) * 1000 if latencies else float('nan'):8.1f} "
+            f"{_percentile(latencies, 0.99) * 1000:8.1f} "
+            f"{max(latencies, default=float('nan')) * 1000:8.1f} "
+            f"{timeouts:9d}",
+        )
+
+
+if __name__ == "__main__":
+    main()
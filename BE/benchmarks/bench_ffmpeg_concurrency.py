@@ -0,0 +1,114 @@
+"""Per-chunk latency and CPU of many concurrent ffmpeg noise reducers.
+
+Usage: python benchmarks/bench_ffmpeg_concurrency.py [reducers] [seconds]
+
+Runs N ``FFmpegNoiseReducer`` instances (default 50) from a single event
+loop at real-time pace with 20 ms chunks, one session per reducer, called
+the way ``AudioPipeline`` does (awaited on a per-session reducer thread).
+Reports p50/p99/max of the awaited ``process()``, how late the loop's
+20 ms ticks fire (loop lag), CPU per audio-second across this process and
+the reaped ffmpeg children, and the summed underrun/restart counters from
+``get_stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.noise.ffmpeg_reducer import FFmpegNoiseReducer  # noqa: E402
+
+SAMPLE_RATE = 16000
+CHUNK_BYTES = SAMPLE_RATE * 2 // 50  # 20 ms
+TICK = 0.02
+
+
+def _signal(seconds: float) -> bytes:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    speech = 0.3 * np.sin(2 * np.pi * 300 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0)
+    noise = np.random.default_rng(0).normal(0, 0.03, t.size)
+    return ((speech + noise) * 32767).astype(np.int16).tobytes()
+
+
+def _cpu() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+async def _drive(reducer: FFmpegNoiseReducer, pcm: bytes, latencies: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ffmpeg-reducer")
+    next_tick = loop.time()
+    try:
+        for offset in range(0, len(pcm), CHUNK_BYTES):
+            started = time.perf_counter()
+            await loop.run_in_executor(executor, reducer.process, pcm[offset:offset + CHUNK_BYTES])
+            latencies.append(time.perf_counter() - started)
+            next_tick += TICK
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+    finally:
+        executor.shutdown(wait=True)
+
+
+async def _watch_loop(lags: list[float], done: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not done.is_set():
+        expected = loop.time() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(max(loop.time() - expected, 0))
+
+
+async def _run(instances: list[FFmpegNoiseReducer], pcm: bytes, latencies: list[list[float]], lags: list[float]) -> None:
+    done = asyncio.Event()
+    watcher = asyncio.create_task(_watch_loop(lags, done))
+    await asyncio.gather(*(_drive(reducer, pcm, samples) for reducer, samples in zip(instances, latencies)))
+    done.set()
+    await watcher
+
+
+def main(reducers: int = 50, seconds: float = 20.0) -> None:
+    if not shutil.which("ffmpeg"):
+        print("ffmpeg not on PATH; nothing to measure")
+        return
+
+    pcm = _signal(seconds)
+    instances = [FFmpegNoiseReducer(SAMPLE_RATE) for _ in range(reducers)]
+    latencies: list[list[float]] = [[] for _ in instances]
+    lags: list[float] = []
+
+    cpu_start = _cpu()
+    asyncio.run(_run(instances, pcm, latencies, lags))
+
+    totals: dict[str, int] = {}
+    for reducer in instances:
+        for key, value in reducer.get_stats().items():
+            totals[key] = totals.get(key, 0) + value
+        reducer.close()
+    cpu = _cpu() - cpu_start
+
+    values = np.array([value for samples in latencies for value in samples]) * 1000
+    print(f"reducers={reducers} audio={seconds:.0f}s chunks={values.size}")
+    print(
+        f"process() ms  p50={np.percentile(values, 50):.3f} "
+        f"p99={np.percentile(values, 99):.3f} max={values.max():.3f}",
+    )
+    lag = np.array(lags) * 1000
+    print(f"loop lag ms    p50={np.percentile(lag, 50):.3f} p99={np.percentile(lag, 99):.3f} max={lag.max():.3f}")
+    print(f"cpu s / audio s (all reducers) = {cpu / seconds:.3f}  per reducer = {cpu / seconds / reducers:.4f}")
+    print("stats " + " ".join(f"{key}={value}" for key, value in sorted(totals.items())))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20.0,
+    )
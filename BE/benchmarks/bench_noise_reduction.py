@@ -0,0 +1,66 @@
+"""CPU cost per audio-second of the in-process and ffmpeg noise reducers.
+
+Usage: python benchmarks/bench_noise_reduction.py [seconds]
+
+Feeds the same synthetic noisy signal (gated tone + white noise, 16 kHz
+mono s16) through ``SpectralNoiseReducer`` and ``FFmpegNoiseReducer`` in
+20 ms chunks. For ffmpeg the child process CPU is included (it is reaped in
+``close()``) on top of the reader threads in this process.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.noise.ffmpeg_reducer import FFmpegNoiseReducer  # noqa: E402
+from app.noise.spectral_reducer import SpectralNoiseReducer  # noqa: E402
+
+SAMPLE_RATE = 16000
+CHUNK_BYTES = SAMPLE_RATE * 2 // 50  # 20 ms
+
+
+def _signal(seconds: float) -> bytes:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    speech = 0.3 * np.sin(2 * np.pi * 300 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0)
+    noise = np.random.default_rng(0).normal(0, 0.03, t.size)
+    return ((speech + noise) * 32767).astype(np.int16).tobytes()
+
+
+def _cpu() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _run(reducer, pcm: bytes, seconds: float) -> tuple[float, float]:
+    cpu_start, wall_start = _cpu(), time.perf_counter()
+    for offset in range(0, len(pcm), CHUNK_BYTES):
+        reducer.process(pcm[offset:offset + CHUNK_BYTES])
+    wall = time.perf_counter() - wall_start
+    reducer.close()
+    return (_cpu() - cpu_start) / seconds, wall / (len(pcm) // CHUNK_BYTES)
+
+
+def main(seconds: float = 30.0) -> None:
+    pcm = _signal(seconds)
+    candidates = [("spectral (numpy)", SpectralNoiseReducer(SAMPLE_RATE))]
+    if shutil.which("ffmpeg"):
+        candidates.append(("ffmpeg afftdn", FFmpegNoiseReducer(SAMPLE_RATE)))
+    else:
+        print("ffmpeg not on PATH; skipping afftdn chain")
+
+    print(f"{'reducer':>18} {'cpu s / audio s':>16} {'ms / chunk':>11}")
+    for name, reducer in candidates:
+        cpu, per_chunk = _run(reducer, pcm, seconds)
+        print(f"{name:>18} {cpu:>16.4f} {per_chunk * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 30.0)
@@ -0,0 +1,100 @@
+"""Python-heap allocations per audio-minute on the frame -> recognizer path.
+
+Usage: python benchmarks/bench_pcm_allocations.py [minutes]
+
+Pushes synthetic 20 ms 48 kHz stereo frames (what aiortc delivers) through
+resampling, PCM extraction, the energy VAD, the recognizer ring buffer and
+the recording writer. Compares the previous ``to_ndarray().tobytes()``
+extraction with ``frame_to_pcm`` (memoryviews over the frame planes).
+Allocation volume is measured with tracemalloc as the peak above the
+starting heap around each stage call, summed over all calls; PyAV's own
+buffers are not traced and are the same for both variants.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import av
+import numpy as np
+from av.audio.resampler import AudioResampler
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.sessions.audio_buffer import AudioRingBuffer  # noqa: E402
+from app.sessions.audio_pipeline import frame_to_pcm  # noqa: E402
+from app.sessions.vad import EnergyVAD  # noqa: E402
+from app.util.analysis_writer import FSYNC_NONE, AnalysisWriter  # noqa: E402
+
+RTC_RATE = 48000
+STT_RATE = 16000
+FRAME_SAMPLES = 960  # 20 ms
+
+
+def _legacy_pcm(frame: av.AudioFrame) -> list[bytes]:
+    ndarray = frame.to_ndarray()
+    if ndarray.ndim == 1:
+        return [ndarray.tobytes()]
+    return [channel_data.tobytes() for channel_data in ndarray]
+
+
+def _frames(count: int) -> list[av.AudioFrame]:
+    rng = np.random.default_rng(0)
+    frames = []
+    for index in range(count):
+        samples = (rng.normal(0, 0.05, (1, FRAME_SAMPLES * 2)) * 32767).astype(np.int16)
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="stereo")
+        frame.sample_rate = RTC_RATE
+        frame.pts = index * FRAME_SAMPLES
+        frames.append(frame)
+    return frames
+
+
+def _measure(totals: dict[str, int], stage: str, call, *args):
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    result = call(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    totals[stage] = totals.get(stage, 0) + peak - baseline
+    return result
+
+
+def _run(extract, frames: list[av.AudioFrame], directory: Path, name: str) -> dict[str, int]:
+    resampler = AudioResampler(format="s16", layout="mono", rate=STT_RATE)
+    vad = EnergyVAD()
+    ring = AudioRingBuffer(capacity=STT_RATE * 2 * 5)
+    writer = AnalysisWriter(directory / f"{name}.wav", sample_rate=STT_RATE, fsync=FSYNC_NONE)
+    writer.open()
+
+    totals: dict[str, int] = {}
+    tracemalloc.start()
+    for frame in frames:
+        for resampled in resampler.resample(frame):
+            for chunk in _measure(totals, "extract", extract, resampled):
+                _measure(totals, "vad", vad.is_speech, chunk)
+                _measure(totals, "ring", ring.write, chunk)
+                _measure(totals, "writer", writer.append, chunk)
+        ring.read(ring.capacity, timeout=0)
+    tracemalloc.stop()
+    writer.close().result()
+    return totals
+
+
+def main(minutes: float = 1.0) -> None:
+    frames = _frames(int(minutes * 60 * 50))
+    with tempfile.TemporaryDirectory() as directory:
+        results = [
+            ("to_ndarray().tobytes()", _run(_legacy_pcm, frames, Path(directory), "legacy")),
+            ("frame_to_pcm (views)", _run(frame_to_pcm, frames, Path(directory), "views")),
+        ]
+    stages = ("extract", "vad", "ring", "writer")
+    print(f"{'KiB / audio-minute':>24} " + " ".join(f"{stage:>8}" for stage in stages) + f" {'total':>8}")
+    for name, totals in results:
+        values = [totals.get(stage, 0) / minutes / 1024 for stage in stages]
+        print(f"{name:>24} " + " ".join(f"{value:>8.0f}" for value in values) + f" {sum(values):>8.0f}")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
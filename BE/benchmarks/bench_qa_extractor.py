@@ -0,0 +1,51 @@
+"""Per-final cost of QAExtractor as a session grows.
+
+Usage: python benchmarks/bench_qa_extractor.py [finals]
+
+Prints the mean time spent in ``append_segments`` for each block of finals.
+With the incremental sentence index the numbers stay flat; the previous
+implementation grew linearly with the number of finals already seen.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.sessions.diarization import Segment  # noqa: E402
+from app.sessions.qa_extractor import QAExtractor  # noqa: E402
+
+LINES = [
+    (1, "여기 관리비는 얼마인가요?"),
+    (2, "관리비는 10만원 정도입니다. 수도 요금은 별도예요."),
+    (1, "주차는 가능한가요?"),
+    (2, "네, 한 대 가능합니다."),
+    (1, "창문이 남향이네요."),
+]
+
+
+def main(finals: int = 4000, block: int = 500) -> None:
+    extractor = QAExtractor(SimpleNamespace(qa_time_window_sec=15, qa_sentence_window=3))
+    clock = 0.0
+    elapsed = 0.0
+    print(f"{'finals':>8} {'us/final':>10}")
+    for index in range(1, finals + 1):
+        speaker, text = LINES[index % len(LINES)]
+        segment = Segment(speaker=speaker, text=text, start=clock, end=clock + 2.0)
+        clock += 2.5
+
+        started = time.perf_counter()
+        extractor.append_segments([segment])
+        elapsed += time.perf_counter() - started
+
+        if index % block == 0:
+            print(f"{index:>8} {elapsed / block * 1e6:>10.1f}")
+            elapsed = 0.0
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
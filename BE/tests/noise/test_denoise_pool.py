@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import time
+from pathlib import Path
+
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.noise.denoise_pool import DenoisePool, _worker_main
+from app.noise.spectral_reducer import SpectralNoiseReducer
+
+
+def _pcm(seed: int, seconds: float = 1.0) -> bytes:
+    noise = np.random.default_rng(seed).normal(0, 0.05, int(16000 * seconds))
+    return (noise * 32767).astype(np.int16).tobytes()
+
+
+def test_pool_keeps_per_session_state() -> None:
+    signals = {"a": _pcm(1), "b": _pcm(2), "c": _pcm(3)}
+
+    async def run() -> dict[str, bytes]:
+        pool = DenoisePool(sample_rate=16000, workers=2, timeout=5.0)
+        pool.start()
+        try:
+            async def feed(session_id: str, pcm: bytes) -> bytes:
+                parts = [await pool.process(session_id, pcm[i:i + 640]) for i in range(0, len(pcm), 640)]
+                return b"".join(parts)
+
+            results = await asyncio.gather(*(feed(sid, pcm) for sid, pcm in signals.items()))
+            assert pool.get_stats()["timeouts"] == 0
+            return dict(zip(signals, results))
+        finally:
+            pool.close()
+
+    outputs = asyncio.run(run())
+
+    for session_id, pcm in signals.items():
+        reducer = SpectralNoiseReducer(sample_rate=16000)
+        expected = b"".join(reducer.process(pcm[i:i + 640]) for i in range(0, len(pcm), 640))
+        assert outputs[session_id] == expected
+
+
+def test_worker_skips_expired_requests_and_resets_after_passthrough() -> None:
+    requests: queue.Queue = queue.Queue()
+    responses: queue.Queue = queue.Queue()
+    pcm = _pcm(4, seconds=0.2)
+    first, second, third = pcm[:640], pcm[640:1280], pcm[1280:1920]
+    now = time.time()
+
+    requests.put(("process", 0, "a", first, now + 60))
+    # Expired before the worker got to it: the caller already passed it through.
+    requests.put(("process", 1, "a", second, now - 1))
+    requests.put(("reset", -1, "a", b"", 0.0))
+    requests.put(("process", 2, "a", third, now + 60))
+    requests.put(None)
+    _worker_main(requests, responses, 16000, idle_sec=60.0)
+
+    results = dict(responses.get_nowait() for _ in range(responses.qsize()))
+    assert sorted(results) == [0, 2]
+    reducer = SpectralNoiseReducer(sample_rate=16000)
+    assert results[0] == bytes(reducer.process(first))
+    reducer.reset()
+    assert results[2] == bytes(reducer.process(third))
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.noise.ffmpeg_reducer import _OutputBuffer
+
+
+def test_backpressure_silence_follows_output_still_in_flight() -> None:
+    output = _OutputBuffer(capacity=64)
+    output.expect(4)  # chunk A fed, ffmpeg still working on it
+    output.add_gap(4)  # chunk B could not be fed
+    output.expect(4)  # chunk C fed
+
+    output.write(b"AA")
+    output.write(b"AACC")
+    output.write(b"CC")
+    data, missing = output.read_exact(12, timeout=0.0)
+
+    assert missing == 0
+    assert data == b"AAAA" + bytes(4) + b"CCCC"
+
+
+def test_gap_with_nothing_in_flight_is_written_immediately() -> None:
+    output = _OutputBuffer(capacity=64)
+    output.expect(2)
+    output.write(b"AA")
+    output.add_gap(2)
+
+    assert output.read_exact(4, timeout=0.0) == (b"AA" + bytes(2), 0)
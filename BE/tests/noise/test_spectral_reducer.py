@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.noise.spectral_reducer import SpectralNoiseReducer
+
+
+def _pcm(values: np.ndarray) -> bytes:
+    return (values * 32767).astype(np.int16).tobytes()
+
+
+def test_output_length_matches_input_for_uneven_chunks() -> None:
+    reducer = SpectralNoiseReducer(sample_rate=16000)
+    noise = np.random.default_rng(1).normal(0, 0.05, 16000)
+    pcm = _pcm(noise)
+
+    offset = 0
+    for size in (2, 640, 318, 1000, 4096):
+        chunk = pcm[offset:offset + size]
+        assert len(reducer.process(chunk)) == len(chunk)
+        offset += size
+
+
+def test_reduces_stationary_noise() -> None:
+    reducer = SpectralNoiseReducer(sample_rate=16000, max_gain=1.0)
+    noise = np.random.default_rng(2).normal(0, 0.03, 16000 * 3)
+    pcm = _pcm(noise)
+
+    out = b"".join(reducer.process(pcm[i:i + 640]) for i in range(0, len(pcm), 640))
+    cleaned = np.frombuffer(out, dtype=np.int16).astype(np.float32) / 32767
+
+    # Skip the first second while the noise floor settles.
+    assert cleaned[16000:].std() < noise[16000:].std() * 0.5
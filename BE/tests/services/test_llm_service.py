@@ -15,13 +15,20 @@ from app.models import LLMReportDetail, LLMReportTriggerPayload
 from app.services.llm_service import LlmService
 
 
-def _stub_dependencies(monkeypatch: pytest.MonkeyPatch, *, process_result: dict, ocr_details: list[dict]) -> None:
+def _stub_dependencies(
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    process_result: dict,
+    ocr_details: list[dict],
+    pending_ocr_ids: list[str] | None = None,
+) -> MagicMock:
     mock_usecase = MagicMock()
     mock_usecase.process = AsyncMock(return_value=process_result)
     monkeypatch.setattr("app.services.llm_service.get_llm_usecase", lambda: mock_usecase)
 
     mock_ocr_service = MagicMock()
     mock_ocr_service.list_details = AsyncMock(return_value=ocr_details)
+    mock_ocr_service.wait_for_pending = AsyncMock(return_value=pending_ocr_ids or [])
     monkeypatch.setattr("app.services.llm_service.get_ocr_service", lambda: mock_ocr_service)
 
     dummy_session = object()
@@ -31,6 +38,7 @@ def _stub_dependencies(monkeypatch: pytest.MonkeyPatch, *, process_result: dict,
         yield dummy_session
 
     monkeypatch.setattr("app.services.llm_service.get_session", session_ctx)
+    return mock_usecase
 
 
 @pytest.mark.asyncio
@@ -105,3 +113,24 @@ async def test_get_report_generates_when_missing(monkeypatch: pytest.MonkeyPatch
     repository.upsert.assert_awaited_once()
     assert report.room_id == "room-1"
     assert report.detail == {"summary": "generated"}
+
+
+@pytest.mark.asyncio
+async def test_report_is_pending_while_ocr_is_still_running(monkeypatch: pytest.MonkeyPatch) -> None:
+    repository = MagicMock()
+    repository.upsert = AsyncMock()
+
+    mock_usecase = _stub_dependencies(
+        monkeypatch,
+        process_result={"summary": "partial"},
+        ocr_details=[],
+        pending_ocr_ids=["contract"],
+    )
+
+    service = LlmService(repository)
+
+    ack = await service.create_report("user-1", "room-1", LLMReportTriggerPayload())
+
+    assert ack.status == "pending"
+    mock_usecase.process.assert_not_awaited()
+    repository.upsert.assert_not_awaited()
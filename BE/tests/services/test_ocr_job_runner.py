@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.models import OcrBase
+from app.services.ocr_job_runner import OcrJobRunner
+
+
+class _FakeQueue:
+    """In-memory stand-in for the OcrRepository queue operations."""
+
+    def __init__(self, job: OcrBase) -> None:
+        self.job = job
+        self.available_at: Optional[datetime] = None
+        self.finished = asyncio.Event()
+
+    async def ensure_queue_indexes(self) -> None:
+        return None
+
+    async def claim_next(self, worker_id: str, lease_seconds: float) -> Optional[OcrBase]:
+        if self.job.status != "queued":
+            return None
+        if self.available_at and self.available_at > datetime.utcnow():
+            return None
+        self.job.status = "processing"
+        self.job.attempts += 1
+        self.job.lease_token = uuid4().hex
+        return self.job.model_copy()
+
+    async def renew_lease(self, ocr_id: str, lease_token: str, lease_seconds: float) -> bool:
+        return lease_token == self.job.lease_token
+
+    async def complete(self, ocr_id: str, lease_token: str, detail: dict) -> bool:
+        if lease_token != self.job.lease_token:
+            return False
+        self.job.status = "done"
+        self.job.detail = detail
+        self.finished.set()
+        return True
+
+    async def fail(self, ocr_id: str, lease_token: str, error: str, retry_at: Optional[datetime]) -> bool:
+        if lease_token != self.job.lease_token:
+            return False
+        self.job.error = error
+        self.job.status = "queued" if retry_at else "failed"
+        self.available_at = retry_at
+        if retry_at is None:
+            self.finished.set()
+        return True
+
+
+@pytest.mark.asyncio
+async def test_runner_retries_with_in_memory_bytes_then_completes(monkeypatch: pytest.MonkeyPatch) -> None:
+    queue = _FakeQueue(OcrBase(ocr_id="doc", user_id="u", status="queued", object_key="ocr/u/doc.pdf"))
+    usecase = MagicMock()
+    usecase.process = AsyncMock(side_effect=[RuntimeError("upstage 503"), {"pages": 2}])
+    usecase.process_object = AsyncMock()
+    monkeypatch.setattr("app.services.ocr_job_runner.get_ocr_usecase", lambda: usecase)
+
+    runner = OcrJobRunner(queue, concurrency=1, max_attempts=3, poll_interval=0.01, retry_base_seconds=0.01)
+    await runner.start()
+    runner.submit("doc", b"%PDF")
+    await asyncio.wait_for(queue.finished.wait(), timeout=2)
+    await runner.stop()
+
+    assert queue.job.status == "done"
+    assert queue.job.detail == {"pages": 2}
+    assert queue.job.attempts == 2
+    assert usecase.process.await_count == 2
+    usecase.process_object.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_runner_marks_job_failed_after_max_attempts(monkeypatch: pytest.MonkeyPatch) -> None:
+    queue = _FakeQueue(OcrBase(ocr_id="doc", user_id="u", status="queued", object_key="ocr/u/doc.pdf"))
+    usecase = MagicMock()
+    usecase.process_object = AsyncMock(side_effect=RuntimeError("broken pdf"))
+    monkeypatch.setattr("app.services.ocr_job_runner.get_ocr_usecase", lambda: usecase)
+
+    # No in-memory copy (e.g. recovered after a crash): the stored object is used.
+    runner = OcrJobRunner(queue, concurrency=1, max_attempts=2, poll_interval=0.01, retry_base_seconds=0.01)
+    await runner.start()
+    await asyncio.wait_for(queue.finished.wait(), timeout=2)
+    await runner.stop()
+
+    assert queue.job.status == "failed"
+    assert queue.job.error == "broken pdf"
+    assert usecase.process_object.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_runner_drops_document_when_claim_is_lost(monkeypatch: pytest.MonkeyPatch) -> None:
+    queue = _FakeQueue(OcrBase(ocr_id="doc", user_id="u", status="queued", object_key="ocr/u/doc.pdf"))
+    processing = asyncio.Event()
+
+    async def slow_failure(_: bytes) -> dict:
+        processing.set()
+        await asyncio.sleep(0.1)
+        raise RuntimeError("upstage 503")
+
+    usecase = MagicMock()
+    usecase.process = AsyncMock(side_effect=slow_failure)
+    monkeypatch.setattr("app.services.ocr_job_runner.get_ocr_usecase", lambda: usecase)
+
+    runner = OcrJobRunner(queue, concurrency=1, lease_seconds=0.03, poll_interval=1)
+    await runner.start()
+    runner.submit("doc", b"%PDF")
+    await asyncio.wait_for(processing.wait(), timeout=2)
+    # Another process claims the job after the lease expired; this attempt must not touch it.
+    queue.job.lease_token = "other"
+    await asyncio.sleep(0.2)
+    await runner.stop()
+
+    assert queue.job.status == "processing"
+    assert queue.job.error is None
+    assert "doc" not in runner._documents
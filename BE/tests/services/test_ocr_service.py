@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.services.ocr_service import OcrService
+
+
+@pytest.mark.asyncio
+async def test_upload_returns_queued_and_hands_bytes_to_the_runner(monkeypatch: pytest.MonkeyPatch) -> None:
+    storage = MagicMock()
+    storage.upload_bytes = AsyncMock()
+    storage.generate_presigned_url = AsyncMock(return_value="https://example/doc.pdf")
+    jobs = MagicMock()
+
+    @asynccontextmanager
+    async def session_ctx():
+        yield object()
+
+    monkeypatch.setattr("app.services.ocr_service.get_session", session_ctx)
+    repository = MagicMock()
+    repository.enqueue = AsyncMock()
+
+    service = OcrService(repository, storage, jobs)
+    response = await service.upload_document("user-1", "room-1", "contract.pdf", None, b"%PDF-1.7", "application/pdf")
+
+    storage.upload_bytes.assert_awaited_once()
+    saved = repository.enqueue.await_args.args[0]
+    assert saved.status == "queued"
+    assert saved.object_key == "ocr/user-1/contract.pdf"
+    jobs.submit.assert_called_once_with("contract", b"%PDF-1.7")
+    assert response.status == "queued"
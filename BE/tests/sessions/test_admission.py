@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.admission import (
+    CAPACITY_EXCEEDED,
+    USER_LIMIT_EXCEEDED,
+    AdmissionController,
+    SessionRejected,
+)
+
+
+def _rejection(controller: AdmissionController, session_id: str, user_key: str) -> str | None:
+    try:
+        controller.admit(session_id, user_key)
+    except SessionRejected as exc:
+        return exc.code
+    return None
+
+
+def test_per_user_and_node_limits() -> None:
+    controller = AdmissionController(max_sessions=3, max_per_user=2)
+
+    assert _rejection(controller, "a1", "alice") is None
+    assert _rejection(controller, "a2", "alice") is None
+    assert _rejection(controller, "a3", "alice") == USER_LIMIT_EXCEEDED
+    assert _rejection(controller, "b1", "bob") is None
+    assert _rejection(controller, "c1", "carol") == CAPACITY_EXCEEDED
+
+    controller.release("a1")
+    controller.release("a1")
+    assert _rejection(controller, "a3", "alice") is None
+
+    stats = controller.get_stats()
+    assert stats["active_sessions"] == 3
+    assert stats["headroom"] == 0
+    assert stats["rejected_capacity"] == 1
+    assert stats["rejected_user_limit"] == 1
+
+
+def test_anonymous_sessions_only_count_against_node_limit() -> None:
+    controller = AdmissionController(max_sessions=4, max_per_user=1)
+
+    assert _rejection(controller, "x1", None) is None
+    assert _rejection(controller, "x2", None) is None
+    assert _rejection(controller, "a1", "alice") is None
+    assert controller.sessions_of("alice") == ["a1"]
+
+    controller.release("x1")
+    assert controller.get_stats()["active_sessions"] == 2
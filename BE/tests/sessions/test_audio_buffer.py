@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.audio_buffer import AudioRingBuffer
+
+
+def test_read_coalesces_and_wraps_around() -> None:
+    buffer = AudioRingBuffer(capacity=10)
+
+    assert buffer.write(b"aabb")
+    assert buffer.write(b"ccdd")
+    assert buffer.read(6) == b"aabbcc"
+
+    assert buffer.write(b"eeff")  # wraps past the end of the ring
+    assert buffer.read(100) == b"ddeeff"
+    assert len(buffer) == 0
+
+
+def test_write_drops_when_full() -> None:
+    buffer = AudioRingBuffer(capacity=4)
+
+    assert buffer.write(b"abcd")
+    assert not buffer.write(b"ef")
+    assert buffer.get_stats()["dropped_bytes"] == 2
+    assert buffer.read(4) == b"abcd"
+
+
+def test_close_drains_then_signals_end() -> None:
+    buffer = AudioRingBuffer(capacity=8)
+    buffer.write(b"ab")
+    buffer.close()
+
+    assert buffer.read(8) == b"ab"
+    assert buffer.read(8) is None
+
+
+def test_reader_wakes_on_write() -> None:
+    buffer = AudioRingBuffer(capacity=8)
+    received: list[bytes | None] = []
+    reader = threading.Thread(target=lambda: received.append(buffer.read(8, timeout=2.0)))
+    reader.start()
+
+    buffer.write(b"xy")
+    reader.join(timeout=2.0)
+
+    assert received == [b"xy"]
+    assert buffer.read(8, timeout=0.01) == b""
+
+
+def test_min_bytes_aggregates_until_target() -> None:
+    buffer = AudioRingBuffer(capacity=64)
+    received: list[bytes | None] = []
+    reader = threading.Thread(
+        target=lambda: received.append(buffer.read(8, min_bytes=8, max_latency=2.0)),
+    )
+    reader.start()
+
+    for chunk in (b"aa", b"bb", b"cc", b"dd"):
+        buffer.write(chunk)
+    reader.join(timeout=2.0)
+
+    assert received == [b"aabbccdd"]
+
+
+def test_max_latency_caps_aggregation_wait() -> None:
+    buffer = AudioRingBuffer(capacity=64)
+    buffer.write(b"aa")
+
+    assert buffer.read(8, min_bytes=8, max_latency=0.01) == b"aa"
+
+
+def test_drop_oldest_evicts_and_reports() -> None:
+    buffer = AudioRingBuffer(capacity=6, overflow="drop_oldest")
+
+    assert buffer.write(b"aabbcc")
+    assert buffer.write(b"dd")
+
+    assert buffer.take_evicted() == (2, 4)
+    assert buffer.take_evicted()[0] == 0
+    assert buffer.read(6) == b"bbccdd"
+    stats = buffer.get_stats()
+    assert stats["dropped_bytes"] == 2
+    assert stats["peak_bytes"] == 6
+
+
+def test_spill_replays_overflow_in_order(tmp_path: Path) -> None:
+    buffer = AudioRingBuffer(capacity=4, overflow="spill", spill_max_bytes=6, spill_dir=tmp_path)
+
+    assert buffer.write(b"aabb")
+    assert buffer.write(b"cc")  # ring full: spilled
+    assert buffer.write(b"dd")  # spill active: stays in order behind "cc"
+    assert not buffer.write(b"eeff")  # would exceed spill_max_bytes
+    assert buffer.write(b"gg")
+
+    assert buffer.read(100) == b"aabb"
+    assert buffer.read(100) == b"ccddgg"
+    assert buffer.write(b"hh")  # spill drained: back to the ring
+    assert buffer.read(100) == b"hh"
+    stats = buffer.get_stats()
+    assert stats["spilled_bytes"] == 6
+    assert stats["dropped_bytes"] == 4
+    assert stats["peak_bytes"] == 10
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.events import EventChannel
+
+
+class _FakeWebSocket:
+    def __init__(self) -> None:
+        self.frames: list[object] = []
+
+    async def send_text(self, text: str) -> None:
+        self.frames.append(json.loads(text))
+
+
+def test_events_from_one_tick_share_a_frame() -> None:
+    async def run() -> list[object]:
+        websocket = _FakeWebSocket()
+        channel = EventChannel(websocket)
+        channel.start()
+
+        def recognizer_thread() -> None:
+            channel.post("stt.partial", {"text": "안"})
+            channel.post("stt.partial", {"text": "안녕"})
+            channel.post("stt.final_segments", {"segments": [{"text": "안녕하세요"}]})
+            channel.post("stt.stats", {"finals": 1})
+
+        thread = threading.Thread(target=recognizer_thread)
+        thread.start()
+        thread.join()
+        await channel.send("session.close", {"reason": "done"})
+        await channel.close()
+        return websocket.frames
+
+    frames = asyncio.run(run())
+
+    events = [message["event"] for frame in frames for message in (frame if isinstance(frame, list) else [frame])]
+    # Partials superseded by the final are never sent.
+    assert events == ["stt.final_segments", "stt.stats", "session.close"]
+    assert len(frames) <= 2
+
+
+def test_slow_client_only_gets_newest_partial() -> None:
+    async def run() -> list[object]:
+        websocket = _FakeWebSocket()
+        channel = EventChannel(websocket)
+        channel.start()
+        for index in range(50):
+            channel.post("stt.partial", {"text": str(index)})
+        await channel.close()
+        return websocket.frames
+
+    frames = asyncio.run(run())
+
+    assert frames == [{"event": "stt.partial", "data": {"text": "49"}}]
+
+
+def test_detached_channel_replays_missed_events_on_attach() -> None:
+    async def run() -> tuple[list[object], list[object], bool, bool]:
+        first, second = _FakeWebSocket(), _FakeWebSocket()
+        channel = EventChannel(first, replay_size=4)
+        channel.start()
+        await channel.send("stt.final_segments", {"segments": [{"text": "하나"}]})
+
+        channel.detach()
+        await channel.send("stt.partial", {"text": "둘"})
+        await channel.send("stt.final_segments", {"segments": [{"text": "둘이요"}]})
+        await channel.send("stt.partial", {"text": "셋"})
+        complete = channel.attach(second, last_seq=1)
+        await channel.send("session.resumed", {})
+
+        for index in range(8):
+            channel.post("stt.final_segments", {"segments": [{"text": str(index)}]})
+        channel.detach()
+        await channel.close()
+        return first.frames, second.frames, complete, channel.attach(second, last_seq=1)
+
+    first, second, complete, complete_later = asyncio.run(run())
+
+    assert first == [{"event": "stt.final_segments", "data": {"segments": [{"text": "하나"}]}, "seq": 1}]
+    replayed = second[0]
+    assert isinstance(replayed, list)
+    # The partial superseded by a final is not replayed; the newest one is.
+    assert [(message["seq"], message["event"]) for message in replayed] == [
+        (3, "stt.final_segments"),
+        (4, "stt.partial"),
+        (5, "session.resumed"),
+    ]
+    assert complete
+    # History only holds the last four events, so not everything after seq 1 survives.
+    assert not complete_later
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.partial_throttle import PartialThrottle
+
+
+def test_throttles_and_delivers_newest_after_interval() -> None:
+    async def run() -> list[dict]:
+        sent: list[dict] = []
+        throttle = PartialThrottle(sent.append, interval=0.05)
+        throttle.bind(asyncio.get_running_loop())
+
+        for text in ("a", "ab", "abc", "abcd"):
+            throttle.update(text)
+        assert sent == [{"text": "a"}]
+
+        await asyncio.sleep(0.1)
+        return sent
+
+    assert asyncio.run(run()) == [{"text": "a"}, {"text": "abcd"}]
+
+
+def test_flush_sends_held_text_and_resets_delta_base() -> None:
+    sent: list[dict] = []
+    throttle = PartialThrottle(sent.append, interval=10.0, delta=True)
+
+    throttle.update("안녕")
+    throttle.update("안녕하세요")
+    throttle.flush()
+    throttle.update("다음")
+
+    assert sent == [
+        {"text": "안녕", "offset": 0},
+        {"text": "하세요", "offset": 2},
+        {"text": "다음", "offset": 0},
+    ]
+    assert throttle.sent == 3
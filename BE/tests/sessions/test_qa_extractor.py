@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.diarization import Segment
+from app.sessions.qa_extractor import QUESTION_PATTERN, QAExtractor
+
+
+def _settings(time_window: int = 15, sentence_window: int = 3) -> SimpleNamespace:
+    return SimpleNamespace(qa_time_window_sec=time_window, qa_sentence_window=sentence_window)
+
+
+def _full_rescan(settings: SimpleNamespace, batches: list[list[Segment]]) -> list[list[dict]]:
+    """Reference behaviour: rebuild sentences and rescan every question on each final."""
+    results: list[list[dict]] = []
+    history: list[Segment] = []
+    reference = QAExtractor(settings)
+    for batch in batches:
+        history.extend(batch)
+        reference._sentences = reference._segments_to_sentences(history)
+        reference._pending = [
+            idx for idx, sentence in enumerate(reference._sentences) if QUESTION_PATTERN.search(sentence.text)
+        ]
+        results.append(reference._extract(reference._sentences))
+    return results
+
+
+def test_pairs_question_with_next_speaker() -> None:
+    extractor = QAExtractor(_settings())
+
+    assert extractor.append_segments([Segment(speaker=1, text="관리비는 얼마인가요?", start=0.0, end=2.0)]) == []
+    pairs = extractor.append_segments([Segment(speaker=2, text="10만원입니다.", start=2.5, end=4.0)])
+
+    assert len(pairs) == 1
+    assert pairs[0]["q_text"] == "관리비는 얼마인가요?"
+    assert pairs[0]["a_text"] == "10만원입니다."
+    assert pairs[0]["a_speaker"] == 2
+
+
+def test_settled_questions_are_not_rescanned() -> None:
+    extractor = QAExtractor(_settings(sentence_window=2))
+
+    extractor.append_segments([Segment(speaker=1, text="주차 되나요?", start=0.0, end=1.0)])
+    extractor.append_segments([Segment(speaker=2, text="네 됩니다.", start=1.5, end=2.5)])
+    assert extractor._pending == []
+
+    for offset in range(10):
+        start = 3.0 + offset
+        extractor.append_segments([Segment(speaker=1, text="좋네요.", start=start, end=start + 0.5)])
+    assert extractor._pending == []
+
+
+def test_matches_full_rescan() -> None:
+    batches = [
+        [Segment(speaker=1, text="안녕하세요. 여기 보증금이 얼마죠?", start=0.0, end=3.0)],
+        [Segment(speaker=1, text="월세도 궁금해요.", start=3.0, end=4.0)],
+        [Segment(speaker=2, text="보증금은 천만원입니다. 월세는 50이에요.", start=4.5, end=8.0)],
+        [Segment(speaker=None, text="창문은 남향인가요?", start=30.0, end=31.0)],
+        [Segment(speaker=None, text="네.", start=31.5, end=32.0)],
+        [Segment(speaker=2, text="남향 맞습니다.", start=32.0, end=33.0)],
+        [Segment(speaker=1, text="수압은 괜찮나요?", start=40.0, end=41.0)],
+        [Segment(speaker=1, text="온수는요?", start=80.0, end=81.0)],
+    ]
+
+    settings = _settings()
+    extractor = QAExtractor(settings)
+    incremental = [extractor.append_segments(batch) for batch in batches]
+
+    assert incremental == _full_rescan(settings, batches)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.registry import SessionRegistry
+
+
+def test_owner_follows_claim_and_release(tmp_path: Path) -> None:
+    first = SessionRegistry(tmp_path, public_url="ws://a/stt/ws", worker_id="a")
+    second = SessionRegistry(tmp_path, public_url="ws://b/stt/ws", worker_id="b")
+    first.register()
+    second.register()
+
+    first.claim("s1")
+    owner = second.owner("s1")
+    assert owner is not None
+    assert owner["worker_id"] == "a"
+    assert owner["url"] == "ws://a/stt/ws"
+
+    # Only the owner may drop the record.
+    second.release("s1")
+    assert second.owner("s1") is not None
+    first.release("s1")
+    assert second.owner("s1") is None
+
+
+def test_pick_worker_skips_self_and_draining(tmp_path: Path) -> None:
+    workers = {name: SessionRegistry(tmp_path, worker_id=name) for name in ("a", "b", "c")}
+    for registry in workers.values():
+        registry.register()
+    workers["b"].claim("s1")
+
+    picked = workers["a"].pick_worker()
+    assert picked is not None and picked["worker_id"] == "c"
+
+    workers["c"].set_draining()
+    picked = workers["a"].pick_worker()
+    assert picked is not None and picked["worker_id"] == "b"
+
+    workers["b"].close()
+    assert workers["a"].pick_worker() is None
+    assert workers["a"].owner("s1") is None
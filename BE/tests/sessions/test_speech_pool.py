@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.sessions.speech_pool import SpeechClientPool
+
+
+def _pool(monkeypatch: pytest.MonkeyPatch, channels: int, streams_per_channel: int) -> SpeechClientPool:
+    settings = Settings(STT_CHANNEL_POOL_SIZE=channels, STT_STREAMS_PER_CHANNEL=streams_per_channel)
+    pool = SpeechClientPool(settings)
+    monkeypatch.setattr(pool, "_create_client", MagicMock)
+    return pool
+
+
+def test_leases_spread_over_channels_and_release_on_exit(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = _pool(monkeypatch, channels=2, streams_per_channel=1)
+
+    with pool.lease() as first, pool.lease() as second:
+        assert first is not second
+        assert pool.get_stats() == {"channels": 2, "streams": 2}
+        with pool.lease():
+            # Both channels saturated: multiplex onto an existing one.
+            assert pool.get_stats() == {"channels": 2, "streams": 3}
+    assert pool.get_stats() == {"channels": 2, "streams": 0}
+
+
+def test_lease_outliving_close_exits_cleanly(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = _pool(monkeypatch, channels=2, streams_per_channel=1)
+
+    with pool.lease() as client:
+        pool.close()
+    client.transport.close.assert_called_once()
+    assert pool.get_stats() == {"channels": 0, "streams": 0}
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.stream_window import StreamWindow
+
+
+def test_rollover_replays_audio_after_last_final() -> None:
+    window = StreamWindow(bytes_per_second=100, max_replay_ms=10_000)
+    for index in range(10):
+        window.record(bytes([index]) * 10)  # 0.1 s each
+
+    window.mark_final(0.75)
+    replay = window.rollover()
+
+    assert replay == bytes([7]) * 6 + b"".join(bytes([index]) * 10 for index in range(8, 10))
+    assert window.offset == 0.74
+    assert window.streams == 2
+    assert window.stream_seconds == 0.0
+
+
+def test_rollover_replay_is_capped() -> None:
+    window = StreamWindow(bytes_per_second=100, max_replay_ms=200)
+    for index in range(10):
+        window.record(bytes([index]) * 10)
+
+    replay = window.rollover()
+
+    assert replay == bytes([8]) * 10 + bytes([9]) * 10
+    assert window.offset == 0.8
+
+
+def test_offsets_accumulate_across_streams() -> None:
+    window = StreamWindow(bytes_per_second=100, max_replay_ms=10_000)
+    window.record(b"\x00" * 100)
+    window.mark_final(1.0)
+    assert window.rollover() == b""
+    assert window.offset == 1.0
+
+    window.record(b"\x00" * 50)
+    window.mark_final(0.2)
+    replay = window.rollover()
+
+    assert len(replay) == 30
+    assert window.offset == 1.2
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.stream_window import StreamWindow
+from app.sessions.transcriber import Transcriber
+
+
+class _SlowRing:
+    """Hands out one chunk per read; the second read blocks until released."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = list(chunks)
+        self.blocked = threading.Event()
+        self.release = threading.Event()
+        self._reads = 0
+
+    def read(self, max_bytes: int, timeout=None, *, min_bytes: int = 0, max_latency: float = 0.0):
+        self._reads += 1
+        if self._reads == 2:
+            self.blocked.set()
+            self.release.wait(timeout=2)
+        return self._chunks.pop(0) if self._chunks else None
+
+
+def _transcriber(ring: _SlowRing) -> Transcriber:
+    transcriber = object.__new__(Transcriber)
+    transcriber._session_id = "s"
+    transcriber._settings = SimpleNamespace(stt_stream_rollover_sec=300)
+    transcriber._stop_event = asyncio.Event()
+    transcriber._audio_buffer = ring
+    transcriber._request_bytes = 4
+    transcriber._request_max_latency = 0.1
+    transcriber._bytes_per_second = 100
+    transcriber._stream_window = StreamWindow(bytes_per_second=100, max_replay_ms=10_000)
+    transcriber._pending_replay = b""
+    transcriber._replay_pos = 0
+    transcriber._stream_generation = 0
+    transcriber._stream_lock = threading.Lock()
+    transcriber._audio_finished = False
+    transcriber._partial_text = ""
+    transcriber._last_final_transcript = ""
+    return transcriber
+
+
+def test_chunk_read_while_upstream_stream_ends_is_replayed() -> None:
+    ring = _SlowRing([b"AAAA", b"BBBB", b"CCCC"])
+    transcriber = _transcriber(ring)
+
+    first = transcriber._request_generator(None)
+    assert next(first).audio_content == b"AAAA"
+    # gRPC pulls the next request while the stream is being closed upstream (OutOfRange).
+    pulled: list[bytes] = []
+    puller = threading.Thread(target=lambda: pulled.append(next(first).audio_content))
+    puller.start()
+    assert ring.blocked.wait(timeout=2)
+
+    rollover = threading.Thread(target=transcriber._roll_over_stream)
+    rollover.start()
+    time.sleep(0.05)
+    ring.release.set()
+    rollover.join(timeout=2)
+    puller.join(timeout=2)
+
+    second = [request.audio_content for request in transcriber._request_generator(None)]
+
+    # B went to the dead stream, so the next stream sends it again before C.
+    assert pulled == [b"BBBB"]
+    assert b"".join(second).endswith(b"BBBBCCCC")
+    assert transcriber._audio_finished
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.sessions.vad import AudioTimeline, EnergyVAD
+
+
+def _tone(amplitude: int, samples: int = 320) -> bytes:
+    t = np.arange(samples) / 16000
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.int16).tobytes()
+
+
+def test_vad_separates_speech_from_silence() -> None:
+    vad = EnergyVAD()
+    rng = np.random.default_rng(0)
+    silence = (rng.normal(0, 20, 320)).astype(np.int16).tobytes()
+
+    assert not any(vad.is_speech(silence) for _ in range(20))
+    assert vad.is_speech(_tone(8000))
+
+
+def test_timeline_maps_sent_time_across_gaps() -> None:
+    timeline = AudioTimeline(bytes_per_second=100)
+    timeline.advance(100, sent=True)   # 0.0-1.0 s sent
+    timeline.advance(300, sent=False)  # 1.0-4.0 s suppressed
+    timeline.advance(50, sent=True)    # 4.0-4.5 s sent as 1.0-1.5 s
+
+    assert timeline.to_session(0.5) == 0.5
+    assert timeline.to_session(1.25) == 4.25
+    assert timeline.suppressed_bytes == 300
+    assert timeline.suppressed_seconds == 3.0
+
+
+def test_timeline_retract_shifts_following_audio() -> None:
+    timeline = AudioTimeline(bytes_per_second=1000)
+    timeline.advance(1000, sent=True)
+    timeline.retract(400)  # evicted from the recognizer buffer
+    timeline.advance(1000, sent=True)
+
+    assert abs(timeline.to_session(1.1) - 1.5) < 1e-9
+    assert timeline.suppressed_bytes == 400
+
+
+def test_timeline_retract_removes_evicted_audio_from_the_head() -> None:
+    timeline = AudioTimeline(bytes_per_second=1000)
+    timeline.advance(1000, sent=True)  # 0.0-1.0 s sent; the recognizer has read 0.0-0.3 s
+    timeline.advance(200, sent=True)   # 1.0-1.2 s sent; evicts the oldest unread 0.3-0.7 s
+    timeline.retract(400, after=300 + 200)
+
+    assert abs(timeline.to_session(0.2) - 0.2) < 1e-9
+    # A word right after the cut was spoken at 0.75 s, one near the end at 1.1 s.
+    assert abs(timeline.to_session(0.35) - 0.75) < 1e-9
+    assert abs(timeline.to_session(0.7) - 1.1) < 1e-9
+    assert timeline.suppressed_bytes == 400
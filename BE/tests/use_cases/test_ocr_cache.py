@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.use_cases.ocr.services.ocr_cache import OcrResultCache, build_cache_key, document_digest
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.documents: dict[str, dict] = {}
+
+    async def create_index(self, *args, **kwargs) -> None:
+        return None
+
+    async def find_one_and_update(self, query: dict, update: dict) -> dict | None:
+        document = self.documents.get(query["_id"])
+        if document is not None:
+            document.update(update["$set"])
+        return document
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False) -> None:
+        document = self.documents.setdefault(query["_id"], dict(update["$setOnInsert"]))
+        document.update(update["$set"])
+
+
+def test_key_depends_on_content_type_and_version() -> None:
+    digest = document_digest(b"%PDF-1")
+    key = build_cache_key(digest, "등기사항전부증명서", "1")
+    assert key == build_cache_key(document_digest(b"%PDF-1"), "등기사항전부증명서", "1")
+    assert key != build_cache_key(document_digest(b"%PDF-2"), "등기사항전부증명서", "1")
+    assert key != build_cache_key(digest, "주택임대차표준계약서", "1")
+    assert key != build_cache_key(digest, "등기사항전부증명서", "2")
+
+
+def test_shared_tier_fills_a_cold_disk_tier(tmp_path: Path) -> None:
+    async def run() -> tuple[dict | None, dict | None, dict | None]:
+        collection = _FakeCollection()
+        first = OcrResultCache(tmp_path / "a", 1 << 20, collection, timedelta(days=1))
+        second = OcrResultCache(tmp_path / "b", 1 << 20, collection, timedelta(days=1))
+
+        missing = await first.get("k")
+        await first.set("k", {"소재지": "서울", "a.b": 1}, contract_type="등기사항전부증명서")
+        from_mongo = await second.get("k")
+        collection.documents.clear()
+        from_disk = await second.get("k")
+        return missing, from_mongo, from_disk
+
+    missing, from_mongo, from_disk = asyncio.run(run())
+
+    assert missing is None
+    assert from_mongo == {"소재지": "서울", "a.b": 1}
+    assert from_disk == from_mongo
+
+
+def test_corrupt_shared_entry_is_a_miss(tmp_path: Path) -> None:
+    collection = _FakeCollection()
+    collection.documents["k"] = {"value": "{not json"}
+    cache = OcrResultCache(tmp_path, 1 << 20, collection, timedelta(days=1))
+
+    assert asyncio.run(cache.get("k")) is None
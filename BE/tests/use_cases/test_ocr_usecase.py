@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from datetime import timedelta
+from pathlib import Path
+
+import sys
+
+import pypdfium2 as pdfium
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.use_cases.ocr.ocr_usecase import OCRUsecase, get_ocr_page_stats
+from app.use_cases.ocr.services.ocr_cache import OcrResultCache, document_digest
+
+
+def _make_pdf(page_count: int) -> bytes:
+    document = pdfium.PdfDocument.new()
+    for index in range(page_count):
+        # 페이지마다 폭을 달리해 fake OCR 이 어느 페이지인지 알 수 있게 함
+        document.new_page(200 + index, 200).close()
+    buffer = io.BytesIO()
+    document.save(buffer)
+    document.close()
+    return buffer.getvalue()
+
+
+class _FakeUpstage:
+    def __init__(self, page_count: int, fail_page: int | None = None) -> None:
+        self.page_count = page_count
+        self.fail_page = fail_page
+        self.calls: list[int] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def ocr_document(self, pdf_bytes: bytes) -> dict:
+        document = pdfium.PdfDocument(pdf_bytes)
+        index = int(document[0].get_width()) - 200
+        document.close()
+        self.calls.append(index)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            # 앞 페이지일수록 늦게 끝나도 결과는 페이지 순서대로 합쳐져야 함
+            await asyncio.sleep(0.01 * (self.page_count - index))
+            if index == self.fail_page:
+                raise RuntimeError("upstage 502")
+            return {"text": f"page {index + 1}"}
+        finally:
+            self.in_flight -= 1
+
+
+def _usecase(upstage: _FakeUpstage, cache_dir: Path) -> OCRUsecase:
+    usecase = object.__new__(OCRUsecase)
+    usecase.upstage_client = upstage
+    usecase.cache = OcrResultCache(cache_dir, 1 << 20, None, timedelta(days=1))
+    return usecase
+
+
+def test_pages_are_ocred_concurrently_and_joined_in_order(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.use_cases.ocr.ocr_usecase.settings.ocr_page_concurrency", 3)
+    pdf_bytes = _make_pdf(6)
+    upstage = _FakeUpstage(6)
+
+    text = asyncio.run(_usecase(upstage, tmp_path)._extract_text(pdf_bytes, document_digest(pdf_bytes)))
+
+    assert text == "\n\n".join(f"page {index}" for index in range(1, 7))
+    assert sorted(upstage.calls) == list(range(6))
+    assert upstage.peak == 3
+
+
+def test_retry_only_calls_pages_that_failed(tmp_path: Path) -> None:
+    pdf_bytes = _make_pdf(4)
+    upstage = _FakeUpstage(4, fail_page=2)
+    usecase = _usecase(upstage, tmp_path)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(usecase._extract_text(pdf_bytes, document_digest(pdf_bytes)))
+    upstage.fail_page = None
+    upstage.calls.clear()
+    text = asyncio.run(usecase._extract_text(pdf_bytes, document_digest(pdf_bytes)))
+
+    assert upstage.calls == [2]
+    assert text.splitlines()[::2] == ["page 1", "page 2", "page 3", "page 4"]
+
+
+def test_text_layer_pages_skip_upstage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pdf_bytes = _make_pdf(3)
+    layers = ["제1조 (목적) 임대인과 임차인은 아래 부동산에 관하여 임대차계약을 체결한다. " * 2, "- 2 -", "제3조 " * 20]
+    monkeypatch.setattr("app.use_cases.ocr.ocr_usecase.read_text_layers", lambda _: layers)
+    upstage = _FakeUpstage(3)
+    before = get_ocr_page_stats()
+
+    text = asyncio.run(_usecase(upstage, tmp_path)._extract_text(pdf_bytes, document_digest(pdf_bytes)))
+
+    # 쪽 번호만 있는 스캔 페이지만 OCR
+    assert upstage.calls == [1]
+    assert text.split("\n\n") == [layers[0].strip(), "page 2", layers[2].strip()]
+    after = get_ocr_page_stats()
+    assert after["text_layer"] - before["text_layer"] == 2
+    assert after["upstage"] - before["upstage"] == 1
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+import wave
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.util.analysis_writer import AnalysisWriter
+
+
+def test_blocks_are_written_in_order_and_copied_on_close(tmp_path: Path) -> None:
+    recording = tmp_path / "recordings" / "s.wav"
+    analysis = tmp_path / "analysis" / "s.wav"
+    writer = AnalysisWriter(recording, sample_rate=16000, block_bytes=1000)
+    writer.open()
+
+    chunks = [bytes([index % 256]) * 640 for index in range(50)]
+    for chunk in chunks:
+        writer.append(chunk)
+    writer.close(copy_to=[analysis]).result(timeout=5)
+
+    for path in (recording, analysis):
+        with wave.open(str(path), "rb") as handle:
+            assert handle.getframerate() == 16000
+            assert handle.readframes(handle.getnframes()) == b"".join(chunks)
+
+
+def test_append_drops_instead_of_growing_past_the_limit(tmp_path: Path) -> None:
+    writer = AnalysisWriter(tmp_path / "s.wav", sample_rate=16000, block_bytes=10_000, max_buffer_bytes=10_000)
+    writer.open()
+
+    for _ in range(20):
+        writer.append(b"\x00" * 640)
+
+    assert writer.dropped_bytes == 20 * 640 - (10_000 // 640) * 640
+    writer.close().result(timeout=5)
+
+
+def test_open_failure_on_writer_thread_stops_buffering(tmp_path: Path) -> None:
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_bytes(b"")
+    writer = AnalysisWriter(blocker / "s.wav", sample_rate=16000, block_bytes=1000)
+
+    # Returns without touching the disk; the failure surfaces on the writer thread.
+    writer.open()
+    writer.close().result(timeout=5)
+    writer.append(b"\x00" * 640)
+
+    assert not (blocker / "s.wav").exists()
+    assert writer.dropped_bytes == 0
+
+
+def test_writers_spread_over_shards_and_keep_each_file_in_order(tmp_path: Path) -> None:
+    writers = [
+        AnalysisWriter(tmp_path / f"s{index}.wav", sample_rate=16000, block_bytes=1000, writer_threads=3)
+        for index in range(4)
+    ]
+    assert len({writer._executor for writer in writers}) > 1
+
+    chunks = [bytes([index % 256]) * 640 for index in range(50)]
+    for writer in writers:
+        writer.open()
+    for chunk in chunks:
+        for writer in writers:
+            writer.append(chunk)
+    for writer in writers:
+        writer.close().result(timeout=5)
+
+    for writer in writers:
+        with wave.open(str(writer.path), "rb") as handle:
+            assert handle.readframes(handle.getnframes()) == b"".join(chunks)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.util.log_sink import BackgroundJsonlWriter, JsonlLogSink
+
+
+def test_close_does_not_block_on_a_full_queue_and_keeps_queued_records(tmp_path: Path) -> None:
+    writer = BackgroundJsonlWriter(max_queue=2, flush_interval=0.05)
+    # Hold the writer thread back so the queue fills up.
+    writer._thread = threading.Thread()
+    sink = JsonlLogSink(tmp_path / "session.jsonl", writer)
+    for index in range(3):
+        sink.write({"index": index})
+
+    started = time.monotonic()
+    sink.close()
+    assert time.monotonic() - started < 0.1
+
+    writer._thread = None
+    writer._ensure_started()
+    deadline = time.monotonic() + 2
+    while writer._closing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    lines = (tmp_path / "session.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["index"] for line in lines] == [0, 1]
+    assert writer.dropped == 1
+    assert not writer._files
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sys
+
+import av
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.util.recording_encoder import EncodedRecordingWriter
+
+
+@pytest.mark.parametrize(("recording_format", "max_ratio"), [("opus", 0.2), ("flac", 0.9)])
+def test_streams_compressed_recording(tmp_path: Path, recording_format: str, max_ratio: float) -> None:
+    t = np.arange(16000 * 5) / 16000
+    noise = np.random.default_rng(0).normal(0, 0.02, t.size)
+    pcm = ((0.3 * np.sin(2 * np.pi * 220 * t) + noise) * 32767).astype(np.int16).tobytes()
+
+    path = tmp_path / f"s.{recording_format}"
+    writer = EncodedRecordingWriter(path, sample_rate=16000, recording_format=recording_format, block_bytes=8000)
+    writer.open()
+    for offset in range(0, len(pcm), 640):
+        writer.append(pcm[offset:offset + 640])
+    writer.close().result(timeout=10)
+
+    assert 0 < path.stat().st_size < len(pcm) * max_ratio
+    with av.open(str(path)) as container:
+        stream = container.streams.audio[0]
+        samples = sum(frame.samples for frame in container.decode(stream))
+        duration = samples / stream.rate
+    assert duration == pytest.approx(5.0, abs=0.1)
@@ -3,6 +3,7 @@ import type { LlmReport, OcrReport } from '../types/domain';
 export interface WsMessage<Event extends string, Payload> {
   event: Event;
   data: Payload;
+  seq?: number;
 }
 
 export interface SessionInitPayload {
@@ -21,6 +22,16 @@ export interface SessionClosePayload {
   reason?: string;
 }
 
+export interface SessionResumePayload {
+  session_id: string;
+  last_seq: number;
+}
+
+export interface SessionResumedPayload {
+  session_id: string;
+  complete: boolean;
+}
+
 export interface RtcOfferPayload {
   sdp: string;
   type: RTCSdpType;
@@ -41,6 +52,8 @@ export interface RtcCandidatePayload {
 
 export interface SttPartialPayload {
   text: string;
+  /** Delta 모드: 이전 partial 의 앞 offset 글자(UTF-16) 뒤에 text 를 이어 붙임 */
+  offset?: number;
 }
 
 export interface SttSegment {
@@ -79,6 +92,22 @@ export interface SttStatsPayload {
   chunks: number;
   partials: number;
   finals: number;
+  requests?: number;
+  request_rate?: number;
+  streams?: number;
+  suppressed_bytes?: number;
+  suppressed_seconds?: number;
+  buffer_ms?: number;
+  buffer_peak_ms?: number;
+  dropped_bytes?: number;
+  spilled_bytes?: number;
+}
+
+export interface SessionRedirectPayload {
+  session_id?: string | null;
+  worker_id?: string | null;
+  url?: string | null;
+  reason: 'owner' | 'draining';
 }
 
 export interface GenericErrorPayload {
@@ -108,6 +137,7 @@ export interface LlmErrorPayload {
 
 export type OutgoingRealtimeEvent =
   | WsMessage<'session.init', SessionInitPayload>
+  | WsMessage<'session.resume', SessionResumePayload>
   | WsMessage<'rtc.offer', RtcOfferPayload>
   | WsMessage<'rtc.candidate', RtcCandidatePayload>
   | WsMessage<'rtc.start', { track: 'audio' }>
@@ -116,7 +146,9 @@ export type OutgoingRealtimeEvent =
 
 export type IncomingRealtimeEvent =
   | WsMessage<'session.ready', SessionReadyPayload>
+  | WsMessage<'session.resumed', SessionResumedPayload>
   | WsMessage<'session.close', SessionClosePayload>
+  | WsMessage<'session.redirect', SessionRedirectPayload>
   | WsMessage<'rtc.answer', RtcAnswerPayload>
   | WsMessage<'rtc.candidate', RtcCandidatePayload>
   | WsMessage<'stt.partial', SttPartialPayload>
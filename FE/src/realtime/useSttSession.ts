@@ -13,6 +13,7 @@ import {
   type RtcAnswerPayload,
   type RtcCandidatePayload,
   type SessionReadyPayload,
+  type SessionResumedPayload,
   type SttErrorPayload,
   type SttFinalSegmentsPayload,
   type SttPartialPayload,
@@ -188,7 +189,12 @@ export function useSttSession(): UseSttSessionResult {
   }, []);
 
   const handlePartial = useCallback((payload: SttPartialPayload) => {
-    setPartial(payload.text);
+    const { offset } = payload;
+    if (offset === undefined) {
+      setPartial(payload.text);
+      return;
+    }
+    setPartial((prev) => prev.slice(0, offset) + payload.text);
   }, []);
 
   const handleFinalSegments = useCallback((payload: SttFinalSegmentsPayload) => {
@@ -221,6 +227,16 @@ export function useSttSession(): UseSttSessionResult {
     setState('idle');
   }, [cleanupResources]);
 
+  const handleSessionResumed = useCallback((payload: SessionResumedPayload) => {
+    if (!isActiveRef.current || payload.session_id !== sessionIdRef.current) {
+      return;
+    }
+    if (!payload.complete) {
+      // eslint-disable-next-line no-console
+      console.warn('Some STT events were lost while reconnecting');
+    }
+  }, []);
+
   const handleSttError = useCallback((payload: SttErrorPayload | GenericErrorPayload) => {
     setError(payload.message);
     setState('error');
@@ -329,9 +345,30 @@ export function useSttSession(): UseSttSessionResult {
     }
   }, [client, cleanupResources, handleDataChannelMessage, stop]);
 
+  useEffect(() => {
+    let wasOpen = false;
+    return client.onStatusChange((status) => {
+      if (status !== 'open') {
+        return;
+      }
+      // 소켓이 다시 열렸을 때 진행 중인 세션이 있으면 서버에 남아 있는 세션에 재연결
+      if (wasOpen && isActiveRef.current && sessionIdRef.current) {
+        client.send({
+          event: 'session.resume',
+          data: {
+            session_id: sessionIdRef.current,
+            last_seq: client.getLastSeq(),
+          },
+        });
+      }
+      wasOpen = true;
+    });
+  }, [client]);
+
   useEffect(() => {
     const unsubscribes = [
       client.subscribe('session.ready', (payload) => handleSessionReady(payload as SessionReadyPayload)),
+      client.subscribe('session.resumed', (payload) => handleSessionResumed(payload as SessionResumedPayload)),
       client.subscribe('session.close', () => handleSessionClose()),
       client.subscribe('rtc.answer', (payload) => handleRtcAnswer(payload as RtcAnswerPayload)),
       client.subscribe('rtc.candidate', (payload) => handleRtcCandidate(payload as RtcCandidatePayload)),
@@ -354,6 +391,7 @@ export function useSttSession(): UseSttSessionResult {
     handleRtcCandidate,
     handleSessionClose,
     handleSessionReady,
+    handleSessionResumed,
     handleStats,
     handleSttError,
     handleQaPairs,
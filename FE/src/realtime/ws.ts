@@ -10,7 +10,7 @@ const MAX_BACKOFF_MS = 10_000;
 export type RealtimeConnectionState = 'idle' | 'connecting' | 'open' | 'closed';
 
 export class RealtimeClient {
-  private readonly url: string;
+  private url: string;
 
   private socket: WebSocket | null = null;
 
@@ -18,6 +18,8 @@ export class RealtimeClient {
 
   private reconnectAttempts = 0;
 
+  private lastSeq = 0;
+
   private reconnectTimer: number | undefined;
 
   private status: RealtimeConnectionState = 'idle';
@@ -110,6 +112,44 @@ export class RealtimeClient {
     return this.status;
   }
 
+  // session.resume 에 보낼 마지막 수신 seq
+  getLastSeq(): number {
+    return this.lastSeq;
+  }
+
+  private dispatch(message: IncomingRealtimeEvent): void {
+    if (!message?.event) {
+      return;
+    }
+    if (message.event === 'session.ready') {
+      this.lastSeq = 0;
+    }
+    if (typeof message.seq === 'number') {
+      // 재연결 후 재전송된 이벤트 중 이미 받은 것은 건너뜀
+      if (message.seq <= this.lastSeq) {
+        return;
+      }
+      this.lastSeq = message.seq;
+    }
+    if (message.event === 'session.redirect') {
+      this.redirect(message.data.url);
+    }
+    this.listeners.forEach((listener) => listener(message));
+    const eventSpecificListeners = this.eventListeners.get(message.event);
+    if (eventSpecificListeners?.size) {
+      eventSpecificListeners.forEach((listener) => listener(message.data));
+    }
+  }
+
+  // 세션 소유 워커 또는 drain 중인 워커가 다른 워커로 보냄: 해당 URL(없으면 같은 URL)로 즉시 재연결
+  private redirect(url?: string | null): void {
+    if (url) {
+      this.url = url;
+    }
+    this.reconnectAttempts = 0;
+    this.socket?.close();
+  }
+
   private attachSocketHandlers(socket: WebSocket): void {
     socket.onopen = () => {
       this.reconnectAttempts = 0;
@@ -119,15 +159,10 @@ export class RealtimeClient {
 
     socket.onmessage = (event) => {
       try {
-        const parsed = JSON.parse(event.data) as IncomingRealtimeEvent;
-        if (!parsed?.event) {
-          return;
-        }
-        this.listeners.forEach((listener) => listener(parsed));
-        const eventSpecificListeners = this.eventListeners.get(parsed.event);
-        if (eventSpecificListeners?.size) {
-          eventSpecificListeners.forEach((listener) => listener(parsed.data));
-        }
+        // 서버는 같은 tick 에 발생한 이벤트를 배열 하나로 묶어 보낼 수 있음
+        const parsed = JSON.parse(event.data) as IncomingRealtimeEvent | IncomingRealtimeEvent[];
+        const messages = Array.isArray(parsed) ? parsed : [parsed];
+        messages.forEach((message) => this.dispatch(message));
       } catch (error) {
         // eslint-disable-next-line no-console
         console.warn('WebSocket 메시지 파싱 실패', error);